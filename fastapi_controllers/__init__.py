@@ -1,8 +1,59 @@
+from fastapi_controllers.background import BackgroundQueue, BackgroundWorkers
+from fastapi_controllers.broadcast import BroadcastHub, Connection
 from fastapi_controllers.controllers import Controller
+from fastapi_controllers.definitions import (
+    BatchConfig,
+    BroadcastConfig,
+    CacheConfig,
+    ConcurrencyLimit,
+    ControllerLifetime,
+    IdempotencyConfig,
+    OffloadMode,
+    OverflowPolicy,
+    QueueConfig,
+    RateLimit,
+    SingleFlightConfig,
+    StreamConfig,
+    StreamFormat,
+)
+from fastapi_controllers.dispatch import RouteDispatcher
+from fastapi_controllers.instrumentation import JSONExporter, MetricsExporter, MetricsRegistry, TextExporter
+from fastapi_controllers.limits import MemoryRateLimitBackend, RateLimitBackend, StateRateLimitBackend
+from fastapi_controllers.resources import Resource
 from fastapi_controllers.routing import delete, get, head, options, patch, post, put, trace, websocket
+from fastapi_controllers.state import MemoryStateBackend, MmapStateBackend, StateBackend
 
 __all__ = [
+    "BackgroundQueue",
+    "BackgroundWorkers",
+    "BatchConfig",
+    "BroadcastConfig",
+    "BroadcastHub",
+    "CacheConfig",
+    "ConcurrencyLimit",
+    "Connection",
     "Controller",
+    "ControllerLifetime",
+    "IdempotencyConfig",
+    "JSONExporter",
+    "MetricsExporter",
+    "MemoryRateLimitBackend",
+    "MemoryStateBackend",
+    "MetricsRegistry",
+    "MmapStateBackend",
+    "OffloadMode",
+    "OverflowPolicy",
+    "QueueConfig",
+    "RateLimit",
+    "RateLimitBackend",
+    "Resource",
+    "RouteDispatcher",
+    "SingleFlightConfig",
+    "StateBackend",
+    "StateRateLimitBackend",
+    "StreamConfig",
+    "StreamFormat",
+    "TextExporter",
     "delete",
     "get",
     "head",
@@ -0,0 +1,149 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_controllers.definitions import OffloadMode, QueueConfig
+from fastapi_controllers.offload import _run_in_executor
+from fastapi_controllers.resources import Resource
+
+
+class BackgroundWorkers:
+    """
+    The running workers of a BackgroundQueue, processing the queued items after the responses have been sent.
+
+    Items are queued with `put`, which waits for room in the bounded queue for at most
+    `put_timeout` seconds, or `put_nowait`, which fails right away. Both raise `asyncio.QueueFull`
+    when the queue stays full and `RuntimeError` once the workers are shutting down.
+    """
+
+    def __init__(self, handler: Callable[..., Any], config: QueueConfig, name: str) -> None:
+        self.handler = handler
+        self.config = config
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.closed = False
+        self._submitted = 0
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=config.max_size)
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if OffloadMode(self.config.offload) is OffloadMode.EXECUTOR and not inspect.iscoroutinefunction(self.handler):
+            self._executor = ThreadPoolExecutor(max_workers=self.config.workers, thread_name_prefix=self.name)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.config.workers)]
+
+    def put_nowait(self, item: Any) -> None:
+        """
+        Queue an item without waiting.
+
+        Args:
+            item: The item to be processed.
+        """
+        if self.closed:
+            raise RuntimeError(f"Background queue '{self.name}' is shutting down")
+        self._queue.put_nowait(item)
+        self._submitted += 1
+
+    async def put(self, item: Any) -> None:
+        """
+        Queue an item, waiting for room in the queue.
+
+        Args:
+            item: The item to be processed.
+        """
+        if self.closed:
+            raise RuntimeError(f"Background queue '{self.name}' is shutting down")
+        try:
+            await asyncio.wait_for(self._queue.put(item), self.config.put_timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.QueueFull from None
+        self._submitted += 1
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting items and process the queued ones for at most `drain_timeout` seconds.
+
+        The items still queued after the timeout are dropped.
+        """
+        self.closed = True
+        try:
+            await asyncio.wait_for(self._queue.join(), self.config.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self.dropped = self._submitted - self.processed - self.failed
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def _call(self, value: Any) -> None:
+        if inspect.iscoroutinefunction(self.handler):
+            await self.handler(value)
+        elif OffloadMode(self.config.offload) is OffloadMode.INLINE:
+            self.handler(value)
+        elif self._executor is not None:
+            await _run_in_executor(self._executor, partial(self.handler, value), {})
+        else:
+            await run_in_threadpool(self.handler, value)
+
+    async def _next_batch(self) -> List[Any]:
+        items = [await self._queue.get()]
+        if self.config.batch_size <= 1:
+            return items
+        if self.config.flush_interval > 0 and self._queue.qsize() < self.config.batch_size - 1 and not self.closed:
+            await asyncio.sleep(self.config.flush_interval)
+        while len(items) < self.config.batch_size and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def _work(self) -> None:
+        while True:
+            items = await self._next_batch()
+            try:
+                await self._call(items if self.config.batch_size > 1 else items[0])
+                self.processed += len(items)
+            except Exception as exc:
+                self.failed += len(items)
+                asyncio.get_running_loop().call_exception_handler(
+                    {"message": f"Background queue '{self.name}' failed to process {len(items)} item(s)", "exception": exc}
+                )
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+
+class BackgroundQueue(Resource):
+    """
+    A bounded queue of work processed by background workers after the responses have been sent.
+
+    The queue is a resource of the controller: the workers are started by the lifespan of the
+    application including the controller and drained at shutdown. `handler` is called with each
+    queued item, or with lists of up to `batch_size` items when batching is configured, by
+    `workers` concurrent workers. Sync handlers run in the default thread pool, inline or in a
+    dedicated executor of `workers` threads depending on the `offload` setting.
+    """
+
+    def __init__(self, handler: Callable[..., Any], config: Optional[QueueConfig] = None) -> None:
+        self.handler = handler
+        self.config = config or QueueConfig()
+        super().__init__(self._open)
+        self.name = getattr(handler, "__name__", type(self).__name__)
+
+    async def _open(self) -> AsyncIterator[BackgroundWorkers]:
+        workers = BackgroundWorkers(self.handler, self.config, self.name)
+        workers.start()
+        try:
+            yield workers
+        finally:
+            await workers.aclose()
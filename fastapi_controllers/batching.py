@@ -0,0 +1,146 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, get_args, get_origin
+
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_controllers.definitions import BatchConfig, OffloadMode
+from fastapi_controllers.helpers import _get_typed_signature, _wrap_endpoint
+from fastapi_controllers.offload import _offload
+
+
+def _get_item_type(annotation: Any) -> Any:
+    """
+    Get the item type of a sequence annotation, e.g. `Item` for `List[Item]`.
+
+    Args:
+        annotation: The annotation.
+
+    Returns:
+        The item type or None if the annotation is not a homogeneous sequence.
+    """
+    args = get_args(annotation)
+    origin = get_origin(annotation)
+    if origin is list and len(args) == 1:
+        return args[0]
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return args[0]
+    return None
+
+
+def _get_batch_signature(func: Callable[..., Any]) -> inspect.Signature:
+    """
+    Get the signature of a single request of a batched endpoint.
+
+    Every parameter but 'self' must be annotated as a list of the values of the batched requests,
+    the signature of a single request takes the items of the lists instead. A list return
+    annotation is unwrapped the same way.
+
+    Args:
+        func: The batched endpoint.
+
+    Returns:
+        The signature of a single request.
+    """
+    sig = _get_typed_signature(func)
+    params = []
+    for param in sig.parameters.values():
+        if param.name == "self":
+            params.append(param)
+            continue
+        item_type = _get_item_type(param.annotation)
+        if item_type is None:
+            raise TypeError(f"Parameter '{param.name}' of the batched endpoint {func.__qualname__} must be annotated as a list")
+        params.append(param.replace(annotation=item_type))
+    return_type = _get_item_type(sig.return_annotation)
+    return sig.replace(parameters=params, return_annotation=sig.return_annotation if return_type is None else return_type)
+
+
+class _Batcher:
+    """
+    Collects the calls of concurrent requests and runs them as a single call of a batched function.
+    """
+
+    def __init__(self, func: Callable[..., Any], config: BatchConfig) -> None:
+        self.func = func
+        self.config = config
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Future] = set()
+
+    async def submit(self, kwargs: Dict[str, Any]) -> Any:
+        """
+        Add the call of a single request to the current batch.
+
+        Args:
+            kwargs: The keyword arguments of the request.
+
+        Returns:
+            The result of the request.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((kwargs, future))
+        if len(self._pending) >= self.config.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.config.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        first = batch[0][0]
+        kwargs = {name: [call[name] for call, _ in batch] for name in first if name != "self"}
+        if "self" in first:
+            kwargs["self"] = first["self"]
+        try:
+            results = await self.func(**kwargs)
+            if len(results) != len(batch):
+                raise ValueError(f"The batched endpoint returned {len(results)} results for {len(batch)} requests")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):  # noqa: B905
+            if not future.done():
+                future.set_result(result)
+
+
+def _batch_endpoint(
+    func: Callable[..., Any],
+    config: BatchConfig,
+    mode: OffloadMode,
+    get_executor: Callable[[], ThreadPoolExecutor],
+) -> Callable[..., Any]:
+    """
+    Create an endpoint collecting concurrent requests into batches handled by a single call of a batched endpoint.
+
+    Args:
+        func: The batched endpoint taking lists of the values of the requests and returning a list of results.
+        config: The batching settings.
+        mode: The offload mode of a sync batched endpoint.
+        get_executor: A callable returning the dedicated executor.
+
+    Returns:
+        The endpoint of a single request.
+    """
+    call = _offload(func, mode, get_executor)
+    batcher = _Batcher(call if inspect.iscoroutinefunction(call) else partial(run_in_threadpool, func), config)
+
+    async def endpoint(**kwargs: Any) -> Any:
+        return await batcher.submit(kwargs)
+
+    endpoint = _wrap_endpoint(func, endpoint)
+    endpoint.__signature__ = _get_batch_signature(func)  # type: ignore
+    return endpoint
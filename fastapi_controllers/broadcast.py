@@ -0,0 +1,266 @@
+import asyncio
+import itertools
+import json
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
+
+from fastapi_controllers.definitions import BroadcastConfig, OverflowPolicy
+
+MessageHandler = Callable[["Connection", Any], Awaitable[None]]
+
+
+def _encode(message: Any) -> str:
+    """
+    Encode a message as JSON.
+
+    Args:
+        message: The message.
+
+    Returns:
+        The JSON text of the message.
+    """
+    return json.dumps(jsonable_encoder(message), ensure_ascii=False, separators=(",", ":"))
+
+
+class Connection:
+    """
+    A websocket connection of a BroadcastHub with its own bounded send queue.
+
+    Messages are sent by a dedicated sender task, so that a slow client only delays its own queue.
+    Queued messages sharing a key are coalesced, only the latest one is sent.
+    """
+
+    def __init__(self, websocket: WebSocket, config: BroadcastConfig) -> None:
+        self.websocket = websocket
+        self.config = config
+        self.groups: Set[str] = set()
+        self.dropped = 0
+        self.closed = False
+        self._queue: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._overflowed = False
+        self._sender: Optional[asyncio.Task] = None
+        self._counter = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, data: str, key: Optional[Hashable] = None) -> bool:
+        """
+        Add an encoded message to the send queue.
+
+        Args:
+            data: The JSON text of the message.
+            key: An optional key, a queued message with the same key is replaced by the new one.
+
+        Returns:
+            True if the message has been queued.
+        """
+        if self.closed or self._overflowed:
+            return False
+        queue_key: Hashable = (None, next(self._counter)) if key is None else (key,)
+        if queue_key not in self._queue and len(self._queue) >= self.config.queue_size:
+            overflow = OverflowPolicy(self.config.overflow)
+            self.dropped += 1
+            if overflow is OverflowPolicy.DROP_NEWEST:
+                return False
+            if overflow is OverflowPolicy.DISCONNECT:
+                self._overflowed = True
+                self._ready.set()
+                return False
+            self._queue.popitem(last=False)
+        self._queue[queue_key] = data
+        self._ready.set()
+        return True
+
+    def start(self) -> None:
+        self._sender = asyncio.ensure_future(self._send_queued())
+
+    async def stop(self) -> None:
+        self.closed = True
+        self._queue.clear()
+        if self._sender is not None and not self._sender.done():
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+
+    def _next_frame(self) -> str:
+        if self.config.batch_size <= 1:
+            return self._queue.popitem(last=False)[1]
+        batch = [self._queue.popitem(last=False)[1] for _ in range(min(self.config.batch_size, len(self._queue)))]
+        return f"[{','.join(batch)}]"
+
+    async def _send_queued(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                if self.config.flush_interval > 0:
+                    await asyncio.sleep(self.config.flush_interval)
+                self._ready.clear()
+                if self._overflowed:
+                    await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                    break
+                while self._queue:
+                    await self.websocket.send_text(self._next_frame())
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            pass
+        self.closed = True
+        self._queue.clear()
+
+
+class BroadcastHub:
+    """
+    A registry of websocket connections with named broadcast groups.
+
+    Broadcast messages are encoded once and queued for every recipient, each connection
+    sends its queue on its own. Connections and broadcasts must be handled on the event loop
+    of the application.
+    """
+
+    def __init__(self, config: Optional[BroadcastConfig] = None) -> None:
+        self.config = config or BroadcastConfig()
+        self.connections: Set[Connection] = set()
+        self._groups: Dict[str, Set[Connection]] = {}
+
+    async def __aenter__(self) -> "BroadcastHub":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def group(self, name: str) -> Set[Connection]:
+        """
+        Get the connections of a group.
+
+        Args:
+            name: The name of the group.
+
+        Returns:
+            The connections.
+        """
+        return set(self._groups.get(name, ()))
+
+    def connect(self, websocket: WebSocket, groups: Iterable[str] = ()) -> Connection:
+        """
+        Register a websocket connection.
+
+        The sender of the connection is started once the connection has been accepted.
+
+        Args:
+            websocket: The websocket.
+            groups: The names of the groups the connection joins.
+
+        Returns:
+            The connection.
+        """
+        connection = Connection(websocket, self.config)
+        self.connections.add(connection)
+        for group in groups:
+            self.join(connection, group)
+        return connection
+
+    async def disconnect(self, connection: Connection) -> None:
+        """
+        Unregister a connection and stop its sender.
+
+        Args:
+            connection: The connection.
+        """
+        for group in list(connection.groups):
+            self.leave(connection, group)
+        self.connections.discard(connection)
+        await connection.stop()
+
+    def join(self, connection: Connection, group: str) -> None:
+        connection.groups.add(group)
+        self._groups.setdefault(group, set()).add(connection)
+
+    def leave(self, connection: Connection, group: str) -> None:
+        connection.groups.discard(group)
+        members = self._groups.get(group)
+        if members is not None:
+            members.discard(connection)
+            if not members:
+                del self._groups[group]
+
+    def broadcast(self, message: Any, *, group: Optional[str] = None, key: Optional[Hashable] = None) -> int:
+        """
+        Queue a message for all the connections or the connections of a group without waiting for the sends.
+
+        Args:
+            message: The JSON-serializable message.
+            group: The name of the group, defaults to all the connections.
+            key: An optional key, queued messages with the same key are replaced by the new one.
+
+        Returns:
+            The number of connections the message has been queued for.
+        """
+        recipients = self.connections if group is None else self._groups.get(group, ())
+        data = _encode(message)
+        return sum(connection.enqueue(data, key) for connection in list(recipients))
+
+    def send(self, connection: Connection, message: Any, *, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a message for a single connection.
+
+        Args:
+            connection: The connection.
+            message: The JSON-serializable message.
+            key: An optional key, a queued message with the same key is replaced by the new one.
+
+        Returns:
+            True if the message has been queued.
+        """
+        return connection.enqueue(_encode(message), key)
+
+    async def serve(self, websocket: WebSocket, groups: Iterable[str] = (), on_message: Optional[MessageHandler] = None) -> None:
+        """
+        Accept a websocket, register it and run its receive loop until the client disconnects.
+
+        Args:
+            websocket: The websocket.
+            groups: The names of the groups the connection joins.
+            on_message: An optional coroutine function called with the connection and every
+                message received from the client (decoded from JSON if possible).
+        """
+        connection = self.connect(websocket, groups)
+        try:
+            if websocket.client_state is WebSocketState.CONNECTING:
+                await websocket.accept()
+            connection.start()
+            async for message in self._receive(websocket):
+                if on_message is not None:
+                    await on_message(connection, message)
+        finally:
+            await self.disconnect(connection)
+
+    async def _receive(self, websocket: WebSocket) -> AsyncIterator[Any]:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            text = message.get("text")
+            if text is None:
+                yield message.get("bytes")
+                continue
+            try:
+                yield json.loads(text)
+            except ValueError:
+                yield text
+
+    async def close(self) -> None:
+        """
+        Close all the connections.
+        """
+        connections: List[Connection] = list(self.connections)
+        for connection in connections:
+            await self.disconnect(connection)
+            if connection.websocket.application_state is WebSocketState.CONNECTED:
+                try:
+                    await connection.websocket.close(code=status.WS_1001_GOING_AWAY)
+                except (RuntimeError, OSError):
+                    pass
@@ -0,0 +1,280 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from fastapi import Request, Response, status
+
+from fastapi_controllers.definitions import CacheConfig
+from fastapi_controllers.middleware import _CREDENTIAL_HEADERS, RequestHandler
+from fastapi_controllers.state import StateBackend
+
+
+@dataclass
+class _CacheEntry:
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    expires: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+class ResponseCache:
+    """
+    An in-process LRU cache of serialized responses with a TTL as well as entry count and size limits.
+    """
+
+    def __init__(self, config: CacheConfig) -> None:
+        self.config = config
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[_CacheEntry]:
+        """
+        Get a cached entry, dropping it if it has expired.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The entry or None if there is no valid entry for the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, entry: _CacheEntry) -> None:
+        """
+        Store an entry, evicting the least recently used ones if the limits are exceeded.
+
+        Args:
+            key: The key of the entry.
+            entry: The entry to be stored.
+        """
+        if entry.size > self.config.max_bytes:
+            return
+        self.pop(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        while len(self._entries) > self.config.max_entries or self.size > self.config.max_bytes:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: The key of the entry.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+def _dump_entry(entry: _CacheEntry) -> bytes:
+    headers = [[name.decode("latin-1"), value.decode("latin-1")] for name, value in entry.headers]
+    return json.dumps([entry.status_code, headers, entry.etag]).encode() + b"\0" + entry.body
+
+
+def _load_entry(data: bytes, expires: float) -> _CacheEntry:
+    meta, body = data.split(b"\0", 1)
+    status_code, headers, etag = json.loads(meta)
+    return _CacheEntry(status_code, [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers], body, etag, expires)
+
+
+class SharedResponseCache:
+    """
+    A cache of serialized responses stored in a StateBackend under a common key prefix.
+
+    The entries are shared by all the processes using the backend, the entry limits of the
+    configuration are replaced by the capacity of the backend.
+    """
+
+    def __init__(self, config: CacheConfig, state: StateBackend, namespace: str) -> None:
+        self.config = config
+        self.state = state
+        self.namespace = namespace
+
+    def _get_key(self, key: Hashable) -> str:
+        return f"{self.namespace}{key!r}"
+
+    def get(self, key: Hashable) -> Optional[_CacheEntry]:
+        data = self.state.get(self._get_key(key))
+        return None if data is None else _load_entry(data, time.monotonic() + self.config.ttl)
+
+    def set(self, key: Hashable, entry: _CacheEntry) -> None:
+        if entry.size <= self.config.max_bytes:
+            self.state.set(self._get_key(key), _dump_entry(entry), entry.expires - time.monotonic())
+
+    def pop(self, key: Hashable) -> None:
+        self.state.delete(self._get_key(key))
+
+    def clear(self) -> None:
+        self.state.clear(self.namespace)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check if the If-None-Match header of a request matches an ETag.
+
+    Args:
+        request: The request.
+        etag: The ETag of the response.
+
+    Returns:
+        True if the client already holds the response.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().replace("W/", "", 1) for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _is_cacheable(response: Response) -> bool:
+    """
+    Check if a response can be stored in the cache.
+
+    Args:
+        response: The response.
+
+    Returns:
+        True for successful, fully serialized responses that are not marked as private.
+    """
+    cache_control = response.headers.get("cache-control", "")
+    return (
+        response.status_code == status.HTTP_200_OK
+        and isinstance(getattr(response, "body", None), bytes)
+        and "set-cookie" not in response.headers
+        and "no-store" not in cache_control
+        and "private" not in cache_control
+    )
+
+
+def _from_entry(request: Request, entry: _CacheEntry) -> Response:
+    """
+    Create a response from a cache entry, honoring the If-None-Match header of the request.
+
+    Args:
+        request: The request.
+        entry: The cache entry.
+
+    Returns:
+        The full response or a 304 Not Modified response.
+    """
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": entry.etag})
+    response = Response(content=entry.body, status_code=entry.status_code)
+    response.raw_headers = list(entry.headers)
+    return response
+
+
+class ResponseCacheMiddleware:
+    """
+    A route middleware serving responses of idempotent routes from a ResponseCache.
+
+    Responses are cached per application and keyed on the path, the query parameters
+    and the values of the headers listed in the `vary` setting, the credential headers
+    (Authorization and Cookie) by default. With a StateBackend, the responses are shared by
+    all the applications and processes using the backend instead.
+
+    Cached responses are served before the dependencies of the route are resolved, so a
+    cached response is replayed to any request with the same key without running them.
+    """
+
+    def __init__(self, config: CacheConfig, state: Optional[StateBackend] = None, namespace: str = "") -> None:
+        self.config = config
+        self.state = state
+        self.vary = _CREDENTIAL_HEADERS if config.vary is None else config.vary
+        self._shared = None if state is None else SharedResponseCache(config, state, namespace)
+        self._caches: "WeakKeyDictionary[object, ResponseCache]" = WeakKeyDictionary()
+
+    def get_cache(self, app: object) -> Union[ResponseCache, SharedResponseCache]:
+        """
+        Get the cache of an application.
+
+        Args:
+            app: The application.
+
+        Returns:
+            The cache.
+        """
+        if self._shared is not None:
+            return self._shared
+        cache = self._caches.get(app)
+        if cache is None:
+            cache = self._caches[app] = ResponseCache(self.config)
+        return cache
+
+    def clear(self, app: Optional[object] = None) -> None:
+        """
+        Invalidate the cached responses.
+
+        Args:
+            app: The application whose responses should be invalidated, defaults to all applications.
+        """
+        if self._shared is not None:
+            self._shared.clear()
+            return
+        if app is None:
+            caches = list(self._caches.values())
+        else:
+            caches = [self._caches[app]] if app in self._caches else []
+        for cache in caches:
+            cache.clear()
+
+    def _get_key(self, request: Request) -> Hashable:
+        # the header values are hashed, so that credentials do not end up in the keys of a shared StateBackend
+        headers = hashlib.blake2b(repr([request.headers.get(header) for header in self.vary]).encode(), digest_size=16).hexdigest()
+        return (request.scope["path"], tuple(sorted(request.query_params.multi_items())), headers)
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        cache = self.get_cache(request.app)
+        key = self._get_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return _from_entry(request, entry)
+        response = await call_next(request)
+        if not _is_cacheable(response):
+            return response
+        etag = response.headers.get("etag") or f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+        if "etag" not in response.headers:
+            response.headers["etag"] = etag
+        entry = _CacheEntry(response.status_code, list(response.raw_headers), bytes(response.body), etag, time.monotonic() + self.config.ttl)
+        cache.set(key, entry)
+        return _from_entry(request, entry) if _etag_matches(request, etag) else response
+
+
+class CacheInvalidationMiddleware:
+    """
+    A route middleware invalidating cached responses after a successful request.
+    """
+
+    def __init__(self, get_caches: Callable[[], Iterable[ResponseCacheMiddleware]]) -> None:
+        self.get_caches = get_caches
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        response = await call_next(request)
+        if response.status_code < status.HTTP_400_BAD_REQUEST:
+            for cache in self.get_caches():
+                cache.clear(request.app)
+        return response
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Dict, Hashable, Optional
+from weakref import WeakKeyDictionary
+
+from fastapi import HTTPException, Request, Response, status
+
+from fastapi_controllers.definitions import SingleFlightConfig
+from fastapi_controllers.middleware import _CREDENTIAL_HEADERS, RequestHandler
+
+
+def _get_default_key(request: Request) -> Hashable:
+    """
+    Get the key identifying identical requests by default.
+
+    Args:
+        request: The request.
+
+    Returns:
+        The request method, the path, the query parameters and the credential headers of the request.
+    """
+    credentials = tuple(request.headers.get(header) for header in _CREDENTIAL_HEADERS)
+    return (request.method, request.scope["path"], tuple(sorted(request.query_params.multi_items())), credentials)
+
+
+def _is_shareable(response: Response) -> bool:
+    """
+    Check if a response can be handed over to the coalesced requests.
+
+    Args:
+        response: The response.
+
+    Returns:
+        True for fully serialized responses without background tasks.
+    """
+    return isinstance(getattr(response, "body", None), bytes) and response.background is None
+
+
+def _copy_response(response: Response) -> Response:
+    """
+    Create a copy of a fully serialized response.
+
+    Args:
+        response: The response to be copied.
+
+    Returns:
+        The copy of the response.
+    """
+    copy = Response(content=response.body, status_code=response.status_code)
+    copy.raw_headers = list(response.raw_headers)
+    return copy
+
+
+class SingleFlightMiddleware:
+    """
+    A route middleware sharing a single handler execution between identical concurrent requests.
+
+    The first request of a key runs the handler, the requests arriving while it is in flight
+    wait for its response (or exception) instead. Waiters give up with 504 Gateway Timeout
+    after `timeout` seconds. Responses that cannot be shared (e.g. streaming responses) make
+    the waiters run the handler on their own.
+
+    The waiters do not resolve the dependencies of the route, only the first request does. The
+    default key keeps requests with different credential headers (Authorization and Cookie) apart.
+    """
+
+    def __init__(self, config: SingleFlightConfig) -> None:
+        self.config = config
+        self._calls: "WeakKeyDictionary[object, Dict[Hashable, asyncio.Future]]" = WeakKeyDictionary()
+
+    def _get_calls(self, app: object) -> Dict[Hashable, asyncio.Future]:
+        calls = self._calls.get(app)
+        if calls is None:
+            calls = self._calls[app] = {}
+        return calls
+
+    async def _lead(self, calls: Dict[Hashable, asyncio.Future], key: Hashable, request: Request, call_next: RequestHandler) -> Response:
+        future: "asyncio.Future[Optional[Response]]" = asyncio.get_running_loop().create_future()
+        calls[key] = future
+        try:
+            response = await call_next(request)
+        except Exception as exc:
+            future.set_exception(exc)
+            # mark the exception as retrieved in case nobody is waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.set_result(None)
+            raise
+        else:
+            future.set_result(response if _is_shareable(response) else None)
+        finally:
+            if calls.get(key) is future:
+                del calls[key]
+        return response
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        calls = self._get_calls(request.app)
+        key = (self.config.key or _get_default_key)(request)
+        future = calls.get(key)
+        if future is None:
+            return await self._lead(calls, key, request, call_next)
+        try:
+            response = await asyncio.wait_for(asyncio.shield(future), self.config.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT) from None
+        if response is None:
+            return await call_next(request)
+        return _copy_response(response)
@@ -1,11 +1,57 @@
 import inspect
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Optional, Sequence, Union
+from functools import lru_cache, partial
+from typing import Any, AsyncContextManager, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
 
-from fastapi import APIRouter, params
+from fastapi import APIRouter, Depends, FastAPI, params
+from starlette.routing import BaseRoute
 
-from fastapi_controllers.definitions import HTTPRouteMeta, Route, WebsocketRouteMeta
-from fastapi_controllers.helpers import _replace_signature, _validate_against_signature
+from fastapi_controllers.batching import _batch_endpoint
+from fastapi_controllers.caching import CacheInvalidationMiddleware, ResponseCacheMiddleware
+from fastapi_controllers.coalescing import SingleFlightMiddleware
+from fastapi_controllers.definitions import (
+    BatchConfig,
+    CacheConfig,
+    ConcurrencyLimit,
+    ControllerLifetime,
+    HTTPRequestMethod,
+    HTTPRouteMeta,
+    IdempotencyConfig,
+    OffloadMode,
+    RateLimit,
+    Route,
+    SingleFlightConfig,
+    ValidationMode,
+    WebsocketRouteMeta,
+)
+from fastapi_controllers.dispatch import RouteDispatcher
+from fastapi_controllers.helpers import (
+    _FOLDED_ROUTER_PARAMS,
+    _bind_endpoint,
+    _clone_endpoint,
+    _merge_router_params,
+    _validate_against_signature,
+)
+from fastapi_controllers.idempotency import IdempotencyMiddleware
+from fastapi_controllers.instrumentation import MetricsRegistry, TimingMiddleware, _instrument_constructor, _instrument_endpoint
+from fastapi_controllers.lifetime import _chain_lifespans, _InstanceProvider
+from fastapi_controllers.limits import (
+    ConcurrencyLimiter,
+    ConcurrencyLimitMiddleware,
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    StateRateLimitBackend,
+)
+from fastapi_controllers.middleware import RouteMiddleware, _get_route_class, _set_route_middleware
+from fastapi_controllers.offload import _get_executor, _offload_constructor, _offload_endpoint
+from fastapi_controllers.reloading import _fingerprint, _get_changed_routes, _get_include_prefix, _get_routers, _swap_routes
+from fastapi_controllers.resources import Resource
+from fastapi_controllers.serialization import _serialize_endpoint
+from fastapi_controllers.settings import get_validation_mode
+from fastapi_controllers.state import StateBackend
+from fastapi_controllers.streaming import _stream_endpoint
 
 
 def _is_route(obj: Any) -> bool:
@@ -25,7 +71,25 @@ class Controller:
     prefix: str = ""
     dependencies: Optional[Sequence[params.Depends]] = None
     tags: Optional[List[Union[str, Enum]]] = None
+    lifetime: ControllerLifetime = ControllerLifetime.REQUEST
+    offload: OffloadMode = OffloadMode.DEFAULT
+    max_workers: Optional[int] = None
+    response_cache: Optional[CacheConfig] = None
+    metrics: Optional[MetricsRegistry] = None
+    shared_state: Optional[StateBackend] = None
+    concurrency_limit: Union[ConcurrencyLimit, int, None] = None
+    rate_limit: Optional[RateLimit] = None
+    rate_limit_backend: Optional[RateLimitBackend] = None
     __router_params__: Optional[Dict[str, Any]] = None
+    __instance_provider__: Optional[_InstanceProvider] = None
+    __route_table__: Dict[str, Route] = {}
+    __resources__: Optional[List[Resource]] = None
+    __route_cache__: Optional[Tuple[Tuple[Any, ...], List[BaseRoute]]] = None
+    __response_caches__: Dict[str, ResponseCacheMiddleware] = {}
+    __concurrency_limiters__: Dict[Optional[str], ConcurrencyLimiter] = {}
+    __rate_limit_backend__: Optional[RateLimitBackend] = None
+    __endpoints__: Dict[Callable[..., Any], str] = {}
+    __bound_endpoints__: Dict[Callable[..., Any], Tuple[Optional[Callable[..., Any]], Callable[..., Any]]] = {}
 
     def __init_subclass__(cls) -> None:
         super().__init_subclass__()
@@ -33,32 +97,593 @@ class Controller:
         for param in ["prefix", "dependencies", "tags"]:
             if not cls.__router_params__.get(param):
                 cls.__router_params__[param] = getattr(cls, param)
-        _validate_against_signature(APIRouter.__init__, kwargs=cls.__router_params__)
+        if get_validation_mode() is ValidationMode.EAGER:
+            _validate_against_signature(APIRouter.__init__, kwargs=cls.__router_params__)
+        cls.__instance_provider__ = None
+        cls.__route_table__ = cls._collect_routes()
+        cls.__resources__ = None
+        cls.__route_cache__ = None
+        cls.__response_caches__ = {}
+        cls.__concurrency_limiters__ = {}
+        cls.__rate_limit_backend__ = None
+        cls.__endpoints__ = {}
+        cls.__bound_endpoints__ = {}
 
     @classmethod
-    def create_router(cls) -> APIRouter:
+    def _collect_routes(cls) -> Dict[str, Route]:
         """
-        Create a new APIRouter instance and populate the APIRoutes.
+        Build the route table of the controller as the class is defined.
+
+        The route tables of the bases are merged to order the routes, then the routes declared
+        on the class are added in declaration order. Each name is resolved against the method
+        resolution order, so overridden routes keep their position but take the value of the
+        first class defining them, and routes shadowed by other attributes are dropped.
 
         Returns:
-            APIRouter: An APIRouter instance.
+            A mapping of attribute names to routes.
         """
-        router = APIRouter(**(cls.__router_params__ or {}))
-        for _, route in inspect.getmembers(cls, predicate=_is_route):
-            _replace_signature(cls, route.endpoint)
+        names: Dict[str, None] = {}
+        for base in reversed(cls.__bases__):
+            if issubclass(base, Controller):
+                names.update(dict.fromkeys(base.__route_table__))
+            else:
+                names.update((name, None) for klass in reversed(base.__mro__) for name, value in vars(klass).items() if _is_route(value))
+        names.update((name, None) for name, value in vars(cls).items() if _is_route(value))
+        routes: Dict[str, Route] = {}
+        for name in names:
+            value = next(vars(klass)[name] for klass in cls.__mro__ if name in vars(klass))
+            if _is_route(value):
+                routes[name] = value
+        return routes
+
+    @classmethod
+    def _get_route_table(cls) -> Dict[str, Route]:
+        """
+        Get the routes defined on the controller and its bases.
+
+        The routes are recorded once per class when it is defined, so subclasses
+        overriding routes maintain their own route table.
+
+        Returns:
+            A mapping of attribute names to routes in declaration order.
+        """
+        return cls.__route_table__
+
+    @classmethod
+    def _get_resources(cls) -> List[Resource]:
+        """
+        Get the resources defined on the controller and its bases.
+
+        Returns:
+            The resources in definition order, starting with those of the bases.
+        """
+        if cls.__resources__ is None:
+            resources: Dict[str, Resource] = {}
+            for klass in reversed(cls.__mro__):
+                resources.update((name, value) for name, value in vars(klass).items() if isinstance(value, Resource))
+            cls.__resources__ = list(dict.fromkeys(resources.values()))
+        return cls.__resources__
+
+    @classmethod
+    def _get_lifespans(cls, provider: Optional[_InstanceProvider]) -> List[Callable[[Any], AsyncContextManager[None]]]:
+        """
+        Get the lifespan context factories of the controller.
+
+        Args:
+            provider: The provider of app- or worker-scoped controller instances.
+
+        Returns:
+            The lifespans opening the resources followed by the lifespan of the instance provider.
+        """
+        lifespans: List[Callable[[Any], AsyncContextManager[None]]] = [resource.lifespan for resource in cls._get_resources()]
+        if provider is not None:
+            lifespans.append(provider.lifespan)
+        return lifespans
+
+    @classmethod
+    def _get_instance_provider(cls) -> Optional[_InstanceProvider]:
+        """
+        Get the provider of app- or worker-scoped controller instances.
+
+        Returns:
+            The instance provider or None if a new instance should be created per request.
+        """
+        lifetime = ControllerLifetime(cls.lifetime)
+        if lifetime is ControllerLifetime.REQUEST:
+            return None
+        if cls.__instance_provider__ is None or cls.__instance_provider__.lifetime is not lifetime:
+            cls.__instance_provider__ = _InstanceProvider(cls, lifetime)
+        return cls.__instance_provider__
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Get the dedicated executor of the controller.
+
+        Returns:
+            The executor bounded by the `max_workers` class variable.
+        """
+        return _get_executor(cls, cls.max_workers)
+
+    @classmethod
+    def _get_response_cache(cls, name: str, route: Route) -> Optional[ResponseCacheMiddleware]:
+        """
+        Get the response cache of a route.
+
+        Args:
+            name: The name of the route.
+            route: The route.
+
+        Returns:
+            The response cache or None if the responses of the route should not be cached.
+        """
+        config = route.route_options.response_cache
+        if config is None and getattr(route.route_meta, "request_method", None) in (HTTPRequestMethod.GET, HTTPRequestMethod.HEAD):
+            config = cls.response_cache
+        if config is True:
+            config = CacheConfig()
+        if not isinstance(config, CacheConfig):
+            return None
+        if config.vary is None and ((cls.__router_params__ or {}).get("dependencies") or route.route_kwargs.get("dependencies")):
+            # cached responses skip the dependencies, only an explicit `vary` acknowledges what the responses depend on
+            raise TypeError(f"Responses of the route {cls.__qualname__}.{name} with dependencies can only be cached with an explicit 'vary' setting")
+        cache = cls.__response_caches__.get(name)
+        if cache is None or cache.config != config or cache.state is not cls.shared_state:
+            namespace = f"cache:{cls.__module__}.{cls.__qualname__}.{name}:"
+            cls.__response_caches__[name] = ResponseCacheMiddleware(config, cls.shared_state, namespace)
+        return cls.__response_caches__[name]
+
+    @classmethod
+    def _get_invalidated_caches(cls, names: Union[bool, Sequence[str]]) -> List[ResponseCacheMiddleware]:
+        """
+        Get the response caches invalidated by a route.
+
+        Args:
+            names: The names of the routes whose responses should be invalidated or True for all routes.
+
+        Returns:
+            The response caches.
+        """
+        return [cache for name, cache in cls.__response_caches__.items() if names is True or name in names]  # type: ignore
+
+    @classmethod
+    def invalidate_cache(cls, *names: str) -> None:
+        """
+        Invalidate the cached responses of the controller in all applications.
+
+        Args:
+            names: The names of the routes whose responses should be invalidated, defaults to all routes.
+        """
+        for cache in cls._get_invalidated_caches(names or True):
+            cache.clear()
+
+    @classmethod
+    def _get_concurrency_limiters(cls, name: str, route: Route) -> List[ConcurrencyLimiter]:
+        """
+        Get the concurrency limiters of a route.
+
+        Args:
+            name: The name of the route.
+            route: The route.
+
+        Returns:
+            The limiter shared by all the routes of the controller and the limiter of the route itself, if configured.
+        """
+        limiters: List[ConcurrencyLimiter] = []
+        for key, config in [(None, cls.concurrency_limit), (name, route.route_options.concurrency_limit)]:
+            if isinstance(config, int):
+                config = ConcurrencyLimit(max_concurrency=config)
+            if config is None:
+                continue
+            limiter = cls.__concurrency_limiters__.get(key)
+            if limiter is None or limiter.config != config:
+                limiter = cls.__concurrency_limiters__[key] = ConcurrencyLimiter(config)
+            limiters.append(limiter)
+        return limiters
+
+    @classmethod
+    def _get_rate_limiter(cls, name: str, route: Route) -> Optional[RateLimiter]:
+        """
+        Get the rate limiter of a route.
+
+        Args:
+            name: The name of the route.
+            route: The route.
+
+        Returns:
+            The limiter of the rate limit of the route, defaulting to the one of the controller, if any.
+        """
+        config = route.route_options.rate_limit
+        if config is None or config is True:
+            config = cls.rate_limit
+        if not isinstance(config, RateLimit):
+            return None
+        backend = cls.rate_limit_backend
+        if backend is None and cls.shared_state is not None:
+            backend = StateRateLimitBackend(cls.shared_state)
+        if backend is None:
+            backend = cls.__rate_limit_backend__ = cls.__rate_limit_backend__ or MemoryRateLimitBackend()
+        return RateLimiter(config, backend, f"ratelimit:{cls.__module__}.{cls.__qualname__}.{name}:")
+
+    @classmethod
+    def _get_route_middleware(cls, name: str, route: Route) -> List[RouteMiddleware]:
+        """
+        Get the route middleware of a route.
+
+        Args:
+            name: The name of the route.
+            route: The route.
+
+        Returns:
+            The route middleware in the order of execution.
+        """
+        middleware: List[RouteMiddleware] = []
+        if cls.metrics is not None:
+            middleware.append(TimingMiddleware(cls.metrics.get(cls, name)))
+        rate_limiter = cls._get_rate_limiter(name, route)
+        if rate_limiter is not None:
+            middleware.append(rate_limiter)
+        response_cache = cls._get_response_cache(name, route)
+        if response_cache is not None:
+            middleware.append(response_cache)
+        idempotency = route.route_options.idempotency
+        if idempotency:
+            config = idempotency if isinstance(idempotency, IdempotencyConfig) else IdempotencyConfig()
+            middleware.append(IdempotencyMiddleware(config, cls.shared_state, f"idempotency:{cls.__module__}.{cls.__qualname__}.{name}:"))
+        single_flight = route.route_options.single_flight
+        if single_flight:
+            middleware.append(SingleFlightMiddleware(single_flight if isinstance(single_flight, SingleFlightConfig) else SingleFlightConfig()))
+        middleware.extend(ConcurrencyLimitMiddleware(limiter) for limiter in cls._get_concurrency_limiters(name, route))
+        if route.route_options.invalidate_cache:
+            middleware.append(CacheInvalidationMiddleware(partial(cls._get_invalidated_caches, route.route_options.invalidate_cache)))
+        return middleware
+
+    @classmethod
+    def _get_bound_endpoint(cls, route: Route, dependency: Optional[Callable[..., Any]]) -> Callable[..., Any]:
+        """
+        Get the method of a route bound to the controller.
+
+        The bound method is created once per controller, method and instance dependency, so that
+        methods inherited by several controllers are bound to each of them and the routes rebuilt
+        by create_router after a change of the lifetime, offload mode or metrics get the new dependency.
+
+        Args:
+            route: The route.
+            dependency: An optional callable providing the instance in place of the controller itself.
+
+        Returns:
+            The method with its 'self' attribute injected with an instance of the controller.
+        """
+        cached = cls.__bound_endpoints__.get(route.endpoint)
+        if cached is None or cached[0] is not dependency:
+            cached = cls.__bound_endpoints__[route.endpoint] = (dependency, _bind_endpoint(cls, route.endpoint, dependency))
+        return cached[1]
+
+    @classmethod
+    def _create_endpoint(cls, name: str, route: Route, bound: Callable[..., Any]) -> Tuple[Callable[..., Any], Dict[str, Any]]:
+        """
+        Create the endpoint of an HTTP route.
+
+        Args:
+            name: The name of the route.
+            route: The route.
+            bound: The route method bound to the controller.
+
+        Returns:
+            The endpoint and the additional keyword arguments of APIRouter.add_api_route.
+
+        Raises:
+            TypeError: If a batched route would share the request-scoped dependencies of the first request of a batch.
+        """
+        extra_kwargs: Dict[str, Any] = {}
+        mode = OffloadMode(route.route_options.offload or cls.offload)
+        batch = route.route_options.batch
+        stream = route.route_options.stream
+        if batch:
+            if ControllerLifetime(cls.lifetime) is ControllerLifetime.REQUEST and inspect.signature(cls).parameters:
+                # the route method is called on the instance of the first request only, the others would run with its dependencies
+                raise TypeError(f"Route '{name}' of {cls.__qualname__} cannot be batched by a request-scoped controller with constructor parameters")
+            endpoint = _batch_endpoint(bound, batch if isinstance(batch, BatchConfig) else BatchConfig(), mode, cls._get_executor)
+        elif stream:
+            endpoint, response_class = _stream_endpoint(bound, stream)
+            if "response_class" not in route.route_kwargs:
+                extra_kwargs["response_class"] = response_class
+        else:
+            endpoint = _offload_endpoint(bound, mode, cls._get_executor)
+        if cls.metrics is not None:
+            endpoint = _instrument_endpoint(endpoint)
+        if route.route_options.fast_serialization:
+            endpoint = _serialize_endpoint(endpoint, route.route_kwargs)
+        middleware = cls._get_route_middleware(name, route)
+        if not middleware:
+            return endpoint, extra_kwargs
+        if endpoint is bound:
+            endpoint = _clone_endpoint(endpoint)
+        _set_route_middleware(endpoint, middleware)
+        extra_kwargs["route_class_override"] = _get_route_class((cls.__router_params__ or {}).get("route_class"))
+        return endpoint, extra_kwargs
+
+    @classmethod
+    def _register_routes(
+        cls,
+        router: APIRouter,
+        provider: Optional[_InstanceProvider],
+        router_params: Optional[Dict[str, Any]] = None,
+        names: Optional[Collection[str]] = None,
+    ) -> None:
+        """
+        Add the routes of the controller to a router.
+
+        Args:
+            router: The router the routes will be added to.
+            provider: The provider of app- or worker-scoped controller instances.
+            router_params: The APIRouter parameters of the controller to be folded into the routes.
+            names: The names of the routes to be added, defaults to all routes.
+        """
+        router_params = router_params or {}
+        prefix = router_params.get("prefix") or ""
+        validate = get_validation_mode() is ValidationMode.DEFERRED
+        if validate:
+            _validate_against_signature(APIRouter.__init__, kwargs=cls.__router_params__)
+        constructor = provider or _offload_constructor(cls, OffloadMode(cls.offload), cls._get_executor)
+        for name, route in cls._get_route_table().items():
+            if names is not None and name not in names:
+                continue
+            if validate:
+                _validate_against_signature(route.route_meta.binds, args=route.route_args, kwargs=route.route_kwargs)
+            dependency = constructor
+            if cls.metrics is not None and isinstance(route.route_meta, HTTPRouteMeta):
+                dependency = _instrument_constructor(cls, constructor)
+            bound = cls._get_bound_endpoint(route, dependency)
             if isinstance(route.route_meta, HTTPRouteMeta):
+                endpoint, extra_kwargs = cls._create_endpoint(name, route, bound)
                 router.add_api_route(
-                    route.route_args[0],
-                    route.endpoint,
+                    prefix + route.route_args[0],
+                    endpoint,
                     *route.route_args[1:],
                     methods=[route.route_meta.request_method],
-                    **route.route_kwargs,
+                    **{**_merge_router_params(route.route_kwargs, router_params), **extra_kwargs},
                 )
+                cls.__endpoints__[endpoint] = name
             if isinstance(route.route_meta, WebsocketRouteMeta):
-                router.add_api_websocket_route(
-                    route.route_args[0],
-                    route.endpoint,
-                    *route.route_args[1:],
-                    **route.route_kwargs,
-                )
+                route_kwargs = _merge_router_params(route.route_kwargs, router_params, websocket=True)
+                limits = [Depends(limiter.websocket_dependency) for limiter in cls._get_concurrency_limiters(name, route)]
+                rate_limiter = cls._get_rate_limiter(name, route)
+                if rate_limiter is not None:
+                    limits.insert(0, Depends(rate_limiter.websocket_dependency))
+                if limits:
+                    route_kwargs["dependencies"] = [*limits, *(route_kwargs.get("dependencies") or [])]
+                router.add_api_websocket_route(prefix + route.route_args[0], bound, *route.route_args[1:], **route_kwargs)
+                cls.__endpoints__[bound] = name
+
+    @classmethod
+    def _discover(cls) -> List[Type["Controller"]]:
+        """
+        Find all the subclasses of the controller defining at least one route.
+
+        Subclasses setting `__abstract__ = True` in their body are skipped, their subclasses are not.
+
+        Returns:
+            The discovered controllers in definition order.
+        """
+        discovered: List[Type[Controller]] = []
+        pending = list(reversed(cls.__subclasses__()))
+        while pending:
+            controller = pending.pop()
+            skipped = controller.__dict__.get("__abstract__") or controller.__dict__.get("__replaced_by__")
+            if controller not in discovered and not skipped and controller._get_route_table():
+                discovered.append(controller)
+            pending.extend(reversed(controller.__subclasses__()))
+        return discovered
+
+    @classmethod
+    def include_all(
+        cls,
+        target: Union[FastAPI, APIRouter],
+        controllers: Optional[Iterable[Type["Controller"]]] = None,
+        dispatch: bool = False,
+    ) -> None:
+        """
+        Register the routes of many controllers directly on a single application or router.
+
+        Unlike `app.include_router(Controller.create_router())`, the APIRoutes are built once,
+        directly on the target router, instead of being built for the controller router first.
+        Controllers using APIRouter parameters that cannot be folded into their routes
+        (e.g. `lifespan` or `route_class`) are included via create_router instead.
+
+        Args:
+            target: The application or router the routes will be registered on.
+            controllers: The controllers to be registered, defaults to all subclasses of the
+                controller defining at least one route.
+            dispatch: Whether a RouteDispatcher should be placed in front of the registered routes,
+                so that the routing cost does not grow with the number of routes.
+        """
+        router = target.router if isinstance(target, FastAPI) else target
+        start = len(router.routes) if dispatch else 0
+        for controller in controllers if controllers is not None else cls._discover():
+            router_params = controller.__router_params__ or {}
+            if not _FOLDED_ROUTER_PARAMS.issuperset(router_params):
+                router.include_router(controller.create_router())
+                continue
+            provider = controller._get_instance_provider()
+            for lifespan in controller._get_lifespans(provider):
+                router.lifespan_context = _chain_lifespans(router.lifespan_context, lifespan)
+            controller._register_routes(router, provider, router_params)
+        if dispatch and len(router.routes) > start:
+            router.routes.insert(start, RouteDispatcher(router.routes[start:]))
+
+    @classmethod
+    def _get_route_settings(cls, provider: Optional[_InstanceProvider]) -> Tuple[Any, ...]:
+        """
+        Get the class settings the APIRoutes of the controller are built with.
+
+        Args:
+            provider: The provider of app- or worker-scoped controller instances.
+
+        Returns:
+            The settings, the APIRoutes built with other settings are stale.
+        """
+        return (
+            provider,
+            OffloadMode(cls.offload),
+            cls.metrics,
+            cls.response_cache,
+            cls.shared_state,
+            cls.concurrency_limit,
+            cls.rate_limit,
+            cls.rate_limit_backend,
+        )
+
+    @classmethod
+    def create_router(cls) -> APIRouter:
+        """
+        Create a new APIRouter instance and populate the APIRoutes.
+
+        The APIRoutes are built on the first call and reused by subsequent calls, until a class
+        setting they depend on (e.g. `lifetime`, `offload` or `metrics`) changes.
+        In the 'deferred' validation mode the parameters are validated when the APIRoutes are built.
+
+        Returns:
+            APIRouter: An APIRouter instance.
+        """
+        router = APIRouter(**(cls.__router_params__ or {}))
+        provider = cls._get_instance_provider()
+        for lifespan in cls._get_lifespans(provider):
+            router.lifespan_context = _chain_lifespans(router.lifespan_context, lifespan)
+        settings = cls._get_route_settings(provider)
+        if cls.__route_cache__ is not None and cls.__route_cache__[0] == settings:
+            router.routes.extend(cls.__route_cache__[1])
+            return router
+        cls._register_routes(router, provider)
+        cls.__route_cache__ = (settings, list(router.routes))
         return router
+
+    @classmethod
+    def _find_previous(cls) -> Optional[Type["Controller"]]:
+        """
+        Find the previous version of the controller, e.g. defined before its module was reloaded.
+
+        Returns:
+            The latest registered controller with the same module and qualified name which has not been replaced yet.
+        """
+        previous = None
+        pending = list(Controller.__subclasses__())
+        while pending:
+            controller = pending.pop(0)
+            pending.extend(controller.__subclasses__())
+            same = (controller.__module__, controller.__qualname__) == (cls.__module__, cls.__qualname__)
+            if same and controller is not cls and controller.__endpoints__ and not controller.__dict__.get("__replaced_by__"):
+                previous = controller
+        return previous
+
+    @classmethod
+    def _get_registered_routes(cls, router: APIRouter) -> Dict[int, Tuple[str, str]]:
+        """
+        Find the routes of the controller registered on a router.
+
+        Args:
+            router: The router.
+
+        Returns:
+            A mapping of the ids of the routes to their route names and the prefixes they were included with.
+        """
+        prefix = (cls.__router_params__ or {}).get("prefix", "")
+        paths = {name: prefix + route.route_args[0] for name, route in cls._get_route_table().items()}
+        registered: Dict[int, Tuple[str, str]] = {}
+        for route in router.routes:
+            name = cls.__endpoints__.get(getattr(route, "endpoint", None))  # type: ignore
+            if name is not None:
+                registered[id(route)] = (name, _get_include_prefix(route, paths[name]))
+        return registered
+
+    @classmethod
+    def _adopt_resources(cls, previous: Type["Controller"]) -> None:
+        """
+        Take over the open resources of the previous version of the controller.
+
+        Args:
+            previous: The previous version of the controller.
+        """
+        resources = {name: value for klass in reversed(previous.__mro__) for name, value in vars(klass).items() if isinstance(value, Resource)}
+        for klass in cls.__mro__:
+            for name, value in list(vars(klass).items()):
+                if not isinstance(value, Resource) or resources.get(name) is value:
+                    continue
+                if name not in resources or _fingerprint(resources[name], cls.__module__) != _fingerprint(value, cls.__module__):
+                    raise RuntimeError(f"Resource '{name}' of {cls.__qualname__} changed, resources cannot be reloaded without a restart")
+                setattr(klass, name, resources[name])
+        cls.__resources__ = None
+
+    @classmethod
+    def _build_included_routes(cls, staging: APIRouter, include_kwargs: Dict[str, Any], prefix: str) -> Dict[str, List[BaseRoute]]:
+        """
+        Include the rebuilt routes of the controller with a prefix.
+
+        Args:
+            staging: The router holding the rebuilt routes.
+            include_kwargs: The parameters other than `prefix` the routes should be included with.
+            prefix: The prefix.
+
+        Returns:
+            The included routes grouped by route name.
+        """
+        routes = staging.routes
+        if prefix or include_kwargs:
+            included = APIRouter()
+            included.include_router(staging, prefix=prefix, **include_kwargs)
+            routes = [route for router, _ in _get_routers(included) for route in router.routes]
+            routes = [route for route in routes if getattr(route, "endpoint", None) in cls.__endpoints__]
+        built: Dict[str, List[BaseRoute]] = {}
+        for route in routes:
+            built.setdefault(cls.__endpoints__[route.endpoint], []).append(route)  # type: ignore
+        return built
+
+    @classmethod
+    def reload(cls, target: Union[FastAPI, APIRouter], previous: Optional[Type["Controller"]] = None, **include_kwargs: Any) -> List[str]:
+        """
+        Replace the routes of a previous version of the controller registered on an application or router.
+
+        Only the routes that changed are rebuilt, the unchanged routes of the previous version are
+        kept. The routes of the router are swapped at once, requests in flight finish on the
+        previous version. Resources are taken over from the previous version and cannot change.
+
+        Args:
+            target: The application or router the previous version is registered on.
+            previous: The previous version of the controller, defaults to the latest registered
+                controller with the same module and qualified name (e.g. defined before
+                `importlib.reload` of its module).
+            include_kwargs: The parameters other than `prefix` the controller router was included with.
+
+        Returns:
+            The names of the rebuilt routes.
+        """
+        previous = previous or cls._find_previous()
+        target_router = target.router if isinstance(target, FastAPI) else target
+        registered = []
+        for router, included in _get_routers(target_router) if previous is not None else ():
+            routes = previous._get_registered_routes(router)  # type: ignore
+            if routes:
+                registered.append((router, included, routes))
+        if previous is None or not registered:
+            raise ValueError(f"No previous version of {cls.__qualname__} is registered on the target")
+        cls._adopt_resources(previous)
+        changed = _get_changed_routes(previous, cls, Controller)
+        provider = cls._get_instance_provider()
+        previous_provider = previous.__instance_provider__
+        staging = APIRouter(**(cls.__router_params__ or {}))
+        cls._register_routes(staging, provider, names=changed)
+        names = list(cls._get_route_table())
+        for router, included, previous_routes in registered:
+            # routers included by reference hold the routes exactly as built, copies carry the include parameters
+            build = lru_cache(maxsize=None)(partial(cls._build_included_routes, staging, {} if included else include_kwargs))
+            router.routes = _swap_routes(router.routes, previous_routes, build, names, changed)
+            for dispatcher in router.routes:
+                if isinstance(dispatcher, RouteDispatcher):
+                    dispatcher.routes = _swap_routes(dispatcher.routes, previous_routes, build, names, changed)
+            getattr(router, "_mark_routes_changed", lambda: None)()
+        if previous_provider is not None and provider is not None:
+            previous_provider.successor = provider
+        previous.__replaced_by__ = cls  # type: ignore
+        if isinstance(target, FastAPI):
+            target.openapi_schema = None
+        return changed
@@ -1,8 +1,13 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, ClassVar, Dict, Tuple
+from typing import Any, Callable, ClassVar, Dict, Hashable, Mapping, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from starlette.requests import HTTPConnection
+
+# slotted dataclasses are only supported from Python 3.10 on, older versions fall back to a __dict__
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class HTTPRequestMethod(str, Enum):
@@ -16,19 +21,53 @@ class HTTPRequestMethod(str, Enum):
     TRACE = "TRACE"
 
 
+class ControllerLifetime(str, Enum):
+    REQUEST = "request"
+    APP = "app"
+    WORKER = "worker"
+
+
+class OffloadMode(str, Enum):
+    DEFAULT = "default"
+    INLINE = "inline"
+    EXECUTOR = "executor"
+
+
+class ValidationMode(str, Enum):
+    EAGER = "eager"
+    DEFERRED = "deferred"
+    OFF = "off"
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    JSON = "json"
+    CSV = "csv"
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
 class RouteMeta:
+    __slots__ = ("binds",)
+
     def __init__(self, *, binds: Callable[..., Any]) -> None:
         self.binds = binds
 
 
 class HTTPRouteMeta(RouteMeta):
+    __slots__ = ("request_method",)
+
     def __init__(self, *, binds: Callable[..., Any], request_method: HTTPRequestMethod) -> None:
         super().__init__(binds=binds)
         self.request_method = request_method
 
 
 class WebsocketRouteMeta(RouteMeta):
-    ...
+    __slots__ = ()
 
 
 @dataclass
@@ -44,9 +83,101 @@ class RouteMetadata:
     websocket: ClassVar[RouteMeta] = WebsocketRouteMeta(binds=APIRouter.websocket)
 
 
-@dataclass
+@dataclass(frozen=True)
+class CacheConfig:
+    ttl: float = 60.0
+    vary: Optional[Tuple[str, ...]] = None
+    max_entries: int = 1024
+    max_bytes: int = 16 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SingleFlightConfig:
+    key: Optional[Callable[[Request], Hashable]] = None
+    timeout: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class StreamConfig:
+    format: StreamFormat = StreamFormat.NDJSON
+    validate: bool = True
+    chunk_size: int = 64 * 1024
+    fields: Optional[Tuple[str, ...]] = None
+
+
+@dataclass(frozen=True)
+class BroadcastConfig:
+    queue_size: int = 256
+    overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    batch_size: int = 1
+    flush_interval: float = 0.0
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    max_size: int = 64
+    window: float = 0.005
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimit:
+    max_concurrency: int
+    max_queue: int = 0
+    queue_timeout: Optional[float] = None
+    status_code: int = 503
+    retry_after: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests: int
+    period: float = 1.0
+    burst: Optional[int] = None
+    header: Optional[str] = None
+    key: Optional[Callable[[HTTPConnection], Optional[Hashable]]] = None
+    cost: int = 1
+    status_code: int = 429
+
+
+@dataclass(frozen=True)
+class IdempotencyConfig:
+    header: str = "idempotency-key"
+    ttl: float = 24 * 60 * 60.0
+    max_entries: int = 10000
+    max_bytes: int = 1024 * 1024
+    timeout: Optional[float] = 30.0
+    lock_ttl: float = 60.0
+
+
+@dataclass(frozen=True)
+class QueueConfig:
+    max_size: int = 1000
+    workers: int = 1
+    offload: OffloadMode = OffloadMode.DEFAULT
+    batch_size: int = 1
+    flush_interval: float = 0.0
+    put_timeout: Optional[float] = None
+    drain_timeout: Optional[float] = 30.0
+
+
+@dataclass(frozen=True, **_SLOTS)
+class RouteOptions:
+    offload: Optional[OffloadMode] = None
+    response_cache: Union[CacheConfig, bool, None] = None
+    invalidate_cache: Union[bool, Sequence[str]] = False
+    single_flight: Union[SingleFlightConfig, bool, None] = None
+    batch: Union[BatchConfig, bool, None] = None
+    stream: Union[StreamConfig, StreamFormat, bool, None] = None
+    concurrency_limit: Union[ConcurrencyLimit, int, None] = None
+    fast_serialization: bool = False
+    idempotency: Union[IdempotencyConfig, bool, None] = None
+    rate_limit: Union[RateLimit, bool, None] = None
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Route:
     endpoint: Callable[..., Any]
     route_meta: RouteMeta
     route_args: Tuple[Any, ...]
-    route_kwargs: Dict[str, Any]
+    route_kwargs: Mapping[str, Any]
+    route_options: RouteOptions = field(default_factory=RouteOptions)
@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+try:
+    from starlette.routing import get_route_path
+except ImportError:  # pragma: no cover
+
+    def get_route_path(scope: Scope) -> str:
+        return scope["path"]
+
+
+_ROUTE_KEY = "fastapi_controllers.route"
+
+
+class _TrieNode:
+    __slots__ = ("children", "routes")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.routes: List[int] = []
+
+
+def _get_static_segments(path: str) -> List[str]:
+    """
+    Get the leading segments of a route path that do not contain any path parameters.
+
+    Args:
+        path: The path of the route.
+
+    Returns:
+        The static segments, including the empty segment before the leading slash.
+    """
+    segments = []
+    for segment in path.split("/"):
+        if "{" in segment:
+            break
+        segments.append(segment)
+    return segments
+
+
+def _skip(scope: Scope) -> Tuple[Match, Scope]:
+    return Match.NONE, {}
+
+
+class RouteDispatcher(BaseRoute):
+    """
+    A route dispatching requests to a set of routes through a prefix trie of their static path segments.
+
+    Only the routes whose static path prefix matches the path of the request are tested, in
+    registration order, so that the routing cost does not grow with the number of routes.
+    The routes keep being registered on the router on their own for the OpenAPI schema and
+    `url_path_for` only: the dispatcher takes over their matching, they never match on their
+    own, so that the router does not test them again for the requests the dispatcher rejects.
+    """
+
+    def __init__(self, routes: Sequence[BaseRoute]) -> None:
+        self.routes = routes
+
+    @property
+    def routes(self) -> List[BaseRoute]:
+        return self._routes
+
+    @routes.setter
+    def routes(self, routes: Sequence[BaseRoute]) -> None:
+        self._routes = list(routes)
+        self._root = _TrieNode()
+        for index, route in enumerate(self._routes):
+            route.matches = _skip  # type: ignore[method-assign]
+            node = self._root
+            for segment in _get_static_segments(getattr(route, "path", "")):
+                node = node.children.setdefault(segment, _TrieNode())
+            node.routes.append(index)
+
+    def _get_candidates(self, path: str) -> List[int]:
+        """
+        Get the routes which may match a path.
+
+        Args:
+            path: The path of the request.
+
+        Returns:
+            The indices of the routes in registration order.
+        """
+        node: Optional[_TrieNode] = self._root
+        candidates: List[int] = []
+        for segment in path.split("/"):
+            if node is None:
+                break
+            candidates.extend(node.routes)
+            node = node.children.get(segment)
+        if node is not None:
+            candidates.extend(node.routes)
+        candidates.sort()
+        return candidates
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        partial: Optional[Tuple[Match, Scope]] = None
+        for index in self._get_candidates(get_route_path(scope)):
+            route = self._routes[index]
+            match, child_scope = type(route).matches(route, scope)
+            if match is Match.FULL:
+                return match, {**child_scope, _ROUTE_KEY: route}
+            if match is Match.PARTIAL and partial is None:
+                partial = (match, {**child_scope, _ROUTE_KEY: route})
+        return partial or (Match.NONE, {})
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route: BaseRoute = scope.pop(_ROUTE_KEY)
+        scope["route"] = route
+        await route.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> Any:
+        for route in self._routes:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                continue
+        raise NoMatchFound(name, path_params)
@@ -1,13 +1,31 @@
 import inspect
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+import types
+from functools import lru_cache, update_wrapper
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type
 
 from fastapi import Depends
+from fastapi.dependencies.utils import get_typed_annotation
+
+
+@lru_cache(maxsize=None)
+def _get_binding_signature(method: Callable[..., Any]) -> inspect.Signature:
+    """
+    Get the signature of a method without its first parameter.
+
+    Args:
+        method: The method whose signature should be computed.
+
+    Returns:
+        The signature used to bind the parameters of the method.
+    """
+    target_sig = inspect.signature(method)
+    return target_sig.replace(parameters=list(target_sig.parameters.values())[1:])
 
 
 def _validate_against_signature(
     method: Callable[..., Any],
     args: Optional[Tuple[Any, ...]] = None,
-    kwargs: Optional[Dict[str, Any]] = None,
+    kwargs: Optional[Mapping[str, Any]] = None,
 ) -> None:
     """
     Validate method parameters against those of the corresponding APIRouter method.
@@ -17,18 +35,75 @@ def _validate_against_signature(
         args: The positional arguments of the method.
         kwargs: The keyword arguments of the method.
     """
-    target_sig = inspect.signature(method)
-    valid_sig = target_sig.replace(parameters=list(target_sig.parameters.values())[1:])
-    valid_sig.bind(*(args or tuple()), **(kwargs or {}))
+    _get_binding_signature(method).bind(*(args or tuple()), **(kwargs or {}))
+
+
+def _get_typed_signature(func: Callable[..., Any]) -> inspect.Signature:
+    """
+    Get the signature of a function with its string annotations evaluated.
+
+    Args:
+        func: The function or class whose signature should be computed.
+
+    Returns:
+        The signature with the annotations resolved against the globals of the function (or the class __init__).
+    """
+    sig = inspect.signature(func)
+    target = inspect.unwrap(func)
+    globalns = getattr(target, "__globals__", None) or getattr(getattr(target, "__init__", None), "__globals__", {})
+    return sig.replace(
+        parameters=[param.replace(annotation=get_typed_annotation(param.annotation, globalns)) for param in sig.parameters.values()],
+        return_annotation=get_typed_annotation(sig.return_annotation, globalns),
+    )
+
+
+def _wrap_endpoint(func: Callable[..., Any], wrapper: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Make a wrapper look like the wrapped endpoint to FastAPI.
+
+    Args:
+        func: The wrapped endpoint.
+        wrapper: The wrapper accepting the same keyword arguments as the endpoint.
+
+    Returns:
+        The wrapper with the metadata and the resolved signature of the endpoint.
+    """
+    update_wrapper(wrapper, func)
+    wrapper.__signature__ = _get_typed_signature(func)  # type: ignore
+    return wrapper
+
+
+def _clone_endpoint(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Create a thin wrapper of an endpoint which can carry its own attributes.
 
+    Args:
+        func: The endpoint.
 
-def _replace_signature(klass: Type, func: Callable[..., Any]) -> None:
+    Returns:
+        A sync or async wrapper, depending on the endpoint, calling the endpoint.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        async def async_endpoint(**kwargs: Any) -> Any:
+            return await func(**kwargs)
+
+        return _wrap_endpoint(func, async_endpoint)
+
+    def endpoint(**kwargs: Any) -> Any:
+        return func(**kwargs)
+
+    return _wrap_endpoint(func, endpoint)
+
+
+def _replace_signature(klass: Type, func: Callable[..., Any], dependency: Optional[Callable[..., Any]] = None) -> None:
     """
     Replace the 'self' attribute with a FastAPI Depends injection.
 
     Args:
         klass: The class that will be injected.
         func: The function whose signature will be replaced.
+        dependency: An optional callable providing the instance in place of the class itself.
     """
     orig_sig = inspect.signature(func)
     new_params = [
@@ -36,7 +111,82 @@ def _replace_signature(klass: Type, func: Callable[..., Any]) -> None:
             kind=inspect.Parameter.KEYWORD_ONLY,
         )
         if param.name != "self"
-        else param.replace(default=Depends(klass))
+        else param.replace(default=Depends(dependency or klass))
         for param in list(orig_sig.parameters.values())
     ]
     func.__signature__ = orig_sig.replace(parameters=new_params)  # type: ignore
+
+
+def _bind_endpoint(klass: Type, func: Callable[..., Any], dependency: Optional[Callable[..., Any]] = None) -> Callable[..., Any]:
+    """
+    Create a copy of a method whose 'self' attribute is injected with a FastAPI Depends.
+
+    The method itself is left untouched, so that it can be bound to several classes (e.g. when
+    inherited by several controllers). The copy shares the code of the method and is as cheap to
+    call as the method itself.
+
+    Args:
+        klass: The class that will be injected.
+        func: The method.
+        dependency: An optional callable providing the instance in place of the class itself.
+
+    Returns:
+        The copy of the method with the replaced signature.
+    """
+    endpoint: Callable[..., Any]
+    if isinstance(func, types.FunctionType):
+        endpoint = types.FunctionType(func.__code__, func.__globals__, func.__name__, func.__defaults__, func.__closure__)
+        update_wrapper(endpoint, func)
+        endpoint.__kwdefaults__ = func.__kwdefaults__  # type: ignore
+    else:
+        endpoint = _clone_endpoint(func)
+    _replace_signature(klass, endpoint, dependency)
+    return endpoint
+
+
+_FOLDED_ROUTER_PARAMS = frozenset(
+    {
+        "prefix",
+        "tags",
+        "dependencies",
+        "responses",
+        "deprecated",
+        "include_in_schema",
+        "default_response_class",
+        "callbacks",
+        "generate_unique_id_function",
+    }
+)
+
+
+def _merge_router_params(route_kwargs: Mapping[str, Any], router_params: Dict[str, Any], websocket: bool = False) -> Dict[str, Any]:
+    """
+    Fold APIRouter parameters into the parameters of a single route, the way APIRouter.add_api_route does.
+
+    Args:
+        route_kwargs: The keyword arguments of the route.
+        router_params: The APIRouter parameters, only those listed in _FOLDED_ROUTER_PARAMS are supported.
+        websocket: Whether the route is a websocket route.
+
+    Returns:
+        The keyword arguments of the route including the APIRouter parameters.
+    """
+    merged = dict(route_kwargs)
+    if router_params.get("dependencies"):
+        merged["dependencies"] = [*router_params["dependencies"], *(route_kwargs.get("dependencies") or [])]
+    if websocket:
+        return merged
+    if router_params.get("tags"):
+        merged["tags"] = [*router_params["tags"], *(route_kwargs.get("tags") or [])]
+    if router_params.get("responses"):
+        merged["responses"] = {**router_params["responses"], **(route_kwargs.get("responses") or {})}
+    if router_params.get("callbacks"):
+        merged["callbacks"] = [*router_params["callbacks"], *(route_kwargs.get("callbacks") or [])]
+    if router_params.get("deprecated"):
+        merged["deprecated"] = True
+    if router_params.get("include_in_schema") is False:
+        merged["include_in_schema"] = False
+    for router_param, route_param in [("default_response_class", "response_class"), ("generate_unique_id_function", "generate_unique_id_function")]:
+        if router_param in router_params and route_param not in route_kwargs:
+            merged[route_param] = router_params[router_param]
+    return merged
@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import json
+from contextlib import AsyncExitStack
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from fastapi import HTTPException, Request, Response, status
+
+from fastapi_controllers.definitions import IdempotencyConfig
+from fastapi_controllers.middleware import _CREDENTIAL_HEADERS, RequestHandler
+from fastapi_controllers.state import MemoryStateBackend, StateBackend
+
+_REPLAYED_HEADER = "idempotent-replayed"
+_IN_PROGRESS = "A request with the same idempotency key is in progress"
+
+
+async def _get_fingerprint(request: Request) -> str:
+    """
+    Compute a fingerprint of a request, identifying the requests a stored response may be replayed for.
+
+    Args:
+        request: The request.
+
+    Returns:
+        A digest of the request method, the path, the query parameters and the body of the request.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (request.method, request.scope["path"], str(request.query_params)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+def _dump_response(fingerprint: str, response: Response) -> bytes:
+    headers = [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response.raw_headers]
+    return json.dumps([fingerprint, response.status_code, headers]).encode() + b"\0" + response.body
+
+
+def _load_response(data: bytes) -> Tuple[str, Response]:
+    meta, body = data.split(b"\0", 1)
+    fingerprint, status_code, headers = json.loads(meta)
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+    response.raw_headers.append((_REPLAYED_HEADER.encode(), b"true"))
+    return fingerprint, response
+
+
+def _is_storable(response: Response, max_bytes: int) -> bool:
+    """
+    Check if a response can be replayed for the retries of a request.
+
+    Args:
+        response: The response.
+        max_bytes: The maximum size of the body of the response.
+
+    Returns:
+        True for fully serialized responses which are not server errors, so that failed requests can be retried.
+    """
+    body = getattr(response, "body", None)
+    return isinstance(body, bytes) and len(body) <= max_bytes and response.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+class IdempotencyMiddleware:
+    """
+    A route middleware running mutating requests at most once per idempotency key.
+
+    The response of the first request carrying a key is stored for `ttl` seconds and replayed,
+    with the `Idempotent-Replayed` header, to the later requests carrying the same key. Requests
+    arriving while the first one is in flight wait for its response. Reusing a key for a different
+    request fails with 422 Unprocessable Entity, waiting longer than `timeout` seconds with
+    409 Conflict. Requests without a key, as well as server errors and streamed responses, are
+    not affected.
+
+    The keys are scoped by the credentials (Authorization and Cookie headers) of the requests:
+    replays skip the dependencies of the route, so a stored response is only ever replayed to
+    requests carrying the credentials the first request was handled with, and the same key sent
+    with other credentials is a different request.
+
+    The responses are stored per application in a bounded in-process store. With a StateBackend,
+    the responses are shared by all the applications and processes using the backend instead.
+    """
+
+    def __init__(self, config: IdempotencyConfig, state: Optional[StateBackend] = None, namespace: str = "") -> None:
+        self.config = config
+        self.state = state
+        self.namespace = namespace
+        self._stores: "WeakKeyDictionary[object, StateBackend]" = WeakKeyDictionary()
+        self._calls: "WeakKeyDictionary[object, Dict[str, asyncio.Future]]" = WeakKeyDictionary()
+
+    def get_store(self, app: object) -> StateBackend:
+        """
+        Get the store of the responses of an application.
+
+        Args:
+            app: The application.
+
+        Returns:
+            The store.
+        """
+        if self.state is not None:
+            return self.state
+        store = self._stores.get(app)
+        if store is None:
+            store = self._stores[app] = MemoryStateBackend(max_entries=self.config.max_entries)
+        return store
+
+    def _get_calls(self, app: object) -> Dict[str, asyncio.Future]:
+        calls = self._calls.get(app)
+        if calls is None:
+            calls = self._calls[app] = {}
+        return calls
+
+    def _get_key(self, request: Request, idempotency_key: str) -> str:
+        # the credentials are hashed, so that they do not end up in the keys of a shared StateBackend
+        credentials = hashlib.blake2b(repr([request.headers.get(header) for header in _CREDENTIAL_HEADERS]).encode(), digest_size=16).hexdigest()
+        return f"{self.namespace}{credentials}:{idempotency_key}"
+
+    def _replay(self, store: StateBackend, key: str, fingerprint: str) -> Optional[Response]:
+        data = store.get(key)
+        if data is None:
+            return None
+        stored_fingerprint, response = _load_response(data)
+        if stored_fingerprint != fingerprint:
+            raise HTTPException(HTTPStatus.UNPROCESSABLE_ENTITY, "The idempotency key has been used for a different request")
+        return response
+
+    async def _wait(self, future: asyncio.Future) -> None:
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.config.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status.HTTP_409_CONFLICT, _IN_PROGRESS) from None
+
+    async def _lead(self, store: StateBackend, key: str, fingerprint: str, request: Request, call_next: RequestHandler) -> Response:
+        async with AsyncExitStack() as stack:
+            # the lock keeps other processes sharing the backend from running the request at the same time
+            try:
+                await stack.enter_async_context(store.lock(key, ttl=self.config.lock_ttl, timeout=self.config.timeout))
+            except TimeoutError:
+                raise HTTPException(status.HTTP_409_CONFLICT, _IN_PROGRESS) from None
+            response = self._replay(store, key, fingerprint)
+            if response is not None:
+                return response
+            response = await call_next(request)
+            if _is_storable(response, self.config.max_bytes):
+                store.set(key, _dump_response(fingerprint, response), self.config.ttl)
+            return response
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        idempotency_key = request.headers.get(self.config.header)
+        if not idempotency_key:
+            return await call_next(request)
+        store = self.get_store(request.app)
+        key = self._get_key(request, idempotency_key)
+        fingerprint = await _get_fingerprint(request)
+        calls = self._get_calls(request.app)
+        while True:
+            response = self._replay(store, key, fingerprint)
+            if response is not None:
+                return response
+            future = calls.get(key)
+            if future is None:
+                break
+            await self._wait(future)
+        future = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            return await self._lead(store, key, fingerprint, request, call_next)
+        finally:
+            future.set_result(None)
+            del calls[key]
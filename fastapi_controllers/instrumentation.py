@@ -0,0 +1,304 @@
+import inspect
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple, Type
+
+from fastapi import Request, Response
+
+from fastapi_controllers.helpers import _get_typed_signature, _wrap_endpoint
+from fastapi_controllers.middleware import RequestHandler
+
+PHASES = ("construction", "handler", "serialization", "total")
+_DEFAULT_BOUNDS = tuple(0.000001 * 2**exponent for exponent in range(28))
+
+
+class Histogram:
+    """
+    A histogram of durations in seconds with fixed, exponentially growing buckets.
+    """
+
+    def __init__(self, bounds: Sequence[float] = _DEFAULT_BOUNDS) -> None:
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Record a single duration.
+
+        Args:
+            value: The duration in seconds.
+        """
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            percent: The percentile between 0 and 100.
+
+        Returns:
+            The upper bound of the bucket containing the percentile, capped at the maximum duration.
+        """
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, bound in enumerate(self.bounds):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class RouteMetrics:
+    """
+    The durations of the phases of the requests served by a single route.
+
+    The phases are the construction of the controller, the handler itself, the serialization of
+    the value returned by the handler and the total time spent in the route, including the
+    parsing of the request and the resolution of the remaining dependencies.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.histograms = {phase: Histogram() for phase in PHASES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        requests = self.histograms["total"].count
+        return {
+            "requests": requests,
+            "throughput": requests / elapsed if elapsed > 0 else 0.0,
+            **{phase: histogram.to_dict() for phase, histogram in self.histograms.items()},
+        }
+
+
+class MetricsExporter(ABC):
+    @abstractmethod
+    def export(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Export a snapshot of the metrics.
+
+        Args:
+            snapshot: A mapping of "Controller.route" names to the metrics of the routes.
+        """
+
+
+class TextExporter(MetricsExporter):
+    """
+    An exporter writing a human-readable table of the metrics to a text stream (stderr by default).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream
+
+    def export(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        stream = self.stream or sys.stderr
+        columns = "".join(f"{phase + ' p50/p99 ms':>28}" for phase in PHASES)
+        stream.write(f"{'route':<40}{'requests':>10}{'req/s':>10}{columns}\n")
+        for name, metrics in snapshot.items():
+            timings = "".join(f"{metrics[phase]['p50'] * 1000:>18.3f}/{metrics[phase]['p99'] * 1000:<9.3f}" for phase in PHASES)
+            stream.write(f"{name:<40}{metrics['requests']:>10}{metrics['throughput']:>10.1f}{timings}\n")
+
+
+class JSONExporter(MetricsExporter):
+    """
+    An exporter dumping the metrics as JSON to a file or a text stream (stdout by default).
+    """
+
+    def __init__(self, path: Optional[str] = None, stream: Optional[TextIO] = None) -> None:
+        self.path = path
+        self.stream = stream
+
+    def export(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        if self.path is not None:
+            with open(self.path, "w") as file:
+                json.dump(snapshot, file, indent=2)
+            return
+        stream = self.stream or sys.stdout
+        json.dump(snapshot, stream, indent=2)
+        stream.write("\n")
+
+
+class MetricsRegistry:
+    """
+    In-process metrics of controller routes keyed by the controller class and the route name.
+    """
+
+    def __init__(self, exporter: Optional[MetricsExporter] = None) -> None:
+        self.exporter = exporter or TextExporter()
+        self._routes: Dict[Tuple[Type, str], RouteMetrics] = {}
+
+    def get(self, controller: Type, name: str) -> RouteMetrics:
+        """
+        Get the metrics of a route, creating them on first use.
+
+        Args:
+            controller: The controller class.
+            name: The name of the route.
+
+        Returns:
+            The metrics of the route.
+        """
+        key = (controller, name)
+        if key not in self._routes:
+            self._routes[key] = RouteMetrics()
+        return self._routes[key]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a snapshot of the metrics of all routes.
+
+        Returns:
+            A mapping of "Controller.route" names to the metrics of the routes.
+        """
+        return {f"{controller.__qualname__}.{name}": metrics.to_dict() for (controller, name), metrics in self._routes.items()}
+
+    def export(self) -> None:
+        self.exporter.export(self.snapshot())
+
+    def reset(self) -> None:
+        for metrics in self._routes.values():
+            metrics.reset()
+
+
+class _Timing:
+    def __init__(self) -> None:
+        self.construction: Optional[float] = None
+        self.handler: Optional[float] = None
+        self.handler_end: Optional[float] = None
+
+    def record(self, phase: str, start: float, end: float) -> None:
+        setattr(self, phase, end - start)
+        if phase == "handler":
+            self.handler_end = end
+
+
+_timing: ContextVar[Optional[_Timing]] = ContextVar("fastapi_controllers_timing", default=None)
+
+
+def _timed(func: Callable[..., Any], phase: str) -> Callable[..., Any]:
+    """
+    Create a callable recording the duration of a function as a phase of the current request.
+
+    Args:
+        func: The function to be timed.
+        phase: The name of the phase.
+
+    Returns:
+        A sync or async callable, depending on the function, calling the function.
+    """
+    if inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(type(func).__call__):
+
+        async def async_call(**kwargs: Any) -> Any:
+            timing = _timing.get()
+            start = time.perf_counter()
+            try:
+                return await func(**kwargs)
+            finally:
+                if timing is not None:
+                    timing.record(phase, start, time.perf_counter())
+
+        return async_call
+
+    def call(**kwargs: Any) -> Any:
+        timing = _timing.get()
+        start = time.perf_counter()
+        try:
+            return func(**kwargs)
+        finally:
+            if timing is not None:
+                timing.record(phase, start, time.perf_counter())
+
+    return call
+
+
+def _instrument_endpoint(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap an endpoint so that it records the duration of the handler.
+
+    Args:
+        func: The endpoint.
+
+    Returns:
+        The wrapped endpoint.
+    """
+    return _wrap_endpoint(func, _timed(func, "handler"))
+
+
+def _instrument_constructor(klass: Type, constructor: Optional[Callable[..., Any]] = None) -> Callable[..., Any]:
+    """
+    Create a dependency recording the duration of the construction of a controller.
+
+    Args:
+        klass: The controller class.
+        constructor: An optional callable providing the instance in place of the class itself.
+
+    Returns:
+        The dependency.
+    """
+    call = _timed(constructor or klass, "construction")
+    call.__signature__ = _get_typed_signature(constructor or klass).replace(return_annotation=klass)  # type: ignore
+    return call
+
+
+class TimingMiddleware:
+    """
+    A route middleware recording the durations of the phases of every request in RouteMetrics.
+
+    The serialization phase is measured from the return of the handler to the response
+    reaching the middleware.
+    """
+
+    def __init__(self, metrics: RouteMetrics) -> None:
+        self.metrics = metrics
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        timing = _Timing()
+        token = _timing.set(timing)
+        start = time.perf_counter()
+        response: Optional[Response] = None
+        try:
+            response = await call_next(request)
+            return response
+        finally:
+            end = time.perf_counter()
+            _timing.reset(token)
+            self._observe(timing, start, end, serialized=response is not None)
+
+    def _observe(self, timing: _Timing, start: float, end: float, serialized: bool) -> None:
+        histograms = self.metrics.histograms
+        histograms["total"].observe(end - start)
+        durations: List[Tuple[str, Optional[float]]] = [("construction", timing.construction), ("handler", timing.handler)]
+        if serialized and timing.handler_end is not None:
+            durations.append(("serialization", end - timing.handler_end))
+        for phase, duration in durations:
+            if duration is not None:
+                histograms[phase].observe(duration)
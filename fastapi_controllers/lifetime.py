@@ -0,0 +1,186 @@
+import asyncio
+import inspect
+import os
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional
+from weakref import WeakKeyDictionary
+
+from fastapi import params
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+
+from fastapi_controllers.definitions import ControllerLifetime
+from fastapi_controllers.helpers import _get_typed_signature
+
+
+def _get_dependency(param: inspect.Parameter) -> Optional[params.Depends]:
+    """
+    Extract the FastAPI Depends marker of a parameter.
+
+    Args:
+        param: The parameter to be inspected.
+
+    Returns:
+        The Depends marker provided either as the default value or via Annotated metadata.
+    """
+    if isinstance(param.default, params.Depends):
+        return param.default
+    for metadata in getattr(param.annotation, "__metadata__", ()):
+        if isinstance(metadata, params.Depends):
+            return metadata
+    return None
+
+
+async def _solve(
+    call: Callable[..., Any],
+    *,
+    stack: AsyncExitStack,
+    overrides: Mapping[Callable[..., Any], Callable[..., Any]],
+    cache: Dict[Callable[..., Any], Any],
+) -> Any:
+    """
+    Resolve a dependency tree outside of a request.
+
+    Only dependencies that do not rely on request data can be resolved this way.
+    Generator dependencies are entered into the provided exit stack. String annotations
+    (e.g. with `from __future__ import annotations`) are evaluated like FastAPI does.
+
+    Args:
+        call: The dependency to be resolved.
+        stack: The exit stack managing the teardown of generator dependencies.
+        overrides: A mapping of dependency overrides.
+        cache: A cache of already resolved dependencies.
+
+    Returns:
+        The value returned by the dependency.
+    """
+    call = overrides.get(call, call)
+    if call in cache:
+        return cache[call]
+    kwargs: Dict[str, Any] = {}
+    for name, param in _get_typed_signature(call).parameters.items():
+        dependency = _get_dependency(param)
+        if dependency is not None:
+            sub_call = dependency.dependency or param.annotation
+            kwargs[name] = await _solve(sub_call, stack=stack, overrides=overrides, cache=cache if dependency.use_cache else {})
+        elif param.default is inspect.Parameter.empty and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            raise TypeError(f"Parameter '{name}' of {call!r} cannot be resolved outside of a request")
+    if inspect.isasyncgenfunction(call):
+        value = await stack.enter_async_context(asynccontextmanager(call)(**kwargs))
+    elif inspect.isgeneratorfunction(call):
+        value = stack.enter_context(contextmanager(call)(**kwargs))
+    elif inspect.iscoroutinefunction(call) or inspect.iscoroutinefunction(type(call).__call__):
+        value = await call(**kwargs)
+    else:
+        value = await run_in_threadpool(call, **kwargs)
+    cache[call] = value
+    return value
+
+
+class _InstanceScope:
+    def __init__(self) -> None:
+        self.instance: Any = None
+        self.users = 0
+        self._stack = AsyncExitStack()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self, klass: Callable[..., Any], overrides: Mapping[Callable[..., Any], Callable[..., Any]]) -> Any:
+        """
+        Get the scoped instance, building it on first use.
+
+        Args:
+            klass: The class to be instantiated.
+            overrides: A mapping of dependency overrides.
+
+        Returns:
+            The scoped instance of the class.
+        """
+        if self.instance is None:
+            self._lock = self._lock or asyncio.Lock()
+            async with self._lock:
+                if self.instance is None:
+                    self.instance = await _solve(klass, stack=self._stack, overrides=overrides, cache={})
+        return self.instance
+
+    async def aclose(self) -> None:
+        """
+        Drop the scoped instance and tear down its generator dependencies.
+        """
+        self.instance = None
+        await self._stack.aclose()
+        self._stack = AsyncExitStack()
+
+
+class _InstanceProvider:
+    def __init__(self, klass: Callable[..., Any], lifetime: ControllerLifetime) -> None:
+        self.klass = klass
+        self.lifetime = lifetime
+        self._app_scopes: "WeakKeyDictionary[Any, _InstanceScope]" = WeakKeyDictionary()
+        self._worker_scope = _InstanceScope()
+        self._worker_pid = os.getpid()
+        self.successor: Optional[_InstanceProvider] = None
+
+    def _get_scope(self, app: Any) -> _InstanceScope:
+        """
+        Get the instance scope corresponding to the configured lifetime.
+
+        Args:
+            app: The application serving the request.
+
+        Returns:
+            The instance scope.
+        """
+        if self.lifetime is ControllerLifetime.APP:
+            return self._app_scopes.setdefault(app, _InstanceScope())
+        if self._worker_pid != os.getpid():
+            self._worker_scope = _InstanceScope()
+            self._worker_pid = os.getpid()
+        return self._worker_scope
+
+    async def __call__(self, connection: HTTPConnection) -> Any:
+        app = connection.app
+        return await self._get_scope(app).get(self.klass, getattr(app, "dependency_overrides", {}))
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """
+        Build the scoped instance at application startup and tear it down at shutdown.
+
+        Args:
+            app: The application being started.
+        """
+        scope = self._get_scope(app)
+        scope.users += 1
+        try:
+            await scope.get(self.klass, getattr(app, "dependency_overrides", {}))
+            yield
+        finally:
+            scope.users -= 1
+            if not scope.users:
+                await scope.aclose()
+                # instances of reloaded versions are built on first use and torn down along with the original one
+                successor = self.successor
+                while successor is not None:
+                    await successor._get_scope(app).aclose()
+                    successor = successor.successor
+
+
+def _chain_lifespans(outer: Callable[[Any], Any], inner: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Chain two lifespan context factories so that the inner one runs within the outer one.
+
+    Args:
+        outer: The lifespan context factory entered first.
+        inner: The lifespan context factory entered second.
+
+    Returns:
+        A lifespan context factory running both.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[Any]:
+        async with outer(app) as state:
+            async with inner(app):
+                yield state
+
+    return lifespan
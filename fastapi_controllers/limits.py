@@ -0,0 +1,287 @@
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, WebSocketException
+from starlette import status
+from starlette.requests import HTTPConnection
+from starlette.websockets import WebSocket
+
+from fastapi_controllers.definitions import ConcurrencyLimit, RateLimit
+from fastapi_controllers.middleware import RequestHandler
+from fastapi_controllers.state import StateBackend
+
+# attempts of a StateBackend rate limit update racing with other processes before the request is rejected
+_MAX_ATTEMPTS = 8
+# rounding errors of the accumulated emission times must not reject the last request of a burst
+_TOLERANCE = 1e-9
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of requests handled at the same time, queueing a bounded number of excess requests.
+
+    Queued requests are admitted in arrival order as soon as a running request completes.
+    Requests arriving when the queue is full, or waiting longer than the queue timeout, are rejected.
+    """
+
+    def __init__(self, config: ConcurrencyLimit) -> None:
+        self.config = config
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """
+        Wait for a free slot.
+
+        Returns:
+            True if the slot has been acquired, False if the request has been rejected.
+        """
+        if self.in_flight < self.config.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.config.max_queue:
+            self.rejected += 1
+            return False
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.config.queue_timeout)
+        except BaseException as exc:
+            if future.done() and not future.cancelled():
+                # the slot was handed over just before the wait was interrupted
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            if not isinstance(exc, asyncio.TimeoutError):
+                raise
+            self.rejected += 1
+            return False
+        return True
+
+    def release(self) -> None:
+        """
+        Release a slot, handing it over to the first queued request if any.
+        """
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _get_headers(self) -> Optional[Dict[str, str]]:
+        return None if self.config.retry_after is None else {"retry-after": str(self.config.retry_after)}
+
+    async def websocket_dependency(self, websocket: WebSocket) -> AsyncIterator[None]:
+        """
+        A dependency holding a slot for the lifetime of a websocket connection.
+
+        Rejected connections are closed with the 1013 (Try Again Later) code.
+
+        Args:
+            websocket: The websocket.
+        """
+        if not await self.acquire():
+            raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many concurrent connections")
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    A route middleware rejecting requests exceeding the limits of a ConcurrencyLimiter.
+
+    The slot is held until the response has been created, streamed response bodies are sent after its release.
+    """
+
+    def __init__(self, limiter: ConcurrencyLimiter) -> None:
+        self.limiter = limiter
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        if not await self.limiter.acquire():
+            raise HTTPException(self.limiter.config.status_code, "Too many concurrent requests", headers=self.limiter._get_headers())
+        try:
+            return await call_next(request)
+        finally:
+            self.limiter.release()
+
+
+def _take(tat: float, now: float, limit: RateLimit) -> Tuple[float, float]:
+    """
+    Take tokens from a token bucket stored as its theoretical arrival time (GCRA).
+
+    The bucket is full whenever the theoretical arrival time is not in the future, so a single
+    timestamp per key is enough and idle keys can simply expire at that time.
+
+    Args:
+        tat: The theoretical arrival time of the bucket.
+        now: The current time.
+        limit: The rate limit.
+
+    Returns:
+        The new theoretical arrival time and 0, or the unchanged time and the seconds until enough tokens are available.
+    """
+    interval = limit.period / limit.requests
+    burst = limit.requests if limit.burst is None else limit.burst
+    new_tat = max(tat, now) + interval * limit.cost
+    wait = new_tat - now - interval * burst
+    if wait > _TOLERANCE:
+        return tat, wait
+    return new_tat, 0.0
+
+
+class RateLimitBackend(ABC):
+    """
+    A store of the token buckets of rate limited clients.
+    """
+
+    @abstractmethod
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        """
+        Take tokens from the bucket of a client.
+
+        Args:
+            key: The key of the bucket.
+            limit: The rate limit.
+
+        Returns:
+            0 if the tokens have been taken, otherwise the seconds until enough tokens are available.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    A RateLimitBackend keeping the buckets in the memory of the current process.
+
+    Full buckets are dropped, the least recently used ones first once `max_entries` is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 65536) -> None:
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tat, wait = _take(self._buckets.pop(key, now), now, limit)
+            if tat > now:
+                self._buckets[key] = tat
+            while self._buckets:
+                oldest, expires = next(iter(self._buckets.items()))
+                if expires > now and len(self._buckets) <= self.max_entries:
+                    break
+                del self._buckets[oldest]
+        return wait
+
+
+class StateRateLimitBackend(RateLimitBackend):
+    """
+    A RateLimitBackend keeping the buckets in a StateBackend, shared by all the processes using the backend.
+
+    The buckets expire once they are full again.
+    """
+
+    def __init__(self, state: StateBackend) -> None:
+        self.state = state
+
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        for _ in range(_MAX_ATTEMPTS):
+            now = time.monotonic()
+            data = self.state.get(key)
+            tat, wait = _take(now if data is None else float(data), now, limit)
+            if wait:
+                return wait
+            value = repr(tat).encode()
+            # compare-and-swap: a concurrent update makes the delete or the add fail
+            if (data is None or self.state.delete(key, data)) and self.state.add(key, value, tat - now):
+                return 0.0
+        return limit.period / limit.requests
+
+
+def _get_client_key(connection: HTTPConnection, limit: RateLimit) -> Optional[Hashable]:
+    """
+    Get the key identifying the client of a request.
+
+    Args:
+        connection: The request or websocket.
+        limit: The rate limit.
+
+    Returns:
+        The result of the custom key function, else the value of the header, else the IP address of the client.
+    """
+    if limit.key is not None:
+        return limit.key(connection)
+    if limit.header is not None:
+        value = connection.headers.get(limit.header)
+        if value:
+            return f"header:{value}"
+    return f"ip:{connection.client.host if connection.client else ''}"
+
+
+class RateLimiter:
+    """
+    A route middleware rejecting requests of clients exceeding a rate limit, enforced with a token bucket per client.
+
+    Every client may send `burst` requests at once and `requests` requests per `period` seconds on average.
+    Rejected requests fail with a Retry-After header before the request body is parsed and the
+    controller is instantiated. Requests whose custom key is None are not limited.
+    """
+
+    def __init__(self, config: RateLimit, backend: RateLimitBackend, namespace: str = "") -> None:
+        self.config = config
+        self.backend = backend
+        self.namespace = namespace
+        self.rejected = 0
+
+    def check(self, connection: HTTPConnection) -> Optional[int]:
+        """
+        Take tokens from the bucket of the client of a request.
+
+        Args:
+            connection: The request or websocket.
+
+        Returns:
+            None if the request is allowed, otherwise the seconds after which it may be retried.
+        """
+        key = _get_client_key(connection, self.config)
+        if key is None:
+            return None
+        wait = self.backend.acquire(f"{self.namespace}{key}", self.config)
+        if not wait:
+            return None
+        self.rejected += 1
+        return math.ceil(wait)
+
+    async def __call__(self, request: Request, call_next: RequestHandler) -> Response:
+        retry_after = self.check(request)
+        if retry_after is not None:
+            raise HTTPException(self.config.status_code, "Too many requests", headers={"retry-after": str(retry_after)})
+        return await call_next(request)
+
+    async def websocket_dependency(self, websocket: WebSocket) -> None:
+        """
+        A dependency rejecting the websocket connections of clients exceeding the rate limit.
+
+        Rejected connections are closed with the 1013 (Try Again Later) code.
+
+        Args:
+            websocket: The websocket.
+        """
+        if self.check(websocket) is not None:
+            raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many requests")
@@ -0,0 +1,75 @@
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Sequence, Type
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+RequestHandler = Callable[[Request], Awaitable[Response]]
+RouteMiddleware = Callable[[Request, RequestHandler], Awaitable[Response]]
+
+# the headers identifying the user of a request, route middleware sharing responses keeps them apart by default
+_CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+
+def _get_route_middleware(endpoint: Callable[..., Any]) -> Sequence[RouteMiddleware]:
+    """
+    Get the route middleware attached to an endpoint.
+
+    Args:
+        endpoint: The endpoint of the route.
+
+    Returns:
+        The route middleware in the order of execution.
+    """
+    return getattr(endpoint, "__route_middleware__", ())
+
+
+def _set_route_middleware(endpoint: Callable[..., Any], middleware: Sequence[RouteMiddleware]) -> None:
+    """
+    Attach route middleware to an endpoint.
+
+    The middleware is stored on the endpoint rather than on the route, because FastAPI
+    only carries the endpoint (and the route class) over when routers are included.
+
+    Args:
+        endpoint: The endpoint of the route.
+        middleware: The route middleware in the order of execution.
+    """
+    endpoint.__route_middleware__ = tuple(middleware)  # type: ignore
+
+
+async def _call_middleware(middleware: RouteMiddleware, call_next: RequestHandler, request: Request) -> Response:
+    return await middleware(request, call_next)
+
+
+class ControllerRoute(APIRoute):
+    """
+    An APIRoute running the route middleware attached to its endpoint around the request handler.
+
+    The route middleware is executed before the request body is parsed and the dependencies
+    (including the controller instance) are resolved, and has access to the serialized response.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler: Any = super().get_route_handler()
+        for middleware in reversed(_get_route_middleware(self.endpoint)):
+            handler = partial(_call_middleware, middleware, handler)
+        return handler
+
+
+@lru_cache(maxsize=None)
+def _get_route_class(route_class: Optional[Type[APIRoute]] = None) -> Type[ControllerRoute]:
+    """
+    Get a route class running the route middleware on top of a custom route class.
+
+    Args:
+        route_class: The custom route class of the router.
+
+    Returns:
+        The route class.
+    """
+    if route_class is None or route_class is APIRoute:
+        return ControllerRoute
+    if issubclass(route_class, ControllerRoute):
+        return route_class
+    return type(f"Controller{route_class.__name__}", (ControllerRoute, route_class), {})
@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from weakref import WeakKeyDictionary
+
+from fastapi_controllers.definitions import OffloadMode
+from fastapi_controllers.helpers import _get_typed_signature, _wrap_endpoint
+
+_executors: "WeakKeyDictionary[Type, Tuple[int, ThreadPoolExecutor]]" = WeakKeyDictionary()
+
+
+def _get_executor(klass: Type, max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Get the dedicated executor of a controller, creating it on first use in every worker process.
+
+    Args:
+        klass: The controller owning the executor.
+        max_workers: The maximum number of threads of the executor.
+
+    Returns:
+        The executor of the controller.
+    """
+    pid = os.getpid()
+    entry = _executors.get(klass)
+    if entry is None or entry[0] != pid:
+        entry = (pid, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=klass.__name__))
+        _executors[klass] = entry
+    return entry[1]
+
+
+async def _run_in_executor(executor: ThreadPoolExecutor, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """
+    Run a sync function in an executor, preserving the context variables of the caller.
+
+    Args:
+        executor: The executor to run the function in.
+        func: The function to be run.
+        kwargs: The keyword arguments of the function.
+
+    Returns:
+        The value returned by the function.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(context.run, func, **kwargs))
+
+
+def _offload(func: Callable[..., Any], mode: OffloadMode, get_executor: Callable[[], ThreadPoolExecutor]) -> Callable[..., Any]:
+    """
+    Create an async callable running a sync function inline or in a dedicated executor.
+
+    Args:
+        func: The sync function.
+        mode: The offload mode, 'default' leaves the function to FastAPI and the default thread pool.
+        get_executor: A callable returning the dedicated executor.
+
+    Returns:
+        The async callable or the original function in the 'default' mode.
+    """
+    if mode is OffloadMode.DEFAULT or inspect.iscoroutinefunction(func):
+        return func
+    if mode is OffloadMode.INLINE:
+
+        async def call(**kwargs: Any) -> Any:
+            return func(**kwargs)
+
+    else:
+
+        async def call(**kwargs: Any) -> Any:
+            return await _run_in_executor(get_executor(), func, kwargs)
+
+    return call
+
+
+def _offload_endpoint(func: Callable[..., Any], mode: OffloadMode, get_executor: Callable[[], ThreadPoolExecutor]) -> Callable[..., Any]:
+    """
+    Wrap a sync endpoint so that it runs inline on the event loop or in a dedicated executor.
+
+    Args:
+        func: The endpoint.
+        mode: The offload mode.
+        get_executor: A callable returning the dedicated executor.
+
+    Returns:
+        The wrapped endpoint or the original one if it does not need to be wrapped.
+    """
+    call = _offload(func, mode, get_executor)
+    return func if call is func else _wrap_endpoint(func, call)
+
+
+def _offload_constructor(klass: Type, mode: OffloadMode, get_executor: Callable[[], ThreadPoolExecutor]) -> Optional[Callable[..., Any]]:
+    """
+    Create a dependency constructing a class inline on the event loop or in a dedicated executor.
+
+    Args:
+        klass: The class to be constructed.
+        mode: The offload mode.
+        get_executor: A callable returning the dedicated executor.
+
+    Returns:
+        The dependency or None if the class should be injected directly.
+    """
+    call = _offload(klass, mode, get_executor)
+    if call is klass:
+        return None
+    call.__signature__ = _get_typed_signature(klass).replace(return_annotation=klass)  # type: ignore
+    return call
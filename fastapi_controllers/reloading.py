@@ -0,0 +1,241 @@
+import dataclasses
+import inspect
+import types
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, get_args, get_origin
+
+from fastapi import APIRouter
+from starlette.routing import BaseRoute
+
+from fastapi_controllers.background import BackgroundQueue
+from fastapi_controllers.definitions import Route
+from fastapi_controllers.resources import Resource
+
+_CODE_ATTRIBUTES = ("co_code", "co_names", "co_varnames", "co_freevars", "co_cellvars")
+_PRIMITIVES = (str, bytes, int, float, complex, bool, type(None))
+
+
+def _get_global_names(code: types.CodeType) -> Set[str]:
+    """
+    Get the names a code object and the code objects nested in it may look up in the globals.
+
+    Args:
+        code: The code object.
+
+    Returns:
+        The names.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_get_global_names(const))
+    return names
+
+
+def _fingerprint_local_class(value: type, module: str, seen: FrozenSet[int]) -> Hashable:
+    try:
+        source = inspect.getsource(value)
+    except (OSError, TypeError):
+        return ("class", value)
+    annotations = _fingerprint(vars(value).get("__annotations__", {}), module, seen)
+    return ("class", value.__qualname__, source, annotations, _fingerprint(value.__bases__, module, seen))
+
+
+def _fingerprint_local_function(value: types.FunctionType, module: str, seen: FrozenSet[int]) -> Hashable:
+    defaults = (_fingerprint(value.__defaults__, module, seen), _fingerprint(value.__kwdefaults__, module, seen))
+    closure = tuple(_fingerprint(cell.cell_contents, module, seen) for cell in value.__closure__ or () if cell.cell_contents is not value)
+    names = sorted(name for name in _get_global_names(value.__code__) if name in value.__globals__)
+    referenced = tuple((name, _fingerprint(value.__globals__[name], module, seen)) for name in names)
+    return ("function", _fingerprint(value.__code__, module, seen), defaults, _fingerprint(value.__annotations__, module, seen), closure, referenced)
+
+
+def _fingerprint(value: Any, module: Optional[str] = None, seen: FrozenSet[int] = frozenset()) -> Hashable:
+    """
+    Compute a fingerprint of a class attribute which changes whenever its behavior may have changed.
+
+    Classes and functions defined in the reloaded module are compared by their source and code
+    respectively, including the annotations, defaults and globals they refer to, regardless of
+    their position in the source file. Classes and functions defined elsewhere are compared by
+    identity. Values without a meaningful repr never compare equal.
+
+    Args:
+        value: The attribute.
+        module: The name of the reloaded module, defaults to comparing all the functions by their code and all the classes by identity.
+        seen: The ids of the values being fingerprinted, to stop at reference cycles.
+
+    Returns:
+        The fingerprint.
+    """
+    if isinstance(value, _PRIMITIVES):
+        return repr(value)
+    if id(value) in seen:
+        return ("cycle",)
+    seen = seen | {id(value)}
+    if isinstance(value, types.CodeType):
+        return (*(getattr(value, name) for name in _CODE_ATTRIBUTES), tuple(_fingerprint(const, module, seen) for const in value.co_consts))
+    if isinstance(value, types.FunctionType):
+        if module is not None and value.__module__ != module:
+            return ("function", value)
+        return _fingerprint_local_function(value, module or value.__module__, seen)
+    if isinstance(value, type):
+        if module is not None and value.__module__ == module:
+            return _fingerprint_local_class(value, module, seen)
+        return ("class", value)
+    if get_origin(value) is not None:
+        return ("generic", _fingerprint(get_origin(value), module, seen), _fingerprint(get_args(value), module, seen))
+    if isinstance(value, types.ModuleType):
+        return ("module", value.__name__)
+    if isinstance(value, Enum):
+        return ("enum", _fingerprint(type(value), module, seen), value.name)
+    if isinstance(value, (classmethod, staticmethod)):
+        return (type(value).__name__, _fingerprint(value.__func__, module, seen))
+    if isinstance(value, property):
+        return ("property", *(_fingerprint(accessor, module, seen) for accessor in (value.fget, value.fset, value.fdel)))
+    if isinstance(value, Route):
+        arguments = (_fingerprint(value.route_args, module, seen), _fingerprint(value.route_kwargs, module, seen))
+        options = _fingerprint(value.route_options, module, seen)
+        return ("route", _fingerprint(value.endpoint, module, seen), repr(value.route_meta), arguments, options)
+    if isinstance(value, BackgroundQueue):
+        return ("queue", _fingerprint(value.handler, module, seen), _fingerprint(value.config, module, seen))
+    if isinstance(value, Resource):
+        return ("resource", _fingerprint(value.factory, module, seen))
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, *(_fingerprint(item, module, seen) for item in value))
+    if isinstance(value, Mapping):
+        return ("mapping", *((key, _fingerprint(item, module, seen)) for key, item in value.items()))
+    if dataclasses.is_dataclass(value):
+        attributes = tuple((field.name, _fingerprint(getattr(value, field.name), module, seen)) for field in dataclasses.fields(value))
+        return ("dataclass", _fingerprint(type(value), module, seen), attributes)
+    if hasattr(value, "__dict__") and type(value).__repr__ is not object.__repr__:
+        # a custom repr may hide the state of the object
+        return ("object", _fingerprint(type(value), module, seen), _fingerprint(vars(value), module, seen))
+    return repr(value)
+
+
+def _is_class_state(name: str, value: Any) -> bool:
+    if isinstance(value, (Route, Resource)):
+        return False
+    return not name.startswith("__") or isinstance(value, (types.FunctionType, classmethod, staticmethod, property))
+
+
+def _fingerprint_class(klass: type, base: type, module: str) -> Hashable:
+    """
+    Compute a fingerprint of the attributes shared by all the routes of a controller.
+
+    Args:
+        klass: The controller class.
+        base: The base class whose attributes (and those of its bases) are not included.
+        module: The name of the reloaded module.
+
+    Returns:
+        The fingerprint of the attributes other than routes and resources defined on the class and its bases.
+    """
+    classes = [cls for cls in klass.__mro__ if cls not in base.__mro__]
+    return tuple(
+        (cls.__qualname__, tuple((name, _fingerprint(value, module)) for name, value in vars(cls).items() if _is_class_state(name, value)))
+        for cls in classes
+    )
+
+
+def _get_changed_routes(previous: type, current: type, base: type) -> List[str]:
+    """
+    Get the routes of a controller that changed since a previous version of the controller.
+
+    Args:
+        previous: The previous version of the controller.
+        current: The current version of the controller.
+        base: The base class of all controllers.
+
+    Returns:
+        The names of the routes of the current version that are new or differ from the previous version.
+    """
+    current_routes: Dict[str, Route] = current._get_route_table()  # type: ignore
+    module = current.__module__
+    try:
+        if _fingerprint_class(previous, base, module) != _fingerprint_class(current, base, module):
+            return list(current_routes)
+        if previous.__router_params__ != current.__router_params__:  # type: ignore
+            return list(current_routes)
+        previous_routes: Dict[str, Route] = previous._get_route_table()  # type: ignore
+        return [
+            name
+            for name, route in current_routes.items()
+            if name not in previous_routes or _fingerprint(previous_routes[name], module) != _fingerprint(route, module)
+        ]
+    except Exception:
+        # a module which cannot be analysed (e.g. too deeply nested references) is rebuilt as a whole rather than kept stale
+        return list(current_routes)
+
+
+def _get_routers(router: APIRouter) -> Iterator[Tuple[APIRouter, bool]]:
+    """
+    Get a router and the routers it includes by reference.
+
+    Recent FastAPI versions include routers lazily, the routes of an included router are not
+    copied but stay on the included router itself.
+
+    Args:
+        router: The router.
+
+    Returns:
+        The routers, each with a flag telling whether it is included by reference.
+    """
+    yield router, False
+    seen: Set[int] = {id(router)}
+    pending = [router]
+    while pending:
+        for route in pending.pop().routes:
+            included = getattr(route, "original_router", None)
+            if isinstance(included, APIRouter) and id(included) not in seen:
+                seen.add(id(included))
+                pending.append(included)
+                yield included, True
+
+
+def _get_include_prefix(route: BaseRoute, controller_path: str) -> str:
+    path: str = getattr(route, "path", "")
+    return path[: len(path) - len(controller_path)] if path.endswith(controller_path) else ""
+
+
+def _swap_routes(
+    routes: Iterable[BaseRoute],
+    previous_routes: Mapping[int, Tuple[str, str]],
+    build: Callable[[str], Dict[str, List[BaseRoute]]],
+    names: List[str],
+    changed: List[str],
+) -> List[BaseRoute]:
+    """
+    Compute the routes of a router with the routes of a previous version of a controller replaced.
+
+    The routes of the controller are grouped by the prefix they were included with, each group
+    is replaced in place of its first route. Unchanged routes are kept as they are.
+
+    Args:
+        routes: The routes of the router.
+        previous_routes: A mapping of the ids of the routes of the previous version to their route names and include prefixes.
+        build: A callable building the changed routes included with a prefix, grouped by route name.
+        names: The names of all the routes of the current version in registration order.
+        changed: The names of the changed routes.
+
+    Returns:
+        The new routes of the router.
+    """
+    groups: Dict[str, Dict[str, List[BaseRoute]]] = {}
+    for route in routes:
+        if id(route) in previous_routes:
+            name, prefix = previous_routes[id(route)]
+            groups.setdefault(prefix, {}).setdefault(name, []).append(route)
+    swapped: List[BaseRoute] = []
+    emitted = set()
+    for route in routes:
+        if id(route) not in previous_routes:
+            swapped.append(route)
+            continue
+        prefix = previous_routes[id(route)][1]
+        if prefix in emitted:
+            continue
+        emitted.add(prefix)
+        built = build(prefix)
+        for name in names:
+            swapped.extend(built.get(name, []) if name in changed else groups[prefix].get(name, []))
+    return swapped
@@ -0,0 +1,49 @@
+from typing import Any, AsyncContextManager, Callable, Optional, Type
+
+from starlette.requests import HTTPConnection
+
+from fastapi_controllers.definitions import ControllerLifetime
+from fastapi_controllers.lifetime import _InstanceProvider
+
+
+class Resource:
+    """
+    A resource shared by all the requests of a controller, e.g. a connection pool or a client session.
+
+    The resource is created by a factory resolved like a FastAPI dependency without a request:
+    sync or async functions as well as generator functions, whose code after the `yield` tears
+    the resource down. Resources are opened once per worker process by the lifespan of the
+    application including the controller and closed when the last such application shuts down.
+    Outside of the controller the resource can be injected with `Depends(Controller.resource)`.
+    """
+
+    def __init__(self, factory: Callable[..., Any]) -> None:
+        self.factory = factory
+        self.name = getattr(factory, "__name__", type(self).__name__)
+        self._provider = _InstanceProvider(factory, ControllerLifetime.WORKER)
+
+    def __set_name__(self, owner: Type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[Type] = None) -> Any:
+        if instance is None:
+            return self
+        value = self._provider._get_scope(None).instance
+        if value is None:
+            raise RuntimeError(f"Resource '{self.name}' is not open, resources are opened by the lifespan of the application")
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        raise AttributeError(f"Resource '{self.name}' is shared by all the instances and cannot be replaced")
+
+    async def __call__(self, connection: HTTPConnection) -> Any:
+        return await self._provider(connection)
+
+    def lifespan(self, app: Any) -> AsyncContextManager[None]:
+        """
+        Open the resource at application startup and close it at shutdown.
+
+        Args:
+            app: The application being started.
+        """
+        return self._provider.lifespan(app)
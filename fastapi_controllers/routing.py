@@ -1,10 +1,68 @@
-from typing import Any, Callable, Dict, Tuple
+from collections import OrderedDict
+from dataclasses import fields
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Mapping, Tuple, TypeVar
 
-from fastapi_controllers.definitions import Route, RouteMeta, RouteMetadata
+from fastapi_controllers.definitions import HTTPRequestMethod, Route, RouteMeta, RouteMetadata, RouteOptions, ValidationMode
 from fastapi_controllers.helpers import _validate_against_signature
+from fastapi_controllers.settings import get_validation_mode
+
+_ROUTE_OPTIONS = frozenset(option.name for option in fields(RouteOptions))
+_IDEMPOTENT_METHODS = frozenset({HTTPRequestMethod.GET, HTTPRequestMethod.HEAD})
+_MUTATING_METHODS = frozenset({HTTPRequestMethod.PATCH, HTTPRequestMethod.POST, HTTPRequestMethod.PUT})
+# the most recently used route specs only, so that specs holding closures are not kept alive forever (e.g. across reloads)
+_INTERNED: "OrderedDict[Hashable, Any]" = OrderedDict()
+_MAX_INTERNED = 1024
+
+T = TypeVar("T")
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Compute a hashable key identifying a route spec by value.
+
+    Args:
+        value: The route spec.
+
+    Returns:
+        The key, distinguishing values of different types (e.g. lists and tuples).
+
+    Raises:
+        TypeError: If the route spec is neither hashable nor a container of hashable values.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value), *(_freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_freeze(item) for item in value))
+    if isinstance(value, Mapping):
+        return (type(value), *((key, _freeze(item)) for key, item in value.items()))
+    hash(value)
+    return (type(value), value)
+
+
+def _intern(value: T) -> T:
+    """
+    Get the shared instance of an immutable route spec.
+
+    Args:
+        value: The route spec.
+
+    Returns:
+        The first route spec equal to the value among the recently used ones, or the value itself if it cannot be hashed.
+    """
+    try:
+        key = _freeze(value)
+    except TypeError:
+        return value
+    value = _INTERNED.setdefault(key, value)
+    _INTERNED.move_to_end(key)
+    if len(_INTERNED) > _MAX_INTERNED:
+        _INTERNED.popitem(last=False)
+    return value
 
 
 class _RouteDecorator:
+    __slots__ = ("route_args", "route_kwargs", "route_options")
     route_meta: RouteMeta
 
     def __init_subclass__(cls, route_meta: RouteMeta) -> None:
@@ -12,9 +70,30 @@ class _RouteDecorator:
         cls.route_meta = route_meta
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        self.route_args = args
-        self.route_kwargs = kwargs
-        _validate_against_signature(self.route_meta.binds, args=args, kwargs=kwargs)
+        self.route_options = _intern(RouteOptions(**{name: kwargs.pop(name) for name in _ROUTE_OPTIONS.intersection(kwargs)}))
+        if getattr(self.route_meta, "request_method", None) not in _IDEMPOTENT_METHODS:
+            if self.route_options.response_cache:
+                raise TypeError(f"Responses of {type(self).__name__} routes cannot be cached")
+            if self.route_options.single_flight:
+                raise TypeError(f"Requests of {type(self).__name__} routes cannot be coalesced")
+        if self.route_options.idempotency and getattr(self.route_meta, "request_method", None) not in _MUTATING_METHODS:
+            raise TypeError(f"Requests of {type(self).__name__} routes cannot use idempotency keys")
+        if not hasattr(self.route_meta, "request_method"):
+            if self.route_options.batch:
+                raise TypeError(f"Requests of {type(self).__name__} routes cannot be batched")
+            if self.route_options.stream:
+                raise TypeError(f"Responses of {type(self).__name__} routes cannot be streamed")
+            if self.route_options.fast_serialization:
+                raise TypeError(f"Responses of {type(self).__name__} routes cannot be serialized")
+        if self.route_options.batch and self.route_options.stream:
+            raise TypeError("Batched routes cannot stream their responses")
+        if self.route_options.fast_serialization and self.route_options.stream:
+            raise TypeError("Streamed routes cannot use fast serialization")
+        if get_validation_mode() is ValidationMode.EAGER:
+            _validate_against_signature(self.route_meta.binds, args=args, kwargs=kwargs)
+        # the paths make most positional arguments unique, only the keyword arguments and options are shared
+        self.route_args: Tuple[Any, ...] = args
+        self.route_kwargs: Mapping[str, Any] = _intern(MappingProxyType(kwargs))
 
     def __call__(self, endpoint: Callable[..., Any]) -> Route:
         return Route(
@@ -22,56 +101,41 @@ class _RouteDecorator:
             route_meta=self.route_meta,
             route_args=self.route_args,
             route_kwargs=self.route_kwargs,
+            route_options=self.route_options,
         )
 
-    @property
-    def route_args(self) -> Tuple[Any, ...]:
-        return self._route_args
-
-    @route_args.setter
-    def route_args(self, value: Tuple[Any, ...]) -> None:
-        self._route_args = value
-
-    @property
-    def route_kwargs(self) -> Dict[str, Any]:
-        return self._route_kwargs
-
-    @route_kwargs.setter
-    def route_kwargs(self, value: Dict[str, Any]) -> None:
-        self._route_kwargs = value
-
 
 class delete(_RouteDecorator, route_meta=RouteMetadata.delete):
-    ...
+    __slots__ = ()
 
 
 class get(_RouteDecorator, route_meta=RouteMetadata.get):
-    ...
+    __slots__ = ()
 
 
 class head(_RouteDecorator, route_meta=RouteMetadata.head):
-    ...
+    __slots__ = ()
 
 
 class options(_RouteDecorator, route_meta=RouteMetadata.options):
-    ...
+    __slots__ = ()
 
 
 class patch(_RouteDecorator, route_meta=RouteMetadata.patch):
-    ...
+    __slots__ = ()
 
 
 class post(_RouteDecorator, route_meta=RouteMetadata.post):
-    ...
+    __slots__ = ()
 
 
 class put(_RouteDecorator, route_meta=RouteMetadata.put):
-    ...
+    __slots__ = ()
 
 
 class trace(_RouteDecorator, route_meta=RouteMetadata.trace):
-    ...
+    __slots__ = ()
 
 
 class websocket(_RouteDecorator, route_meta=RouteMetadata.websocket):
-    ...
+    __slots__ = ()
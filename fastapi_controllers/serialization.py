@@ -0,0 +1,156 @@
+import inspect
+import json
+from typing import Any, Callable, Mapping, Optional, Type, get_args, get_origin
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from fastapi_controllers.helpers import _get_typed_signature, _wrap_endpoint
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    from fastapi.exceptions import ResponseValidationError
+    from pydantic import TypeAdapter, ValidationError
+except ImportError:  # pragma: no cover
+    TypeAdapter = None  # type: ignore
+
+_RESPONSE_PARAM = "_controller_response"
+_SERIALIZATION_OPTIONS = {
+    "response_model_include": "include",
+    "response_model_exclude": "exclude",
+    "response_model_by_alias": "by_alias",
+    "response_model_exclude_unset": "exclude_unset",
+    "response_model_exclude_defaults": "exclude_defaults",
+    "response_model_exclude_none": "exclude_none",
+}
+
+
+def _dumps(value: Any) -> bytes:
+    """
+    Encode a value as JSON, using orjson if available.
+
+    Args:
+        value: The value.
+
+    Returns:
+        The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()  # pragma: no cover
+
+
+def _get_response_type(func: Callable[..., Any], route_kwargs: Mapping[str, Any]) -> Any:
+    """
+    Get the type of the response of a route the way FastAPI infers the response model.
+
+    Args:
+        func: The endpoint.
+        route_kwargs: The keyword arguments of the route.
+
+    Returns:
+        The response model, the return annotation of the endpoint or None if the response is untyped.
+    """
+    if "response_model" in route_kwargs:
+        return route_kwargs["response_model"]
+    annotation = _get_typed_signature(func).return_annotation
+    if annotation is inspect.Signature.empty or (inspect.isclass(annotation) and issubclass(annotation, Response)):
+        return None
+    return annotation
+
+
+def _get_model(response_type: Any) -> Optional[Type[BaseModel]]:
+    return response_type if inspect.isclass(response_type) and issubclass(response_type, BaseModel) else None
+
+
+class _Serializer:
+    """
+    A JSON serializer compiled for the response type of a single route.
+
+    Instances of exactly the response model (or lists of them) are trusted to be valid and dumped
+    by a serializer precompiled for the type. All other values (e.g. dicts or other models) are
+    validated against the response type first, so that fields missing from the response model are
+    filtered out the way FastAPI does. Values of untyped routes are encoded as they are.
+    """
+
+    def __init__(self, response_type: Any, route_kwargs: Mapping[str, Any]) -> None:
+        self.model = _get_model(response_type)
+        self.item_model = _get_model(get_args(response_type)[0]) if get_origin(response_type) is list else None
+        self.adapter = TypeAdapter(response_type) if response_type is not None else None
+        options = {option: route_kwargs[kwarg] for kwarg, option in _SERIALIZATION_OPTIONS.items() if kwarg in route_kwargs}
+        self.options = {"by_alias": True, **options}
+
+    def _is_validated(self, value: Any) -> bool:
+        if self.model is not None:
+            return type(value) is self.model
+        if self.item_model is not None:
+            return isinstance(value, list) and all(type(item) is self.item_model for item in value)
+        return False
+
+    def __call__(self, value: Any) -> bytes:
+        if self.adapter is None:
+            return _dumps(value)
+        if not self._is_validated(value):
+            try:
+                value = self.adapter.validate_python(value, from_attributes=True)
+            except ValidationError as exc:
+                raise ResponseValidationError(errors=exc.errors(), body=value) from None
+        return self.adapter.dump_json(value, **self.options)  # type: ignore
+
+
+def _serialize_endpoint(func: Callable[..., Any], route_kwargs: Mapping[str, Any]) -> Callable[..., Any]:
+    """
+    Create an endpoint serializing the values returned by an endpoint with a precompiled serializer.
+
+    The endpoint returns a response, so that FastAPI skips its own validation and serialization
+    of the value. The status code and the headers set on the injected Response are preserved.
+    Without pydantic's TypeAdapter, typed endpoints are left to FastAPI.
+
+    Args:
+        func: The endpoint.
+        route_kwargs: The keyword arguments of the route.
+
+    Returns:
+        The serializing endpoint.
+    """
+    response_type = _get_response_type(func, route_kwargs)
+    if TypeAdapter is None and response_type is not None:  # pragma: no cover
+        return func
+    serialize = _Serializer(response_type, route_kwargs)
+    status_code = route_kwargs.get("status_code")
+    sig = _get_typed_signature(func)
+    # FastAPI injects the Response into a single parameter, an existing one is shared with the endpoint
+    name = next((param.name for param in sig.parameters.values() if param.annotation is Response), None)
+    get_response = (lambda kwargs: kwargs.pop(_RESPONSE_PARAM)) if name is None else (lambda kwargs: kwargs[name])
+
+    def respond(value: Any, response: Response) -> Any:
+        if isinstance(value, Response):
+            return value
+        result = Response(serialize(value), status_code=response.status_code or status_code or 200, media_type=JSONResponse.media_type)
+        result.raw_headers.extend(response.raw_headers)
+        return result
+
+    if inspect.iscoroutinefunction(func):
+
+        async def async_endpoint(**kwargs: Any) -> Any:
+            response = get_response(kwargs)
+            return respond(await func(**kwargs), response)
+
+        endpoint = _wrap_endpoint(func, async_endpoint)
+    else:
+
+        def sync_endpoint(**kwargs: Any) -> Any:
+            response = get_response(kwargs)
+            return respond(func(**kwargs), response)
+
+        endpoint = _wrap_endpoint(func, sync_endpoint)
+    if name is None:
+        param = inspect.Parameter(_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+        endpoint.__signature__ = sig.replace(parameters=[*sig.parameters.values(), param])  # type: ignore
+    return endpoint
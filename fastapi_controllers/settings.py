@@ -0,0 +1,31 @@
+import os
+from typing import Union
+
+from fastapi_controllers.definitions import ValidationMode
+
+_validation_mode = ValidationMode(os.environ.get("FASTAPI_CONTROLLERS_VALIDATION", ValidationMode.EAGER.value))
+
+
+def get_validation_mode() -> ValidationMode:
+    """
+    Get the mode in which route and router parameters are validated.
+
+    Returns:
+        The current validation mode.
+    """
+    return _validation_mode
+
+
+def set_validation_mode(mode: Union[ValidationMode, str]) -> None:
+    """
+    Set the mode in which route and router parameters are validated.
+
+    The mode has to be set before the controllers are defined. It defaults to the value
+    of the FASTAPI_CONTROLLERS_VALIDATION environment variable or 'eager' if it is not set.
+
+    Args:
+        mode: 'eager' validates the parameters on definition, 'deferred' validates them
+            in Controller.create_router and 'off' disables the validation altogether.
+    """
+    global _validation_mode
+    _validation_mode = ValidationMode(mode)
@@ -0,0 +1,447 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, suppress
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+    import msvcrt
+
+_NEVER = float("inf")
+
+
+def _expires(ttl: Optional[float]) -> float:
+    return _NEVER if ttl is None else time.monotonic() + ttl
+
+
+class StateBackend(ABC):
+    """
+    A key-value store for state shared by the controllers, e.g. cached responses or counters.
+
+    Keys are strings, values are bytes. Every operation is atomic. Expiration times are given
+    as seconds from now, the backend keeps them consistent for all the processes sharing it.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get the value of a key.
+
+        Args:
+            key: The key.
+
+        Returns:
+            The value or None if the key is missing or has expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Set the value of a key.
+
+        Args:
+            key: The key.
+            value: The value.
+            ttl: The seconds after which the key expires, defaults to never.
+
+        Returns:
+            True if the value has been stored, False if it exceeds the capacity of the backend.
+        """
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Set the value of a key unless it is already set.
+
+        Args:
+            key: The key.
+            value: The value.
+            ttl: The seconds after which the key expires, defaults to never.
+
+        Returns:
+            True if the value has been stored.
+        """
+
+    @abstractmethod
+    def delete(self, key: str, value: Optional[bytes] = None) -> bool:
+        """
+        Delete a key.
+
+        Args:
+            key: The key.
+            value: If given, the key is only deleted if it is set to this value.
+
+        Returns:
+            True if the key has been deleted.
+        """
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Increment an integer counter, creating it at zero if missing.
+
+        Args:
+            key: The key of the counter.
+            amount: The increment.
+            ttl: The seconds after which a newly created counter expires, defaults to never.
+
+        Returns:
+            The incremented value.
+        """
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> None:
+        """
+        Delete all the keys starting with a prefix.
+
+        Args:
+            prefix: The prefix, defaults to all the keys.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """
+        Release the resources held by the backend.
+        """
+
+    @asynccontextmanager
+    async def lock(self, name: str, ttl: float = 30.0, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold a lock shared by all the users of the backend.
+
+        The lock is a key expiring after `ttl` seconds, so that a lock held by a crashed process is eventually released.
+
+        Args:
+            name: The name of the lock.
+            ttl: The maximum number of seconds the lock is held.
+            timeout: The maximum number of seconds to wait for the lock, defaults to no limit.
+
+        Raises:
+            TimeoutError: The lock could not be acquired in time.
+        """
+        key = f"lock:{name}"
+        token = uuid.uuid4().bytes
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.001
+        while not self.add(key, token, ttl):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Lock '{name}' could not be acquired within {timeout} seconds")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        try:
+            yield
+        finally:
+            self.delete(key, token)
+
+
+class MemoryStateBackend(StateBackend):
+    """
+    A StateBackend keeping the state in the memory of the current process, bounded by an LRU entry limit.
+    """
+
+    def __init__(self, max_entries: int = 65536) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, value: bytes, expires: float) -> None:
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._get(key)
+            return None if entry is None else entry[0]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            self._set(key, value, _expires(ttl))
+            return True
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, value, _expires(ttl))
+            return True
+
+    def delete(self, key: str, value: Optional[bytes] = None) -> bool:
+        with self._lock:
+            entry = self._get(key)
+            if entry is None or (value is not None and entry[0] != value):
+                return False
+            del self._entries[key]
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        with self._lock:
+            entry = self._get(key)
+            count = amount if entry is None else int(entry[0]) + amount
+            self._set(key, str(count).encode(), _expires(ttl) if entry is None else entry[1])
+            return count
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+_SLOT_HEADER = struct.Struct("<QdII")
+_EMPTY = 0
+# the layout of a state file, checked by every process opening it; the slots follow the header
+_FILE_HEADER = struct.Struct("<8sQQ")
+_FILE_MAGIC = b"FCSTATE1"
+_TABLE_OFFSET = 64
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+def _wall_expires(ttl: Optional[float]) -> float:
+    return _NEVER if ttl is None else time.time() + ttl
+
+
+class MmapStateBackend(StateBackend):
+    """
+    A StateBackend keeping the state in a memory-mapped file shared by all the processes of a node.
+
+    The file is a hash table of fixed-size slots, every slot holding a single key and its value.
+    A key is stored in one of `probes` consecutive slots; when all of them are taken, the entry
+    expiring first is evicted. Values larger than the slots are not stored. Every worker opens the
+    same file, either `path` or a file called `name` in the temporary directory, and the operations
+    are serialized by a lock on the file.
+
+    The file starts with its layout, a file created with other `slots` or `slot_size` settings
+    is rejected rather than resized under the processes using it. Expiration times are stored
+    as wall-clock times, so that entries of a file outliving a reboot still expire in time. The
+    file is created with the permissions given by `mode`, readable and writable by its owner only
+    by default.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        path: Optional[str] = None,
+        slots: int = 4096,
+        slot_size: int = 4096,
+        probes: int = 8,
+        mode: int = 0o600,
+    ) -> None:
+        if slot_size <= _SLOT_HEADER.size:
+            raise ValueError(f"The slot size must be larger than {_SLOT_HEADER.size} bytes")
+        if name is None and path is None:
+            raise TypeError("The state file must be given by a name or a path, so that unrelated services do not share it")
+        self.path = path or os.path.join(tempfile.gettempdir(), f"{name}.state")
+        self.slots = slots
+        self.slot_size = slot_size
+        self.probes = min(probes, slots)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        size = _TABLE_OFFSET + self.slots * self.slot_size
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, self.mode)
+        except PermissionError as exc:
+            raise PermissionError(f"The state file {self.path} belongs to another user, pass a 'mode' sharing it or another name") from exc
+        try:
+            with self._file_lock(fd):
+                self._check_layout(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd, self._map, self._pid = fd, mmap.mmap(fd, size), os.getpid()
+        return self._map
+
+    def _check_layout(self, fd: int, size: int) -> None:
+        """
+        Initialize a new state file or check that an existing one has the layout of the backend.
+
+        Args:
+            fd: The descriptor of the locked file.
+            size: The size of the file.
+
+        Raises:
+            ValueError: The file has another layout.
+        """
+        header = _FILE_HEADER.pack(_FILE_MAGIC, self.slots, self.slot_size)
+        if os.fstat(fd).st_size == 0:
+            if hasattr(os, "fchmod"):
+                # the mode given to os.open is reduced by the umask
+                with suppress(PermissionError):
+                    os.fchmod(fd, self.mode)
+            os.ftruncate(fd, size)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, header)
+            return
+        os.lseek(fd, 0, os.SEEK_SET)
+        existing = os.read(fd, _FILE_HEADER.size)
+        if existing != header or os.fstat(fd).st_size != size:
+            layout = f"slots={self.slots} and slot_size={self.slot_size}"
+            raise ValueError(f"The state file {self.path} has another layout, it cannot be opened with {layout}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)  # type: ignore
+            self._fd = self._map = self._pid = None
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(fd: int) -> Iterator[None]:
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX, 1)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1)
+        else:  # pragma: no cover
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def _locked(self) -> Iterator[mmap.mmap]:
+        with self._lock:
+            table = self._open()
+            with self._file_lock(self._fd):  # type: ignore
+                yield table
+
+    def _read(self, table: mmap.mmap, offset: int) -> Tuple[int, float, bytes, bytes]:
+        key_hash, expires, key_size, value_size = _SLOT_HEADER.unpack_from(table, offset)
+        start = offset + _SLOT_HEADER.size
+        return key_hash, expires, table[start : start + key_size], table[start + key_size : start + key_size + value_size]
+
+    def _write(self, table: mmap.mmap, offset: int, key: bytes, value: bytes, expires: float) -> None:
+        _SLOT_HEADER.pack_into(table, offset, _hash(key), expires, len(key), len(value))
+        start = offset + _SLOT_HEADER.size
+        table[start : start + len(key) + len(value)] = key + value
+
+    def _erase(self, table: mmap.mmap, offset: int) -> None:
+        _SLOT_HEADER.pack_into(table, offset, _EMPTY, 0.0, 0, 0)
+
+    def _offsets(self, key_hash: int) -> List[int]:
+        return [_TABLE_OFFSET + (key_hash + probe) % self.slots * self.slot_size for probe in range(self.probes)]
+
+    def _find(self, table: mmap.mmap, key: bytes) -> Tuple[Optional[int], int]:
+        """
+        Find the slot of a key.
+
+        Args:
+            table: The mapped table.
+            key: The encoded key.
+
+        Returns:
+            The offset of the slot holding the key or None if it is missing, and the offset of
+            the slot a new entry for the key should be written to.
+        """
+        key_hash = _hash(key)
+        now = time.time()
+        free: Optional[int] = None
+        victim, victim_expires = 0, _NEVER
+        for offset in self._offsets(key_hash):
+            slot_hash, expires, slot_key, _ = self._read(table, offset)
+            if slot_hash != _EMPTY and expires <= now:
+                self._erase(table, offset)
+                slot_hash = _EMPTY
+            if slot_hash == _EMPTY:
+                free = offset if free is None else free
+            elif slot_hash == key_hash and slot_key == key:
+                return offset, offset
+            elif free is None and expires <= victim_expires:
+                victim, victim_expires = offset, expires
+        return None, victim if free is None else free
+
+    def _fits(self, key: bytes, value: bytes) -> bool:
+        return _SLOT_HEADER.size + len(key) + len(value) <= self.slot_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._locked() as table:
+            offset, _ = self._find(table, key.encode())
+            return None if offset is None else self._read(table, offset)[3]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        encoded = key.encode()
+        with self._locked() as table:
+            offset, target = self._find(table, encoded)
+            if not self._fits(encoded, value):
+                if offset is not None:
+                    self._erase(table, offset)
+                return False
+            self._write(table, target, encoded, value, _wall_expires(ttl))
+            return True
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        encoded = key.encode()
+        if not self._fits(encoded, value):
+            return False
+        with self._locked() as table:
+            offset, target = self._find(table, encoded)
+            if offset is not None:
+                return False
+            self._write(table, target, encoded, value, _wall_expires(ttl))
+            return True
+
+    def delete(self, key: str, value: Optional[bytes] = None) -> bool:
+        with self._locked() as table:
+            offset, _ = self._find(table, key.encode())
+            if offset is None or (value is not None and self._read(table, offset)[3] != value):
+                return False
+            self._erase(table, offset)
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        encoded = key.encode()
+        with self._locked() as table:
+            offset, target = self._find(table, encoded)
+            if offset is None:
+                count, expires = amount, _wall_expires(ttl)
+            else:
+                _, expires, _, value = self._read(table, offset)
+                count = int(value) + amount
+            self._write(table, target, encoded, str(count).encode(), expires)
+            return count
+
+    def clear(self, prefix: str = "") -> None:
+        encoded = prefix.encode()
+        with self._locked() as table:
+            for offset in range(_TABLE_OFFSET, _TABLE_OFFSET + self.slots * self.slot_size, self.slot_size):
+                key_hash, _, key, _ = self._read(table, offset)
+                if key_hash != _EMPTY and key.startswith(encoded):
+                    self._erase(table, offset)
@@ -0,0 +1,267 @@
+import collections.abc
+import csv
+import inspect
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+import anyio
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Send
+
+from fastapi_controllers.definitions import StreamConfig, StreamFormat
+from fastapi_controllers.helpers import _get_typed_signature, _wrap_endpoint
+
+try:
+    from pydantic import TypeAdapter
+except ImportError:  # pragma: no cover
+    TypeAdapter = None  # type: ignore
+    from pydantic import parse_obj_as
+
+_ITERATOR_TYPES = frozenset(
+    {
+        collections.abc.Iterator,
+        collections.abc.Iterable,
+        collections.abc.Generator,
+        collections.abc.AsyncIterator,
+        collections.abc.AsyncIterable,
+        collections.abc.AsyncGenerator,
+    }
+)
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    A StreamingResponse closing its body iterator as soon as the response ends, including client disconnects.
+    """
+
+    body_iterator: AsyncIterator[bytes]
+
+    async def stream_response(self, send: Send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()  # type: ignore
+
+
+class NDJSONStreamingResponse(_ClosingStreamingResponse):
+    media_type = "application/x-ndjson"
+
+
+class JSONStreamingResponse(_ClosingStreamingResponse):
+    media_type = "application/json"
+
+
+class CSVStreamingResponse(_ClosingStreamingResponse):
+    media_type = "text/csv"
+
+
+_RESPONSE_CLASSES: Dict[StreamFormat, Type[_ClosingStreamingResponse]] = {
+    StreamFormat.NDJSON: NDJSONStreamingResponse,
+    StreamFormat.JSON: JSONStreamingResponse,
+    StreamFormat.CSV: CSVStreamingResponse,
+}
+
+
+def _get_stream_item_type(annotation: Any) -> Any:
+    """
+    Get the item type of an iterator annotation, e.g. `Item` for `AsyncIterator[Item]`.
+
+    Args:
+        annotation: The return annotation of a generator function.
+
+    Returns:
+        The item type or None if the annotation does not specify it.
+    """
+    args = get_args(annotation)
+    if get_origin(annotation) in _ITERATOR_TYPES and args and args[0] is not Any:
+        return args[0]
+    return None
+
+
+def _get_validator(item_type: Any) -> Callable[[Any], Any]:
+    """
+    Get a function validating single items against a type.
+
+    Args:
+        item_type: The type of the items.
+
+    Returns:
+        A function returning the validated item.
+    """
+    if TypeAdapter is not None:
+        return TypeAdapter(item_type).validate_python
+    return lambda item: parse_obj_as(item_type, item)  # pragma: no cover
+
+
+class _Encoder:
+    """
+    Encodes the items of a single streamed response.
+    """
+
+    def __init__(self, config: StreamConfig, validate: Optional[Callable[[Any], Any]]) -> None:
+        self.format = StreamFormat(config.format)
+        self.fields = config.fields
+        self.validate = validate
+        self.count = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def start(self) -> bytes:
+        return b"[" if self.format is StreamFormat.JSON else b""
+
+    def end(self) -> bytes:
+        return b"]" if self.format is StreamFormat.JSON else b""
+
+    def encode(self, item: Any) -> bytes:
+        """
+        Encode a single item.
+
+        Args:
+            item: The item.
+
+        Returns:
+            The encoded item including the delimiters of the format.
+        """
+        if self.validate is not None:
+            item = self.validate(item)
+        value = jsonable_encoder(item)
+        self.count += 1
+        if self.format is StreamFormat.CSV:
+            return self._encode_row(value)
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+        if self.format is StreamFormat.NDJSON:
+            return data + b"\n"
+        return data if self.count == 1 else b"," + data
+
+    def _encode_row(self, value: Any) -> bytes:
+        row: Sequence[Any]
+        if isinstance(value, dict):
+            self.fields = self.fields or tuple(value)
+            row = [value.get(field) for field in self.fields]
+        else:
+            row = value if isinstance(value, (list, tuple)) else [value]
+        if self.count == 1 and self.fields:
+            self._writer.writerow(self.fields)
+        self._writer.writerow(row)
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+def _chunk(items: Iterator[Any], encoder: _Encoder, chunk_size: int) -> Iterator[bytes]:
+    """
+    Encode the items of a sync iterator into chunks of at least `chunk_size` bytes.
+
+    Args:
+        items: The items.
+        encoder: The encoder of the response.
+        chunk_size: The minimum size of the chunks but the last one.
+
+    Returns:
+        An iterator of chunks closing the items when closed.
+    """
+    try:
+        buffer = bytearray(encoder.start())
+        for item in items:
+            buffer += encoder.encode(item)
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += encoder.end()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        getattr(items, "close", lambda: None)()
+
+
+async def _achunk(items: AsyncIterator[Any], encoder: _Encoder, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Encode the items of an async iterator into chunks of at least `chunk_size` bytes.
+
+    Args:
+        items: The items.
+        encoder: The encoder of the response.
+        chunk_size: The minimum size of the chunks but the last one.
+
+    Returns:
+        An async iterator of chunks closing the items when closed.
+    """
+    try:
+        buffer = bytearray(encoder.start())
+        async for item in items:
+            buffer += encoder.encode(item)
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += encoder.end()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            with anyio.CancelScope(shield=True):
+                await aclose()
+
+
+async def _iterate_in_threadpool(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Iterate a sync iterator of chunks in the thread pool, closing it when closed.
+
+    Args:
+        chunks: The chunks.
+
+    Returns:
+        An async iterator of the chunks.
+    """
+    try:
+        while True:
+            chunk = await run_in_threadpool(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(chunks.close)  # type: ignore
+
+
+def _stream_endpoint(
+    func: Callable[..., Any],
+    config: Union[StreamConfig, StreamFormat, bool],
+) -> Tuple[Callable[..., Any], Type[StreamingResponse]]:
+    """
+    Create an endpoint streaming the items produced by a sync or async generator function.
+
+    Args:
+        func: The generator function.
+        config: The streaming settings or the format of the stream.
+
+    Returns:
+        The endpoint returning a streaming response and the class of the response.
+    """
+    if not isinstance(config, StreamConfig):
+        config = StreamConfig() if isinstance(config, bool) else StreamConfig(format=StreamFormat(config))
+    if not inspect.isgeneratorfunction(func) and not inspect.isasyncgenfunction(func):
+        raise TypeError(f"The streamed endpoint {func.__qualname__} must be a generator function")
+    sig = _get_typed_signature(func)
+    item_type = _get_stream_item_type(sig.return_annotation)
+    validate = _get_validator(item_type) if config.validate and item_type is not None else None
+    response_class = _RESPONSE_CLASSES[StreamFormat(config.format)]
+    chunk_size = config.chunk_size
+
+    async def endpoint(**kwargs: Any) -> Any:
+        items = func(**kwargs)
+        encoder = _Encoder(config, validate)
+        if inspect.isasyncgen(items):
+            return response_class(_achunk(items, encoder, chunk_size))
+        return response_class(_iterate_in_threadpool(_chunk(items, encoder, chunk_size)))
+
+    endpoint = _wrap_endpoint(func, endpoint)
+    # FastAPI follows __wrapped__ and would treat the endpoint as a generator function itself
+    del endpoint.__wrapped__  # type: ignore
+    endpoint.__signature__ = sig.replace(return_annotation=response_class)  # type: ignore
+    return endpoint, response_class
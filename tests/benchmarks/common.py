@@ -0,0 +1,220 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import fastapi
+from starlette.types import ASGIApp, Message
+
+RESULTS_DIR = Path(".benchmarks")
+
+
+def _git_revision() -> str:
+    """
+    Get the revision of the working tree the benchmark is run against.
+
+    Returns:
+        The abbreviated commit hash or 'unknown' outside of a git repository.
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def metadata() -> Dict[str, Any]:
+    """
+    Describe the environment the benchmark is run in.
+
+    Returns:
+        A mapping of environment details stored alongside the results.
+    """
+    return {
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "fastapi": fastapi.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def save_results(name: str, results: List[Dict[str, Any]], output: Optional[Path] = None) -> Path:
+    """
+    Store benchmark results as JSON.
+
+    Args:
+        name: The name of the benchmark.
+        results: The measurements.
+        output: The path of the output file, defaults to .benchmarks/<name>-<revision>.json.
+
+    Returns:
+        The path of the written file.
+    """
+    meta = metadata()
+    output = output or RESULTS_DIR / f"{name}-{meta['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"benchmark": name, "metadata": meta, "results": results}, indent=2))
+    return output
+
+
+def compare_results(
+    results: List[Dict[str, Any]],
+    baseline_path: Path,
+    key: str,
+    metrics: List[str],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare measurements against a previously stored baseline.
+
+    Args:
+        results: The current measurements.
+        baseline_path: The path of the baseline results file.
+        key: The field identifying matching measurements.
+        metrics: The fields to compare, lower values are considered better.
+        threshold: The maximum allowed ratio between the current and the baseline value.
+
+    Returns:
+        A list of regressions exceeding the threshold.
+    """
+    baseline = {str(entry[key]): entry for entry in json.loads(baseline_path.read_text())["results"]}
+    regressions = []
+    for entry in results:
+        previous = baseline.get(str(entry[key]))
+        if previous is None:
+            continue
+        for metric in metrics:
+            if not previous.get(metric) or metric not in entry:
+                continue
+            ratio = entry[metric] / previous[metric]
+            print(f"{entry[key]:>24} {metric:<24} {previous[metric]:>12.6f} -> {entry[metric]:>12.6f} ({ratio:.2f}x)")
+            if ratio > threshold:
+                regressions.append(f"{entry[key]} {metric}: {ratio:.2f}x")
+    return regressions
+
+
+def report(regressions: List[str]) -> None:
+    """
+    Print the regressions and exit with a non-zero code if there are any.
+
+    Args:
+        regressions: The regressions found by compare_results.
+    """
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.elapsed = time.perf_counter() - self._start
+
+
+async def asgi_request(
+    app: ASGIApp,
+    method: str,
+    path: str,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+    body: bytes = b"",
+) -> Tuple[int, bytes]:
+    """
+    Send a single HTTP request directly through the ASGI interface.
+
+    Args:
+        app: The ASGI application.
+        method: The HTTP request method.
+        path: The request path.
+        headers: The raw request headers.
+        body: The request body.
+
+    Returns:
+        The response status code and body.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), *(headers or [])],
+        "client": ("127.0.0.1", 12345),
+        "server": ("benchmark", 80),
+    }
+    status = 0
+    chunks: List[bytes] = []
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def asgi_websocket(app: ASGIApp, path: str) -> List[Message]:
+    """
+    Open a websocket connection directly through the ASGI interface and run it until the server closes it.
+
+    Args:
+        app: The ASGI application.
+        path: The websocket path.
+
+    Returns:
+        The messages sent by the application.
+    """
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("benchmark", 80),
+        "subprotocols": [],
+    }
+    messages: List[Message] = []
+    connected = False
+
+    async def receive() -> Message:
+        nonlocal connected
+        if connected:
+            return {"type": "websocket.disconnect", "code": 1000}
+        connected = True
+        return {"type": "websocket.connect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
@@ -0,0 +1,119 @@
+"""
+Memory benchmark for the per-route footprint of controllers.
+
+Measures the memory retained per route by the route specs created by the decorators alone,
+by importing a module of synthetic controllers (decorators and __init_subclass__) and by
+the routers created with Controller.create_router. The measurements are taken with
+tracemalloc and only count the memory still allocated once the stage is over.
+
+Usage:
+    python -m tests.benchmarks.memory [--sizes 1000 10000] [--output PATH] [--compare PATH]
+"""
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Response
+
+from fastapi_controllers import get, post
+from tests.benchmarks.common import compare_results, report, save_results
+from tests.benchmarks.startup import _import, generate_source
+
+METRICS = ["spec_bytes_per_route", "import_bytes_per_route", "router_bytes_per_route"]
+
+
+def _measure(stage: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Measure the memory retained by a stage.
+
+    Args:
+        stage: A callable running the stage, the returned value is kept alive during the measurement.
+
+    Returns:
+        The value returned by the stage and the retained memory in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = stage()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def _endpoint(self: Any, item: int = 0) -> Response:
+    return Response(status_code=200)
+
+
+def _create_specs(routes: int) -> List[Any]:
+    """
+    Create route specs the way a large application typically does, with a handful of distinct parameter sets.
+
+    Args:
+        routes: The number of route specs.
+
+    Returns:
+        The route specs.
+    """
+    specs = []
+    for index in range(routes):
+        decorator = get if index % 2 else post
+        specs.append(decorator(f"/r{index}", response_class=Response, status_code=200, tags=["benchmark"])(_endpoint))
+    return specs
+
+
+def run(routes: int, depth: int = 5, dependencies: int = 5) -> Dict[str, Any]:
+    """
+    Measure the per-route memory footprint of the given number of controller routes.
+
+    Args:
+        routes: The total number of routes.
+        depth: The length of each inheritance chain.
+        dependencies: The number of __init__ dependencies of each leaf controller.
+
+    Returns:
+        The measurements in bytes per route.
+    """
+    _, spec_bytes = _measure(lambda: _create_specs(routes))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"benchmark_memory_{routes}.py"
+        path.write_text(generate_source(routes, depth, dependencies))
+        module, import_bytes = _measure(lambda: _import(path))
+        sys.modules.pop(path.stem)
+    _, router_bytes = _measure(lambda: [controller.create_router() for controller in module.CONTROLLERS])
+    return {
+        "name": f"{routes} routes",
+        "routes": routes,
+        "spec_bytes_per_route": spec_bytes / routes,
+        "import_bytes_per_route": import_bytes / routes,
+        "router_bytes_per_route": router_bytes / routes,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--dependencies", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.1)
+    args = parser.parse_args(argv)
+    results = []
+    for size in args.sizes:
+        result = run(size, depth=args.depth, dependencies=args.dependencies)
+        print(" ".join(f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}" for key, value in result.items()))
+        results.append(result)
+    print(f"Results saved to {save_results('memory', results, args.output)}")
+    if args.compare:
+        report(compare_results(results, args.compare, "name", METRICS, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Startup benchmark for controller registration at scale.
+
+Generates synthetic Controller subclasses and measures the time spent on importing
+the controller module (decorators and __init_subclass__), Controller.create_router,
+app.include_router and the first request served by the application, as well as
+the bulk registration via Controller.include_all. The latency of requests to the last
+registered route measures the routing cost, with and without a RouteDispatcher.
+
+Usage:
+    python -m tests.benchmarks.startup [--sizes 10 100 1000 10000] [--repeat 3] [--output PATH] [--compare PATH]
+"""
+import argparse
+import asyncio
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from fastapi_controllers import Controller
+from tests.benchmarks.common import Timer, asgi_request, compare_results, report, save_results
+
+DECORATORS = ["delete", "get", "head", "options", "patch", "post", "put", "trace", "websocket"]
+METRICS = [
+    "import_s",
+    "create_router_s",
+    "create_router_cached_s",
+    "include_router_s",
+    "first_request_s",
+    "include_all_s",
+    "include_all_first_request_s",
+    "last_route_request_us",
+    "dispatched_last_route_request_us",
+]
+ROUTES_PER_CONTROLLER = 10
+
+HEADER = """\
+from fastapi import Depends, Response
+from fastapi.websockets import WebSocket
+
+from fastapi_controllers import Controller, delete, get, head, options, patch, post, put, trace, websocket
+
+"""
+
+
+def _generate_dependencies(dependencies: int) -> List[str]:
+    """
+    Generate a chain of dependencies where each one depends on the previous one.
+
+    Args:
+        dependencies: The number of dependencies in the chain.
+
+    Returns:
+        The source lines defining the dependencies.
+    """
+    lines = ["async def dependency_0() -> int:", "    return 0", ""]
+    for index in range(1, dependencies):
+        lines += [
+            f"def dependency_{index}(value: int = Depends(dependency_{index - 1})) -> int:",
+            "    return value + 1",
+            "",
+        ]
+    return lines
+
+
+def _generate_route(index: int) -> List[str]:
+    """
+    Generate a single controller route cycling through all the available decorators.
+
+    Args:
+        index: The index of the route.
+
+    Returns:
+        The source lines defining the route.
+    """
+    decorator = DECORATORS[index % len(DECORATORS)]
+    if decorator == "websocket":
+        return [
+            f'    @websocket("/r{index}")',
+            f"    async def route_{index}(self, websocket: WebSocket) -> None:",
+            "        await websocket.accept()",
+            "        await websocket.close()",
+            "",
+        ]
+    prefix = "async " if index % 2 else ""
+    return [
+        f'    @{decorator}("/r{index}", response_class=Response)',
+        f"    {prefix}def route_{index}(self, item: int = 0) -> Response:",
+        "        return Response(status_code=200)",
+        "",
+    ]
+
+
+def generate_source(routes: int, depth: int, dependencies: int) -> str:
+    """
+    Generate the source of a module defining controllers with the given number of routes.
+
+    The routes are split between chains of controllers inheriting from one another,
+    the last controller of every chain has an __init__ method with a chain of dependencies.
+
+    Args:
+        routes: The total number of routes.
+        depth: The length of each inheritance chain.
+        dependencies: The number of __init__ dependencies of each leaf controller.
+
+    Returns:
+        The module source.
+    """
+    lines = HEADER.splitlines() + _generate_dependencies(dependencies)
+    leaves = []
+    for chain in range(max(routes // ROUTES_PER_CONTROLLER, 1)):
+        chain_routes = list(range(chain * ROUTES_PER_CONTROLLER, min((chain + 1) * ROUTES_PER_CONTROLLER, routes)))
+        base = "Controller"
+        for level in range(depth):
+            name = f"Controller_{chain}_{level}"
+            lines += ["", f"class {name}({base}):", f'    prefix = "/c{chain}"', ""]
+            if level == depth - 1:
+                params = ", ".join(f"d{index}: int = Depends(dependency_{index})" for index in range(dependencies))
+                lines += [f"    def __init__(self, {params}) -> None:", "        self.total = 0", ""]
+            for index in chain_routes[level::depth]:
+                lines += _generate_route(index)
+            base = name
+        leaves.append(base)
+    lines += ["", f"CONTROLLERS = [{', '.join(leaves)}]", ""]
+    return "\n".join(lines)
+
+
+def _import(path: Path) -> Any:
+    """
+    Import a generated module.
+
+    Args:
+        path: The path of the module.
+
+    Returns:
+        The imported module.
+    """
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _time_requests(app: Any, url: str, requests: int = 100) -> float:
+    """
+    Measure the mean latency of requests to a warmed up application.
+
+    Args:
+        app: The application.
+        url: The path of the requests.
+        requests: The number of requests.
+
+    Returns:
+        The mean latency in microseconds.
+    """
+
+    async def send() -> None:
+        for _ in range(requests):
+            status, _ = await asgi_request(app, "GET", url)
+            assert status == 200, status
+
+    with Timer() as timer:
+        asyncio.run(send())
+    return timer.elapsed / requests * 1e6
+
+
+def _run_once(routes: int, depth: int, dependencies: int) -> Dict[str, Any]:
+    """
+    Measure the registration of the given number of controller routes once.
+
+    Args:
+        routes: The total number of routes.
+        depth: The length of each inheritance chain.
+        dependencies: The number of __init__ dependencies of each leaf controller.
+
+    Returns:
+        The measurements in seconds.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"benchmark_controllers_{routes}.py"
+        path.write_text(generate_source(routes, depth, dependencies))
+        with Timer() as import_timer:
+            module = _import(path)
+        sys.modules.pop(path.stem)
+    with Timer() as create_timer:
+        routers = [controller.create_router() for controller in module.CONTROLLERS]
+    with Timer() as cached_timer:
+        for controller in module.CONTROLLERS:
+            controller.create_router()
+    app = FastAPI()
+    with Timer() as include_timer:
+        for router in routers:
+            app.include_router(router)
+    last_get = max(index for index in range(routes) if DECORATORS[index % len(DECORATORS)] == "get")
+    url = f"/c{last_get // ROUTES_PER_CONTROLLER}/r{last_get}"
+    with Timer() as request_timer:
+        status, _ = asyncio.run(asgi_request(app, "GET", url))
+    assert status == 200, status
+    bulk_app = FastAPI()
+    with Timer() as include_all_timer:
+        Controller.include_all(bulk_app, module.CONTROLLERS)
+    with Timer() as include_all_request_timer:
+        status, _ = asyncio.run(asgi_request(bulk_app, "GET", url))
+    assert status == 200, status
+    dispatched_app = FastAPI()
+    Controller.include_all(dispatched_app, module.CONTROLLERS, dispatch=True)
+    return {
+        "name": f"{routes} routes",
+        "routes": routes,
+        "controllers": len(module.CONTROLLERS),
+        "import_s": import_timer.elapsed,
+        "create_router_s": create_timer.elapsed,
+        "create_router_cached_s": cached_timer.elapsed,
+        "include_router_s": include_timer.elapsed,
+        "first_request_s": request_timer.elapsed,
+        "include_all_s": include_all_timer.elapsed,
+        "include_all_first_request_s": include_all_request_timer.elapsed,
+        "last_route_request_us": _time_requests(bulk_app, url),
+        "dispatched_last_route_request_us": _time_requests(dispatched_app, url),
+    }
+
+
+def run(routes: int, depth: int = 5, dependencies: int = 5, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Measure the registration of the given number of controller routes.
+
+    Args:
+        routes: The total number of routes.
+        depth: The length of each inheritance chain.
+        dependencies: The number of __init__ dependencies of each leaf controller.
+        repeat: The number of repetitions, the fastest one is reported for every metric.
+
+    Returns:
+        The measurements in seconds.
+    """
+    runs = [_run_once(routes, depth, dependencies) for _ in range(repeat)]
+    return {**runs[0], **{metric: min(run[metric] for run in runs) for metric in METRICS}}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--dependencies", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+    results = []
+    for size in args.sizes:
+        result = run(size, depth=args.depth, dependencies=args.dependencies, repeat=args.repeat)
+        print(" ".join(f"{key}={value:.6f}" if isinstance(value, float) else f"{key}={value}" for key, value in result.items()))
+        results.append(result)
+    print(f"Results saved to {save_results('startup', results, args.output)}")
+    if args.compare:
+        report(compare_results(results, args.compare, "name", METRICS, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from tests.benchmarks.memory import run
+
+
+def describe_memory_benchmark() -> None:
+    def it_measures_the_per_route_footprint() -> None:
+        result = run(routes=10, depth=2, dependencies=2)
+        assert result["routes"] == 10
+        assert all(result[metric] > 0 for metric in ["spec_bytes_per_route", "import_bytes_per_route", "router_bytes_per_route"])
@@ -0,0 +1,23 @@
+import json
+from pathlib import Path
+
+from tests.benchmarks.common import compare_results, save_results
+from tests.benchmarks.startup import DECORATORS, generate_source, run
+
+
+def describe_startup_benchmark() -> None:
+    def it_generates_routes_for_all_decorators() -> None:
+        source = generate_source(routes=len(DECORATORS), depth=3, dependencies=2)
+        compile(source, "benchmark", "exec")
+        assert all(f"@{decorator}(" in source for decorator in DECORATORS)
+
+    def it_measures_the_registration_stages() -> None:
+        result = run(routes=10, depth=2, dependencies=2)
+        assert result["routes"] == 10
+        assert all(result[metric] >= 0 for metric in ["import_s", "create_router_s", "include_router_s", "first_request_s"])
+
+    def it_saves_and_compares_results(tmp_path: Path) -> None:
+        baseline = save_results("startup", [{"name": "10 routes", "import_s": 1.0}], tmp_path / "baseline.json")
+        assert json.loads(baseline.read_text())["benchmark"] == "startup"
+        regressions = compare_results([{"name": "10 routes", "import_s": 2.0}], baseline, "name", ["import_s"], 1.2)
+        assert regressions == ["10 routes import_s: 2.00x"]
@@ -0,0 +1,11 @@
+import asyncio
+
+from tests.benchmarks.throughput import DEPENDENCY_COUNTS, run
+
+
+def describe_throughput_benchmark() -> None:
+    def it_measures_all_scenarios() -> None:
+        results = asyncio.run(run(requests=20, concurrency=2))
+        assert len(results) == len(DEPENDENCY_COUNTS) * 3 * 3
+        assert all(result["rps"] > 0 and result["p99_ms"] >= result["p50_ms"] > 0 for result in results)
+        assert all(result["overhead"] == 1 for result in results if result["name"].startswith("plain"))
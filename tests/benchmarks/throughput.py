@@ -0,0 +1,217 @@
+"""
+Per-request throughput benchmark comparing Controller endpoints to plain FastAPI routes.
+
+The same endpoints are defined as plain APIRouter functions and as Controller methods
+(with 0, 1 and 5 constructor dependencies) and driven directly through the ASGI interface,
+without any network involved. The reported overhead is the ratio between the median latency
+of a Controller endpoint and its plain counterpart, which is largely machine independent
+and therefore suitable as a regression gate.
+
+Usage:
+    python -m tests.benchmarks.throughput [--requests 2000] [--concurrency 16] [--output PATH] [--compare PATH]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.websockets import WebSocket
+
+from fastapi_controllers import Controller, ControllerLifetime, get, websocket
+from tests.benchmarks.common import asgi_request, asgi_websocket, compare_results, report, save_results
+
+DEPENDENCY_COUNTS = [0, 1, 5]
+METRICS = ["p50_ms", "p99_ms", "us_per_request", "overhead"]
+
+
+async def dependency() -> int:
+    return 1
+
+
+def _dependency_params(count: int) -> List[str]:
+    return [f"d{index}: int = Depends(dependency)" for index in range(count)]
+
+
+def _define(source: str, name: str) -> Any:
+    """
+    Define an object from source, which allows generating signatures with a variable number of dependencies.
+
+    Args:
+        source: The source defining the object.
+        name: The name of the object.
+
+    Returns:
+        The defined object.
+    """
+    namespace: Dict[str, Any] = {
+        "APIRouter": APIRouter,
+        "Controller": Controller,
+        "ControllerLifetime": ControllerLifetime,
+        "Depends": Depends,
+        "WebSocket": WebSocket,
+        "dependency": dependency,
+        "get": get,
+        "websocket": websocket,
+    }
+    exec(source, namespace)
+    return namespace[name]
+
+
+def plain_router(count: int) -> APIRouter:
+    """
+    Create plain APIRouter endpoints resolving the given number of dependencies.
+
+    Args:
+        count: The number of dependencies.
+
+    Returns:
+        The router.
+    """
+    params = ", ".join(_dependency_params(count))
+    router = APIRouter(prefix=f"/plain-{count}")
+    router.get("/sync")(_define(f"def sync_endpoint({params}) -> dict:\n    return {{'ok': True}}", "sync_endpoint"))
+    router.get("/async")(_define(f"async def async_endpoint({params}) -> dict:\n    return {{'ok': True}}", "async_endpoint"))
+    router.websocket("/ws")(
+        _define(
+            f"async def ws_endpoint({', '.join(['websocket: WebSocket', *_dependency_params(count)])}) -> None:\n"
+            "    await websocket.accept()\n"
+            "    await websocket.send_text('ok')\n"
+            "    await websocket.close()",
+            "ws_endpoint",
+        )
+    )
+    return router
+
+
+def controller_router(count: int, lifetime: ControllerLifetime = ControllerLifetime.REQUEST) -> APIRouter:
+    """
+    Create Controller endpoints whose constructor resolves the given number of dependencies.
+
+    Args:
+        count: The number of dependencies.
+        lifetime: The lifetime of the controller.
+
+    Returns:
+        The router created by the controller.
+    """
+    source = "\n".join(
+        [
+            "class BenchmarkController(Controller):",
+            f"    prefix = '/controller-{lifetime.value}-{count}'",
+            f"    lifetime = ControllerLifetime.{lifetime.name}",
+            f"    def __init__({', '.join(['self', *_dependency_params(count)])}) -> None:",
+            "        self.ok = True",
+            "    @get('/sync')",
+            "    def sync_endpoint(self) -> dict:",
+            "        return {'ok': self.ok}",
+            "    @get('/async')",
+            "    async def async_endpoint(self) -> dict:",
+            "        return {'ok': self.ok}",
+            "    @websocket('/ws')",
+            "    async def ws_endpoint(self, websocket: WebSocket) -> None:",
+            "        await websocket.accept()",
+            "        await websocket.send_text('ok')",
+            "        await websocket.close()",
+        ]
+    )
+    return _define(source, "BenchmarkController").create_router()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    for count in DEPENDENCY_COUNTS:
+        app.include_router(plain_router(count))
+        app.include_router(controller_router(count))
+        app.include_router(controller_router(count, ControllerLifetime.APP))
+    return app
+
+
+async def measure(call: Callable[[], Awaitable[Any]], requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Run the call the given number of times with limited concurrency.
+
+    Args:
+        call: The request to be measured.
+        requests: The total number of requests.
+        concurrency: The number of requests in flight.
+
+    Returns:
+        The throughput and latency percentiles.
+    """
+    latencies: List[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    for _ in range(min(requests, 50)):
+        await call()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "us_per_request": elapsed / len(latencies) * 1e6,
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p99_ms": quantiles[98] * 1e3,
+    }
+
+
+def _scenarios(app: FastAPI) -> List[Tuple[str, str, Callable[[], Awaitable[Any]]]]:
+    scenarios: List[Tuple[str, str, Callable[[], Awaitable[Any]]]] = []
+    for count in DEPENDENCY_COUNTS:
+        for variant in ["plain", "controller-request", "controller-app"]:
+            prefix = f"/{variant}-{count}"
+            for kind in ["sync", "async"]:
+                path = f"{prefix}/{kind}"
+                scenarios.append((f"{variant} {kind} deps={count}", f"plain {kind} deps={count}", partial(asgi_request, app, "GET", path)))
+            path = f"{prefix}/ws"
+            scenarios.append((f"{variant} websocket deps={count}", f"plain websocket deps={count}", partial(asgi_websocket, app, path)))
+    return scenarios
+
+
+async def run(requests: int = 2000, concurrency: int = 16) -> List[Dict[str, Any]]:
+    """
+    Measure all the scenarios.
+
+    Args:
+        requests: The number of requests per scenario.
+        concurrency: The number of requests in flight.
+
+    Returns:
+        The measurements.
+    """
+    app = create_app()
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, baseline, call in _scenarios(app):
+        results[name] = {"name": name, **(await measure(call, requests, concurrency))}
+        results[name]["overhead"] = results[name]["p50_ms"] / results[baseline]["p50_ms"]
+    return list(results.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+    results = asyncio.run(run(args.requests, args.concurrency))
+    print(f"{'scenario':<36} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'overhead':>8}")
+    for result in results:
+        print(f"{result['name']:<36} {result['rps']:>10.0f} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f} {result['overhead']:>8.2f}")
+    print(f"Results saved to {save_results('throughput', results, args.output)}")
+    if args.compare:
+        report(compare_results(results, args.compare, "name", METRICS, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,52 @@
 import asyncio
+import datetime
+import os
+import threading
 import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 
 import pytest
-from fastapi import Depends, FastAPI, Response, status
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 from fastapi.websockets import WebSocket
-
-from fastapi_controllers import Controller, delete, get, head, options, patch, post, put, trace, websocket
+from pydantic import BaseModel, Field
+
+from fastapi_controllers import (
+    BackgroundQueue,
+    BackgroundWorkers,
+    BroadcastHub,
+    Connection,
+    Controller,
+    MemoryRateLimitBackend,
+    MetricsRegistry,
+    MmapStateBackend,
+    Resource,
+    delete,
+    get,
+    head,
+    options,
+    patch,
+    post,
+    put,
+    trace,
+    websocket,
+)
+from fastapi_controllers.definitions import (
+    BatchConfig,
+    BroadcastConfig,
+    CacheConfig,
+    ConcurrencyLimit,
+    ControllerLifetime,
+    IdempotencyConfig,
+    OffloadMode,
+    QueueConfig,
+    RateLimit,
+    SingleFlightConfig,
+    StreamConfig,
+    StreamFormat,
+)
 
 
 def sync_dependency() -> str:
@@ -117,3 +157,654 @@ def async_test_client() -> TestClient:
     app = FastAPI()
     app.include_router(AsyncTestController.create_router())
     return TestClient(app)
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.created = 0
+        self.closed = 0
+
+
+counter = Counter()
+
+
+async def counted_dependency() -> AsyncIterator[Counter]:
+    counter.created += 1
+    yield counter
+    counter.closed += 1
+
+
+class AppScopedTestController(Controller):
+    prefix = "/test-app-scoped"
+    lifetime = ControllerLifetime.APP
+
+    def __init__(self, counter: Counter = Depends(counted_dependency)) -> None:  # noqa: B008
+        self.counter = counter
+
+    @get("", response_class=Response)
+    def test_get(self) -> Response:
+        return Response(content=str(id(self)), status_code=status.HTTP_200_OK)
+
+
+class WorkerScopedTestController(Controller):
+    prefix = "/test-worker-scoped"
+    lifetime = ControllerLifetime.WORKER
+
+    @get("", response_class=Response)
+    async def test_get(self) -> Response:
+        return Response(content=str(id(self)), status_code=status.HTTP_200_OK)
+
+
+@pytest.fixture
+def scoped_counter() -> Iterator[Counter]:
+    counter.created = counter.closed = 0
+    yield counter
+
+
+@pytest.fixture
+def scoped_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(AppScopedTestController.create_router())
+    app.include_router(WorkerScopedTestController.create_router())
+    return app
+
+
+def describe_thread() -> Dict[str, Union[str, bool]]:
+    try:
+        asyncio.get_running_loop()
+        on_loop = True
+    except RuntimeError:
+        on_loop = False
+    return {"thread": threading.current_thread().name, "on_loop": on_loop}
+
+
+class OffloadTestController(Controller):
+    prefix = "/test-offload"
+    offload = OffloadMode.EXECUTOR
+    max_workers = 2
+
+    def __init__(self, message: str = Depends(sync_dependency)) -> None:  # noqa: B008
+        self.constructed = describe_thread()
+
+    @get("/executor")
+    def test_executor(self) -> Dict[str, Dict[str, Union[str, bool]]]:
+        return {"constructor": self.constructed, "handler": describe_thread()}
+
+    @get("/inline", offload=OffloadMode.INLINE)
+    def test_inline(self) -> Dict[str, Dict[str, Union[str, bool]]]:
+        return {"constructor": self.constructed, "handler": describe_thread()}
+
+    @get("/default", offload=OffloadMode.DEFAULT)
+    def test_default(self) -> Dict[str, Dict[str, Union[str, bool]]]:
+        return {"constructor": self.constructed, "handler": describe_thread()}
+
+
+@pytest.fixture
+def offload_test_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(OffloadTestController.create_router())
+    return TestClient(app)
+
+
+class CachedTestController(Controller):
+    prefix = "/test-cached"
+    response_cache = CacheConfig(ttl=60, vary=("accept-language",))
+    calls = 0
+
+    @get("")
+    async def test_get(self) -> Dict[str, int]:
+        CachedTestController.calls += 1
+        return {"calls": CachedTestController.calls}
+
+    @get("/uncached", response_cache=False)
+    async def test_uncached(self) -> Dict[str, int]:
+        CachedTestController.calls += 1
+        return {"calls": CachedTestController.calls}
+
+    @post("", invalidate_cache=True)
+    async def test_post(self) -> None:
+        ...
+
+    @put("", invalidate_cache=["test_uncached"])
+    async def test_put(self) -> None:
+        ...
+
+
+@pytest.fixture
+def cached_test_client() -> TestClient:
+    CachedTestController.calls = 0
+    CachedTestController.invalidate_cache()
+    app = FastAPI()
+    app.include_router(CachedTestController.create_router())
+    return TestClient(app)
+
+
+def require_credentials(request: Request) -> None:
+    if "authorization" not in request.headers:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthCachedTestController(Controller):
+    prefix = "/test-auth-cached"
+    dependencies = [Depends(require_credentials)]
+    response_cache = CacheConfig(ttl=60, vary=("authorization",))
+
+    @get("")
+    async def test_get(self) -> Dict[str, int]:
+        return {"secret": 42}
+
+
+class CredentialCachedTestController(Controller):
+    prefix = "/test-credential-cached"
+    response_cache = CacheConfig(ttl=60)
+
+    @get("")
+    async def test_get(self, request: Request) -> Dict[str, Optional[str]]:
+        return {"user": request.headers.get("authorization")}
+
+
+@pytest.fixture
+def auth_cached_test_client() -> TestClient:
+    AuthCachedTestController.invalidate_cache()
+    CredentialCachedTestController.invalidate_cache()
+    app = FastAPI()
+    app.include_router(AuthCachedTestController.create_router())
+    app.include_router(CredentialCachedTestController.create_router())
+    return TestClient(app)
+
+
+class SharedStateTestController(Controller):
+    prefix = "/test-shared-state"
+    response_cache = CacheConfig(ttl=60)
+    calls = 0
+
+    @get("")
+    async def test_get(self) -> Dict[str, int]:
+        SharedStateTestController.calls += 1
+        return {"calls": SharedStateTestController.calls}
+
+    @post("/visits")
+    async def test_visit(self) -> Dict[str, int]:
+        return {"visits": self.shared_state.incr("visits")}  # type: ignore
+
+    @post("", invalidate_cache=True)
+    async def test_post(self) -> None:
+        ...
+
+
+@pytest.fixture
+def shared_state_test_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    SharedStateTestController.calls = 0
+    state = MmapStateBackend(path=str(tmp_path / "shared.state"), slots=64)
+    monkeypatch.setattr(SharedStateTestController, "shared_state", state)
+    app = FastAPI()
+    app.include_router(SharedStateTestController.create_router())
+    yield TestClient(app)
+    state.close()
+    os.unlink(state.path)
+
+
+class LimitedTestController(Controller):
+    prefix = "/test-limited"
+    concurrency_limit = ConcurrencyLimit(max_concurrency=4, max_queue=4)
+    constructed = 0
+
+    def __init__(self) -> None:
+        LimitedTestController.constructed += 1
+
+    @get("", concurrency_limit=ConcurrencyLimit(max_concurrency=1, max_queue=1, retry_after=1))
+    async def test_get(self) -> None:
+        await asyncio.sleep(0.05)
+
+    @get("/shared")
+    async def test_shared(self) -> None:
+        await asyncio.sleep(0.05)
+
+    @get("/rejected", concurrency_limit=ConcurrencyLimit(max_concurrency=1, status_code=status.HTTP_429_TOO_MANY_REQUESTS))
+    async def test_rejected(self) -> None:
+        await asyncio.sleep(0.05)
+
+    @get("/timeout", concurrency_limit=ConcurrencyLimit(max_concurrency=1, max_queue=5, queue_timeout=0.01))
+    async def test_timeout(self) -> None:
+        await asyncio.sleep(0.05)
+
+    @websocket("/ws", concurrency_limit=1)
+    async def test_websocket(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+        await websocket.close()
+
+
+@pytest.fixture
+def limited_test_app() -> FastAPI:
+    LimitedTestController.constructed = 0
+    app = FastAPI()
+    app.include_router(LimitedTestController.create_router())
+    return app
+
+
+class RateLimitedTestController(Controller):
+    prefix = "/test-rate-limited"
+    rate_limit = RateLimit(requests=2, period=60)
+    constructed = 0
+
+    def __init__(self) -> None:
+        RateLimitedTestController.constructed += 1
+
+    @get("")
+    async def test_get(self) -> None:
+        ...
+
+    @post("/body")
+    async def test_body(self, item: Dict[str, int]) -> None:
+        ...
+
+    @get("/header", rate_limit=RateLimit(requests=1, period=60, header="x-api-key"))
+    async def test_header(self) -> None:
+        ...
+
+    @get("/custom", rate_limit=RateLimit(requests=1, period=60, key=lambda request: request.query_params.get("user")))
+    async def test_custom(self) -> None:
+        ...
+
+    @get("/unlimited", rate_limit=False)
+    async def test_unlimited(self) -> None:
+        ...
+
+    @websocket("/ws", rate_limit=RateLimit(requests=1, period=60))
+    async def test_websocket(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.close()
+
+
+@pytest.fixture
+def rate_limited_test_app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    RateLimitedTestController.constructed = 0
+    monkeypatch.setattr(RateLimitedTestController, "rate_limit_backend", MemoryRateLimitBackend())
+    app = FastAPI()
+    app.include_router(RateLimitedTestController.create_router())
+    return app
+
+
+class SerializedItem(BaseModel):
+    id: int
+    name: str = Field(alias="title")
+    note: Optional[str] = None
+
+
+class SerializedSecretItem(SerializedItem):
+    secret: str
+
+
+class SerializedTestController(Controller):
+    prefix = "/test-serialized"
+
+    @get("/models", fast_serialization=True, response_model_exclude_none=True)
+    async def test_models(self) -> List[SerializedItem]:
+        return [SerializedItem(id=index, title=f"item {index}") for index in range(3)]
+
+    @get("/dicts", fast_serialization=True)
+    def test_dicts(self) -> List[SerializedItem]:
+        return [{"id": 1, "title": "item 1", "created": datetime.date(2020, 1, 1), "secret": "TEST"}]  # type: ignore
+
+    @get("/other-models", fast_serialization=True, response_model=SerializedItem, response_model_exclude_none=True)
+    async def test_other_models(self) -> SerializedSecretItem:
+        return SerializedSecretItem(id=1, title="item 1", secret="TEST")
+
+    @post("/status", fast_serialization=True, status_code=status.HTTP_201_CREATED)
+    async def test_status(self, response: Response) -> Dict[str, int]:
+        response.headers["x-test"] = "TEST"
+        return {"value": 1}
+
+    @get("/response", fast_serialization=True)
+    async def test_response(self) -> Response:
+        return Response(b"TEST")
+
+
+@pytest.fixture
+def serialized_test_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(SerializedTestController.create_router())
+    return TestClient(app)
+
+
+class CoalescedTestController(Controller):
+    prefix = "/test-coalesced"
+    calls = 0
+
+    @get("", single_flight=True)
+    async def test_get(self, value: int = 0) -> Dict[str, int]:
+        CoalescedTestController.calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": value, "calls": CoalescedTestController.calls}
+
+    @get("/error", single_flight=True)
+    async def test_error(self) -> None:
+        CoalescedTestController.calls += 1
+        await asyncio.sleep(0.05)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    @get("/key", single_flight=SingleFlightConfig(key=lambda request: request.method))
+    async def test_key(self, value: int = 0) -> Dict[str, int]:
+        CoalescedTestController.calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": value}
+
+    @get("/timeout", single_flight=SingleFlightConfig(timeout=0.01))
+    async def test_timeout(self) -> None:
+        await asyncio.sleep(0.1)
+
+    @get("/user", single_flight=True)
+    async def test_user(self, request: Request) -> Dict[str, Optional[str]]:
+        CoalescedTestController.calls += 1
+        await asyncio.sleep(0.05)
+        return {"user": request.headers.get("authorization")}
+
+    @get("/stream", single_flight=True)
+    async def test_stream(self) -> StreamingResponse:
+        CoalescedTestController.calls += 1
+        await asyncio.sleep(0.05)
+        return StreamingResponse(iter([b"TEST"]))
+
+
+@pytest.fixture
+def coalesced_test_app() -> FastAPI:
+    CoalescedTestController.calls = 0
+    app = FastAPI()
+    app.include_router(CoalescedTestController.create_router())
+    return app
+
+
+class IdempotentTestController(Controller):
+    prefix = "/test-idempotent"
+    calls = 0
+
+    @post("", idempotency=True, status_code=status.HTTP_201_CREATED)
+    async def test_post(self, value: int = Body(0, embed=True)) -> Dict[str, int]:
+        IdempotentTestController.calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": value, "calls": IdempotentTestController.calls}
+
+    @post("/auth", idempotency=True, dependencies=[Depends(require_credentials)])
+    async def test_auth(self, request: Request, value: int = Body(0, embed=True)) -> Dict[str, Any]:
+        IdempotentTestController.calls += 1
+        return {"value": value, "calls": IdempotentTestController.calls, "user": request.headers["authorization"]}
+
+    @put("/error", idempotency=True)
+    async def test_error(self) -> Response:
+        IdempotentTestController.calls += 1
+        return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @patch("/timeout", idempotency=IdempotencyConfig(timeout=0.01))
+    async def test_timeout(self) -> None:
+        await asyncio.sleep(0.1)
+
+
+@pytest.fixture
+def idempotent_test_app() -> FastAPI:
+    IdempotentTestController.calls = 0
+    app = FastAPI()
+    app.include_router(IdempotentTestController.create_router())
+    return app
+
+
+class DispatchedTestController(Controller):
+    prefix = "/test-dispatched"
+
+    @get("/items/me")
+    async def test_me(self) -> Dict[str, str]:
+        return {"item": "ME"}
+
+    @get("/items/{item_id}")
+    async def test_item(self, item_id: str, request: Request) -> Dict[str, str]:
+        return {"item": item_id, "route": request.scope["route"].path}
+
+    @post("/items", status_code=status.HTTP_201_CREATED)
+    async def test_create(self) -> Dict[str, str]:
+        return {"item": "CREATED"}
+
+    @websocket("/ws/{name}")
+    async def test_websocket(self, websocket: WebSocket, name: str) -> None:
+        await websocket.accept()
+        await websocket.send_text(name)
+        await websocket.close()
+
+
+class InstrumentedTestController(Controller):
+    prefix = "/test-instrumented"
+    metrics = MetricsRegistry()
+
+    def __init__(self) -> None:
+        time.sleep(0.01)
+
+    @get("/sync")
+    def test_sync(self) -> Dict[str, str]:
+        time.sleep(0.02)
+        return {"message": "TEST"}
+
+    @get("/async")
+    async def test_async(self) -> Dict[str, str]:
+        await asyncio.sleep(0.02)
+        return {"message": "TEST"}
+
+    @get("/offloaded", offload=OffloadMode.INLINE)
+    def test_offloaded(self) -> Dict[str, str]:
+        return {"message": "TEST"}
+
+    @get("/error")
+    async def test_error(self) -> None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    @websocket("/ws")
+    async def test_websocket(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text("TEST")
+        await websocket.close()
+
+
+@pytest.fixture
+def instrumented_test_client() -> TestClient:
+    InstrumentedTestController.metrics.reset()  # type: ignore
+    app = FastAPI()
+    app.include_router(InstrumentedTestController.create_router())
+    return TestClient(app)
+
+
+class Pool:
+    opened = 0
+    closed = 0
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+async def open_pool(message: str = Depends(sync_dependency)) -> AsyncIterator[Pool]:  # noqa: B008
+    Pool.opened += 1
+    yield Pool(message)
+    Pool.closed += 1
+
+
+def create_settings() -> Dict[str, str]:
+    return {"name": "TEST"}
+
+
+class ResourceTestController(Controller):
+    prefix = "/test-resources"
+    pool = Resource(open_pool)
+    settings = Resource(create_settings)
+
+    @get("")
+    async def test_get(self) -> Dict[str, str]:
+        return {"pool": self.pool.message, **self.settings}
+
+
+class AppScopedResourceTestController(Controller):
+    prefix = "/test-app-scoped-resources"
+    lifetime = ControllerLifetime.APP
+    pool = ResourceTestController.pool
+
+    def __init__(self) -> None:
+        self.message = self.pool.message
+
+    @get("/init")
+    def test_init(self) -> Dict[str, str]:
+        return {"message": self.message}
+
+    @get("/depends")
+    def test_depends(self, pool: Pool = Depends(ResourceTestController.pool)) -> Dict[str, int]:  # noqa: B008
+        return {"pool": id(pool), "self": id(self.pool)}
+
+
+@pytest.fixture
+def resource_app() -> FastAPI:
+    Pool.opened = Pool.closed = 0
+    app = FastAPI()
+    app.include_router(ResourceTestController.create_router())
+    app.include_router(AppScopedResourceTestController.create_router())
+    return app
+
+
+class BatchedTestController(Controller):
+    prefix = "/test-batched"
+    batches: List[int] = []
+
+    @post("", batch=True)
+    async def test_post(self, values: List[int] = Body(..., embed=True)) -> List[Dict[str, int]]:  # noqa: B008
+        BatchedTestController.batches.append(len(values))
+        return [{"value": value * 2} for value in values]
+
+    @post("/limited", batch=BatchConfig(max_size=2, window=1))
+    def test_limited(self, values: List[int] = Query(...)) -> List[int]:  # noqa: B008
+        BatchedTestController.batches.append(len(values))
+        return values
+
+    @post("/error", batch=True)
+    async def test_error(self, values: List[int] = Query(...)) -> List[int]:  # noqa: B008
+        if 0 in values:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+        return values[1:]
+
+
+@pytest.fixture
+def batched_test_app() -> FastAPI:
+    BatchedTestController.batches = []
+    app = FastAPI()
+    app.include_router(BatchedTestController.create_router())
+    return app
+
+
+class StreamedItem(BaseModel):
+    id: int
+    name: str
+
+
+class StreamedTestController(Controller):
+    prefix = "/test-streamed"
+    closed = 0
+
+    @get("/ndjson", stream=True)
+    async def test_ndjson(self, count: int = 3) -> AsyncIterator[StreamedItem]:
+        try:
+            for index in range(count):
+                await asyncio.sleep(0)
+                yield {"id": index, "name": f"item-{index}"}  # type: ignore
+        finally:
+            StreamedTestController.closed += 1
+
+    @get("/json", stream=StreamFormat.JSON)
+    def test_json(self, count: int = 3) -> Iterator[int]:
+        try:
+            yield from range(count)
+        finally:
+            StreamedTestController.closed += 1
+
+    @get("/csv", stream=StreamConfig(format=StreamFormat.CSV, chunk_size=1))
+    def test_csv(self) -> Iterator[StreamedItem]:
+        yield StreamedItem(id=1, name="first")
+        yield StreamedItem(id=2, name="second, third")
+
+    @get("/csv-fields", stream=StreamConfig(format=StreamFormat.CSV, fields=("name",)))
+    async def test_csv_fields(self) -> AsyncIterator[Dict[str, Union[int, str]]]:
+        yield {"id": 1, "name": "first"}
+
+    @get("/invalid", stream=True)
+    async def test_invalid(self) -> AsyncIterator[StreamedItem]:
+        yield {"id": "TEST"}  # type: ignore
+
+    @get("/unvalidated", stream=StreamConfig(validate=False))
+    async def test_unvalidated(self) -> AsyncIterator[StreamedItem]:
+        yield {"id": "TEST"}  # type: ignore
+
+
+@pytest.fixture
+def streamed_test_client() -> TestClient:
+    StreamedTestController.closed = 0
+    app = FastAPI()
+    app.include_router(StreamedTestController.create_router())
+    return TestClient(app)
+
+
+async def open_hub() -> AsyncIterator[BroadcastHub]:
+    async with BroadcastHub(BroadcastConfig(batch_size=10, flush_interval=0.01)) as hub:
+        yield hub
+
+
+class BroadcastTestController(Controller):
+    prefix = "/test-broadcast"
+    hub = Resource(open_hub)
+
+    async def on_message(self, connection: Connection, message: Any) -> None:
+        if isinstance(message, dict) and "join" in message:
+            self.hub.join(connection, message["join"])
+        self.hub.send(connection, {"echo": message})
+
+    @websocket("/ws/{group}")
+    async def test_websocket(self, websocket: WebSocket, group: str) -> None:
+        await self.hub.serve(websocket, groups=[group], on_message=self.on_message)
+
+    @post("/{group}")
+    async def test_broadcast(self, group: str, message: Dict[str, Any] = Body(...)) -> Dict[str, int]:  # noqa: B008
+        return {"recipients": self.hub.broadcast(message, group=group if group != "all" else None, key=message.get("key"))}
+
+
+@pytest.fixture
+def broadcast_test_client() -> Iterator[TestClient]:
+    app = FastAPI()
+    app.include_router(BroadcastTestController.create_router())
+    with TestClient(app) as client:
+        yield client
+
+
+audit_log: List[str] = []
+
+
+def write_audit_entry(entry: str) -> None:
+    time.sleep(0.01)
+    audit_log.append(entry)
+
+
+class BackgroundTestController(Controller):
+    prefix = "/test-background"
+    audit = BackgroundQueue(write_audit_entry, QueueConfig(max_size=10, workers=2))
+
+    @post("/{entry}")
+    async def test_post(self, entry: str) -> Dict[str, int]:
+        await self.audit.put(entry)
+        return {"pending": self.audit.pending}
+
+
+def get_audit_pending(audit: BackgroundWorkers = Depends(BackgroundTestController.audit)) -> int:  # noqa: B008
+    return audit.pending
+
+
+@pytest.fixture
+def background_app() -> FastAPI:
+    audit_log.clear()
+    app = FastAPI()
+    app.include_router(BackgroundTestController.create_router())
+
+    @app.get("/audit-pending")
+    def audit_pending(pending: int = Depends(get_audit_pending)) -> int:  # noqa: B008
+        return pending
+
+    return app
@@ -0,0 +1,21 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.functional.conftest import audit_log
+
+
+def describe_background_queue() -> None:
+    def it_processes_the_queued_items_after_responding(background_app: FastAPI) -> None:
+        with TestClient(background_app) as client:
+            for entry in ["a", "b", "c"]:
+                assert client.post(f"/test-background/{entry}").status_code == 200
+        assert sorted(audit_log) == ["a", "b", "c"]
+
+    def it_provides_the_queue_as_a_dependency(background_app: FastAPI) -> None:
+        with TestClient(background_app) as client:
+            assert client.get("/audit-pending").json() == 0
+
+    def it_fails_outside_of_the_lifespan(background_app: FastAPI) -> None:
+        with pytest.raises(RuntimeError, match="Resource 'audit' is not open"):
+            TestClient(background_app).post("/test-background/a")
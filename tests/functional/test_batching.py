@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI, status
+
+from tests.functional.conftest import BatchedTestController
+
+
+def gather(app: FastAPI, path: str, requests: List[Dict[str, Any]]) -> List[httpx.Response]:
+    async def send() -> List[httpx.Response]:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[client.post(path, **request) for request in requests])
+
+    return asyncio.run(send())
+
+
+def describe_batching() -> None:
+    def it_handles_concurrent_requests_in_a_single_batch(batched_test_app: FastAPI) -> None:
+        responses = gather(batched_test_app, "/test-batched", [{"json": {"values": value}} for value in range(5)])
+        assert [response.json() for response in responses] == [{"value": value * 2} for value in range(5)]
+        assert BatchedTestController.batches == [5]
+
+    def it_limits_the_size_of_batches(batched_test_app: FastAPI) -> None:
+        responses = gather(batched_test_app, "/test-batched/limited", [{"params": {"values": value}} for value in range(4)])
+        assert [response.json() for response in responses] == list(range(4))
+        assert BatchedTestController.batches == [2, 2]
+
+    def it_validates_single_requests(batched_test_app: FastAPI) -> None:
+        responses = gather(batched_test_app, "/test-batched", [{"json": {"values": "TEST"}}, {"json": {"values": 1}}])
+        assert [response.status_code for response in responses] == [422, status.HTTP_200_OK]
+
+    def it_fails_the_whole_batch(batched_test_app: FastAPI) -> None:
+        responses = gather(batched_test_app, "/test-batched/error", [{"params": {"values": value}} for value in range(3)])
+        assert [response.status_code for response in responses] == [status.HTTP_400_BAD_REQUEST] * 3
+
+    def it_fails_batches_with_mismatched_results(batched_test_app: FastAPI) -> None:
+        responses = gather(batched_test_app, "/test-batched/error", [{"params": {"values": value}} for value in range(1, 3)])
+        assert [response.status_code for response in responses] == [status.HTTP_500_INTERNAL_SERVER_ERROR] * 2
+
+    def it_documents_single_requests(batched_test_app: FastAPI) -> None:
+        schema = batched_test_app.openapi()
+        parameter = schema["paths"]["/test-batched/limited"]["post"]["parameters"][0]
+        assert parameter["schema"]["type"] == "integer"
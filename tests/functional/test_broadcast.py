@@ -0,0 +1,47 @@
+from typing import Any, List
+
+from fastapi.testclient import TestClient
+from starlette.testclient import WebSocketTestSession
+
+
+def receive(websocket: WebSocketTestSession, count: int) -> List[Any]:
+    messages: List[Any] = []
+    while len(messages) < count:
+        messages.extend(websocket.receive_json())
+    return messages
+
+
+def describe_broadcast() -> None:
+    def it_broadcasts_messages_to_groups(broadcast_test_client: TestClient) -> None:
+        with broadcast_test_client.websocket_connect("/test-broadcast/ws/first") as first, broadcast_test_client.websocket_connect(
+            "/test-broadcast/ws/second"
+        ) as second:
+            first.send_json({"ping": 1})
+            assert first.receive_json() == [{"echo": {"ping": 1}}]
+            second.send_json({"ping": 2})
+            assert second.receive_json() == [{"echo": {"ping": 2}}]
+            assert broadcast_test_client.post("/test-broadcast/first", json={"value": 1}).json() == {"recipients": 1}
+            assert broadcast_test_client.post("/test-broadcast/all", json={"value": 2}).json() == {"recipients": 2}
+            assert receive(first, 2) == [{"value": 1}, {"value": 2}]
+            assert receive(second, 1) == [{"value": 2}]
+
+    def it_coalesces_messages_with_the_same_key(broadcast_test_client: TestClient) -> None:
+        with broadcast_test_client.websocket_connect("/test-broadcast/ws/first") as websocket:
+            websocket.send_text("ready")
+            assert websocket.receive_json() == [{"echo": "ready"}]
+            for value in range(3):
+                broadcast_test_client.post("/test-broadcast/first", json={"key": "price", "value": value})
+            assert websocket.receive_json() == [{"key": "price", "value": 2}]
+
+    def it_joins_groups_on_request(broadcast_test_client: TestClient) -> None:
+        with broadcast_test_client.websocket_connect("/test-broadcast/ws/first") as websocket:
+            websocket.send_json({"join": "other"})
+            assert websocket.receive_json() == [{"echo": {"join": "other"}}]
+            assert broadcast_test_client.post("/test-broadcast/other", json={"value": 1}).json() == {"recipients": 1}
+            assert websocket.receive_json() == [{"value": 1}]
+
+    def it_unregisters_disconnected_clients(broadcast_test_client: TestClient) -> None:
+        with broadcast_test_client.websocket_connect("/test-broadcast/ws/first") as websocket:
+            websocket.send_bytes(b"ready")
+            assert websocket.receive_json() == [{"echo": "ready"}]
+        assert broadcast_test_client.post("/test-broadcast/first", json={"value": 1}).json() == {"recipients": 0}
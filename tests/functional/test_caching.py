@@ -0,0 +1,63 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from fastapi_controllers import CacheConfig
+from tests.functional.conftest import AuthCachedTestController, CachedTestController
+
+
+def describe_response_cache() -> None:
+    def it_serves_repeated_requests_from_the_cache(cached_test_client: TestClient) -> None:
+        first = cached_test_client.get("/test-cached")
+        second = cached_test_client.get("/test-cached")
+        assert first.json() == second.json() == {"calls": 1}
+        assert first.headers["etag"] == second.headers["etag"]
+
+    def it_keys_the_cache_on_query_and_vary_headers(cached_test_client: TestClient) -> None:
+        cached_test_client.get("/test-cached", params={"a": 1, "b": 2})
+        assert cached_test_client.get("/test-cached", params={"b": 2, "a": 1}).json() == {"calls": 1}
+        assert cached_test_client.get("/test-cached", params={"a": 2}).json() == {"calls": 2}
+        assert cached_test_client.get("/test-cached", headers={"accept-language": "pl"}).json() == {"calls": 3}
+
+    def it_responds_with_not_modified_for_matching_etags(cached_test_client: TestClient) -> None:
+        etag = cached_test_client.get("/test-cached").headers["etag"]
+        response = cached_test_client.get("/test-cached", headers={"if-none-match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def it_does_not_cache_routes_opting_out(cached_test_client: TestClient) -> None:
+        cached_test_client.get("/test-cached/uncached")
+        assert cached_test_client.get("/test-cached/uncached").json() == {"calls": 2}
+
+    def it_invalidates_the_cache_after_mutating_requests(cached_test_client: TestClient) -> None:
+        cached_test_client.get("/test-cached")
+        cached_test_client.put("/test-cached")
+        assert cached_test_client.get("/test-cached").json() == {"calls": 1}
+        cached_test_client.post("/test-cached")
+        assert cached_test_client.get("/test-cached").json() == {"calls": 2}
+
+    def it_caches_responses_per_app(cached_test_client: TestClient) -> None:
+        cached_test_client.get("/test-cached")
+        app = FastAPI()
+        app.include_router(CachedTestController.create_router())
+        assert TestClient(app).get("/test-cached").json() == {"calls": 2}
+
+
+def describe_response_cache_credentials() -> None:
+    def it_keys_the_cache_on_the_credentials_by_default(auth_cached_test_client: TestClient) -> None:
+        credentials = [{"authorization": "alice"}, {"authorization": "bob"}, {}]
+        users = [auth_cached_test_client.get("/test-credential-cached", headers=headers).json() for headers in credentials]
+        assert users == [{"user": "alice"}, {"user": "bob"}, {"user": None}]
+
+    def it_runs_the_dependencies_for_requests_with_other_credentials(auth_cached_test_client: TestClient) -> None:
+        assert auth_cached_test_client.get("/test-auth-cached").status_code == status.HTTP_401_UNAUTHORIZED
+        assert auth_cached_test_client.get("/test-auth-cached", headers={"authorization": "alice"}).json() == {"secret": 42}
+        assert auth_cached_test_client.get("/test-auth-cached").status_code == status.HTTP_401_UNAUTHORIZED
+
+    def it_refuses_to_cache_routes_with_dependencies_without_an_explicit_vary() -> None:
+        class UnsafeController(AuthCachedTestController):
+            response_cache = CacheConfig()
+
+        with pytest.raises(TypeError, match="explicit 'vary' setting"):
+            UnsafeController.create_router()
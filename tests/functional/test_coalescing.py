@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, status
+
+from tests.functional.conftest import CoalescedTestController
+
+
+def gather(app: FastAPI, path: str, params: Optional[List[Dict[str, Any]]] = None) -> List[httpx.Response]:
+    async def send() -> List[httpx.Response]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*[client.get(path, params=param) for param in params or [{}] * 5])
+
+    return asyncio.run(send())
+
+
+def describe_single_flight() -> None:
+    def it_shares_the_response_between_identical_requests(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced")
+        assert [response.json() for response in responses] == [{"value": 0, "calls": 1}] * 5
+        assert CoalescedTestController.calls == 1
+
+    def it_keeps_different_requests_apart(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced", [{"value": 1}, {"value": 2}, {"value": 1}])
+        assert [response.json()["value"] for response in responses] == [1, 2, 1]
+        assert CoalescedTestController.calls == 2
+
+    def it_runs_the_handler_again_once_the_request_completed(coalesced_test_app: FastAPI) -> None:
+        gather(coalesced_test_app, "/test-coalesced")
+        gather(coalesced_test_app, "/test-coalesced")
+        assert CoalescedTestController.calls == 2
+
+    def it_shares_exceptions_between_identical_requests(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced/error")
+        assert [response.status_code for response in responses] == [status.HTTP_404_NOT_FOUND] * 5
+        assert CoalescedTestController.calls == 1
+
+    def it_uses_custom_keys(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced/key", [{"value": 1}, {"value": 2}])
+        assert [response.json()["value"] for response in responses] == [1, 1]
+        assert CoalescedTestController.calls == 1
+
+    def it_times_out_waiting_requests(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced/timeout")
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK] + [status.HTTP_504_GATEWAY_TIMEOUT] * 4
+
+    def it_runs_the_handler_for_every_request_if_the_response_cannot_be_shared(coalesced_test_app: FastAPI) -> None:
+        responses = gather(coalesced_test_app, "/test-coalesced/stream")
+        assert [response.content for response in responses] == [b"TEST"] * 5
+        assert CoalescedTestController.calls == 5
+
+    def it_keeps_requests_with_different_credentials_apart(coalesced_test_app: FastAPI) -> None:
+        async def send() -> List[httpx.Response]:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=coalesced_test_app), base_url="http://test") as client:
+                credentials: List[Dict[str, str]] = [{"authorization": "alice"}, {"authorization": "bob"}, {}]
+                return await asyncio.gather(*[client.get("/test-coalesced/user", headers=headers) for headers in credentials])
+
+        responses = asyncio.run(send())
+        assert [response.json() for response in responses] == [{"user": "alice"}, {"user": "bob"}, {"user": None}]
+        assert CoalescedTestController.calls == 3
@@ -0,0 +1,87 @@
+from typing import Any, List, Type
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from fastapi_controllers import Controller, RouteDispatcher, get
+from tests.functional.conftest import DispatchedTestController, SyncTestController
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain() -> str:
+        return "PLAIN"
+
+    Controller.include_all(app, [DispatchedTestController, SyncTestController], dispatch=True)
+    return app
+
+
+def create_controllers(count: int) -> List[Type[Controller]]:
+    def test_item(self: Any, item_id: int) -> int:
+        return item_id
+
+    def test_items(self: Any) -> List[int]:
+        return []
+
+    attributes = {"__abstract__": True, "test_item": get("/items/{item_id}")(test_item), "test_items": get("/items")(test_items)}
+    return [type(f"GeneratedTestController{index}", (Controller,), {**attributes, "prefix": f"/generated-{index}"}) for index in range(count)]
+
+
+def count_matches(monkeypatch: pytest.MonkeyPatch, controllers: int, path: str) -> int:
+    app = FastAPI()
+    Controller.include_all(app, create_controllers(controllers), dispatch=True)
+
+    @app.get("/plain")
+    async def plain() -> str:
+        return "PLAIN"
+
+    calls: List[str] = []
+    matches = APIRoute.matches
+
+    def counting_matches(self: APIRoute, scope: Any) -> Any:
+        calls.append(self.path)
+        return matches(self, scope)
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(APIRoute, "matches", counting_matches)
+        client.get(path)
+        monkeypatch.setattr(APIRoute, "matches", matches)
+    return len(calls)
+
+
+def describe_dispatch() -> None:
+    def it_places_a_dispatcher_in_front_of_the_registered_routes() -> None:
+        app = create_app()
+        index = next(index for index, route in enumerate(app.router.routes) if isinstance(route, RouteDispatcher))
+        dispatcher = app.router.routes[index]
+        assert getattr(app.router.routes[index - 1], "path", None) == "/plain"
+        assert dispatcher.routes == app.router.routes[index + 1 :]  # type: ignore
+
+    def it_dispatches_the_requests_in_declaration_order() -> None:
+        client = TestClient(create_app())
+        assert client.get("/test-dispatched/items/me").json() == {"item": "ME"}
+        assert client.get("/test-dispatched/items/1").json() == {"item": "1", "route": "/test-dispatched/items/{item_id}"}
+        assert client.post("/test-dispatched/items").status_code == status.HTTP_201_CREATED
+        assert client.get("/test-sync").text == "SYNC TEST"
+        assert client.get("/plain").json() == "PLAIN"
+        with client.websocket_connect("/test-dispatched/ws/TEST") as websocket:
+            assert websocket.receive_text() == "TEST"
+
+    @pytest.mark.parametrize("path", ["/plain", "/missing", "/generated-1/items/1"])
+    def it_does_not_test_the_dispatched_routes_again(monkeypatch: pytest.MonkeyPatch, path: str) -> None:
+        assert count_matches(monkeypatch, 10, path) == count_matches(monkeypatch, 100, path) <= 3
+
+    def it_keeps_the_behavior_of_unmatched_requests() -> None:
+        client = TestClient(create_app())
+        assert client.delete("/test-dispatched/items").status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert client.get("/test-dispatched/other").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/test-dispatched/items/me/", follow_redirects=False).status_code == status.HTTP_307_TEMPORARY_REDIRECT
+
+    def it_keeps_the_routes_documented_and_reversible() -> None:
+        app = create_app()
+        assert "/test-dispatched/items/{item_id}" in TestClient(app).get("/openapi.json").json()["paths"]
+        assert app.url_path_for("test_item", item_id="1") == "/test-dispatched/items/1"
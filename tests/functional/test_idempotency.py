@@ -0,0 +1,62 @@
+import asyncio
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, status
+
+from tests.functional.conftest import IdempotentTestController
+
+
+def send(
+    app: FastAPI, method: str, path: str, keys: List[Optional[str]], json: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
+) -> List[httpx.Response]:
+    async def run() -> List[httpx.Response]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", headers=headers) as client:
+            requests = [client.request(method, path, json=json, headers={"Idempotency-Key": key} if key else {}) for key in keys]
+            return await asyncio.gather(*requests)
+
+    return asyncio.run(run())
+
+
+def describe_idempotency() -> None:
+    def it_runs_concurrent_duplicates_once(idempotent_test_app: FastAPI) -> None:
+        responses = send(idempotent_test_app, "POST", "/test-idempotent", ["KEY"] * 5, {"value": 1})
+        assert [response.json() for response in responses] == [{"value": 1, "calls": 1}] * 5
+        assert [response.status_code for response in responses] == [status.HTTP_201_CREATED] * 5
+        assert sorted(response.headers.get("idempotent-replayed", "false") for response in responses) == ["false"] + ["true"] * 4
+        assert IdempotentTestController.calls == 1
+
+    def it_replays_the_response_to_retries(idempotent_test_app: FastAPI) -> None:
+        send(idempotent_test_app, "POST", "/test-idempotent", ["KEY"], {"value": 1})
+        responses = send(idempotent_test_app, "POST", "/test-idempotent", ["KEY"], {"value": 1})
+        assert responses[0].json() == {"value": 1, "calls": 1}
+        assert IdempotentTestController.calls == 1
+
+    def it_replays_the_response_only_to_the_same_credentials(idempotent_test_app: FastAPI) -> None:
+        alice = send(idempotent_test_app, "POST", "/test-idempotent/auth", ["KEY"] * 2, {"value": 1}, {"Authorization": "Bearer alice"})
+        assert [response.json() for response in alice] == [{"value": 1, "calls": 1, "user": "Bearer alice"}] * 2
+        assert send(idempotent_test_app, "POST", "/test-idempotent/auth", ["KEY"], {"value": 1})[0].status_code == status.HTTP_401_UNAUTHORIZED
+        bob = send(idempotent_test_app, "POST", "/test-idempotent/auth", ["KEY"], {"value": 1}, {"Authorization": "Bearer bob"})
+        assert bob[0].json() == {"value": 1, "calls": 2, "user": "Bearer bob"}
+        assert "idempotent-replayed" not in bob[0].headers
+
+    def it_runs_requests_with_different_or_without_keys(idempotent_test_app: FastAPI) -> None:
+        send(idempotent_test_app, "POST", "/test-idempotent", ["FIRST", "SECOND", None, None])
+        assert IdempotentTestController.calls == 4
+
+    def it_rejects_keys_reused_for_different_requests(idempotent_test_app: FastAPI) -> None:
+        send(idempotent_test_app, "POST", "/test-idempotent", ["KEY"], {"value": 1})
+        responses = send(idempotent_test_app, "POST", "/test-idempotent", ["KEY"], {"value": 2})
+        assert responses[0].status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert IdempotentTestController.calls == 1
+
+    def it_does_not_store_server_errors(idempotent_test_app: FastAPI) -> None:
+        send(idempotent_test_app, "PUT", "/test-idempotent/error", ["KEY"])
+        responses = send(idempotent_test_app, "PUT", "/test-idempotent/error", ["KEY"])
+        assert responses[0].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert IdempotentTestController.calls == 2
+
+    def it_times_out_waiting_duplicates(idempotent_test_app: FastAPI) -> None:
+        responses = send(idempotent_test_app, "PATCH", "/test-idempotent/timeout", ["KEY"] * 3)
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK] + [status.HTTP_409_CONFLICT] * 2
@@ -0,0 +1,28 @@
+from fastapi import FastAPI, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from fastapi_controllers import Controller
+from tests.functional.conftest import AppScopedTestController, AsyncTestController, SyncTestController, sync_dependency
+
+
+def describe_include_all() -> None:
+    def it_registers_the_controllers_on_the_app() -> None:
+        app = FastAPI()
+        Controller.include_all(app, [SyncTestController, AsyncTestController, AppScopedTestController])
+        client = TestClient(app)
+        assert client.get("/test-sync").text == "SYNC TEST"
+        assert client.get("/test-async").text == "ASYNC TEST"
+        assert client.get("/test-app-scoped").status_code == status.HTTP_200_OK
+
+    def it_builds_the_routes_on_the_app_router() -> None:
+        app = FastAPI()
+        Controller.include_all(app, [SyncTestController, AsyncTestController])
+        paths = {route.path for route in app.router.routes if isinstance(route, APIRoute)}
+        assert {"/test-sync", "/test-async"} <= paths
+
+    def it_honors_dependency_overrides() -> None:
+        app = FastAPI()
+        Controller.include_all(app, [SyncTestController, AppScopedTestController])
+        app.dependency_overrides[sync_dependency] = lambda: "OVERRIDE"
+        assert TestClient(app).get("/test-sync").text == "OVERRIDE"
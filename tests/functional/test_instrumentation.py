@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+
+from tests.functional.conftest import InstrumentedTestController
+
+
+def snapshot(name: str) -> dict:
+    return InstrumentedTestController.metrics.snapshot()[f"InstrumentedTestController.{name}"]  # type: ignore
+
+
+def describe_instrumentation() -> None:
+    def it_records_the_phases_of_sync_routes(instrumented_test_client: TestClient) -> None:
+        instrumented_test_client.get("/test-instrumented/sync")
+        instrumented_test_client.get("/test-instrumented/sync")
+        metrics = snapshot("test_sync")
+        assert metrics["requests"] == 2
+        assert all(metrics[phase]["count"] == 2 for phase in ["construction", "handler", "serialization", "total"])
+        assert metrics["construction"]["min"] >= 0.01
+        assert metrics["handler"]["min"] >= 0.02
+        assert metrics["total"]["min"] >= metrics["construction"]["min"] + metrics["handler"]["min"]
+
+    def it_records_the_phases_of_async_routes(instrumented_test_client: TestClient) -> None:
+        instrumented_test_client.get("/test-instrumented/async")
+        metrics = snapshot("test_async")
+        assert metrics["handler"]["count"] == metrics["serialization"]["count"] == 1
+        assert metrics["handler"]["min"] >= 0.02
+
+    def it_records_offloaded_routes(instrumented_test_client: TestClient) -> None:
+        assert instrumented_test_client.get("/test-instrumented/offloaded").json() == {"message": "TEST"}
+        assert snapshot("test_offloaded")["handler"]["count"] == 1
+
+    def it_records_failed_requests(instrumented_test_client: TestClient) -> None:
+        assert instrumented_test_client.get("/test-instrumented/error").status_code == 404
+        metrics = snapshot("test_error")
+        assert metrics["total"]["count"] == metrics["handler"]["count"] == 1
+        assert metrics["serialization"]["count"] == 0
+
+    def it_leaves_websocket_routes_alone(instrumented_test_client: TestClient) -> None:
+        with instrumented_test_client.websocket_connect("/test-instrumented/ws") as websocket:
+            assert websocket.receive_text() == "TEST"
+        assert "InstrumentedTestController.test_websocket" not in InstrumentedTestController.metrics.snapshot()  # type: ignore
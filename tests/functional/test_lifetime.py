@@ -0,0 +1,38 @@
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from tests.functional.conftest import AppScopedTestController, Counter, WorkerScopedTestController
+
+
+def describe_app_scoped_controller() -> None:
+    def it_reuses_a_single_instance_per_app(scoped_app: FastAPI, scoped_counter: Counter) -> None:
+        client = TestClient(scoped_app)
+        responses = [client.get("/test-app-scoped") for _ in range(3)]
+        assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+        assert len({response.text for response in responses}) == 1
+        assert scoped_counter.created == 1
+
+    def it_creates_separate_instances_for_separate_apps(scoped_app: FastAPI, scoped_counter: Counter) -> None:
+        other_app = FastAPI()
+        other_app.include_router(AppScopedTestController.create_router())
+        first = TestClient(scoped_app).get("/test-app-scoped")
+        second = TestClient(other_app).get("/test-app-scoped")
+        assert first.text != second.text
+        assert scoped_counter.created == 2
+
+    def it_builds_the_instance_at_startup_and_closes_it_at_shutdown(scoped_app: FastAPI, scoped_counter: Counter) -> None:
+        with TestClient(scoped_app) as client:
+            assert scoped_counter.created == 1
+            client.get("/test-app-scoped")
+            assert scoped_counter.created == 1
+        assert scoped_counter.closed == 1
+
+
+def describe_worker_scoped_controller() -> None:
+    def it_shares_a_single_instance_between_apps(scoped_app: FastAPI) -> None:
+        other_app = FastAPI()
+        other_app.include_router(WorkerScopedTestController.create_router())
+        first = TestClient(scoped_app).get("/test-worker-scoped")
+        second = TestClient(other_app).get("/test-worker-scoped")
+        assert first.status_code == status.HTTP_200_OK
+        assert first.text == second.text
@@ -0,0 +1,117 @@
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from fastapi_controllers import MemoryRateLimitBackend, MemoryStateBackend
+from tests.functional.conftest import LimitedTestController, RateLimitedTestController
+
+
+def gather(app: FastAPI, path: str, count: int) -> List[httpx.Response]:
+    async def send() -> List[httpx.Response]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*[client.get(path) for _ in range(count)])
+
+    return asyncio.run(send())
+
+
+def describe_concurrency_limit() -> None:
+    def it_queues_and_sheds_excess_requests(limited_test_app: FastAPI) -> None:
+        responses = gather(limited_test_app, "/test-limited", 3)
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK] * 2 + [status.HTTP_503_SERVICE_UNAVAILABLE]
+        rejected = next(response for response in responses if response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE)
+        assert rejected.headers["retry-after"] == "1"
+        assert LimitedTestController.constructed == 2
+
+    def it_limits_all_the_routes_of_the_controller(limited_test_app: FastAPI) -> None:
+        responses = gather(limited_test_app, "/test-limited/shared", 10)
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK] * 8 + [status.HTTP_503_SERVICE_UNAVAILABLE] * 2
+
+    def it_uses_the_configured_status_code(limited_test_app: FastAPI) -> None:
+        responses = gather(limited_test_app, "/test-limited/rejected", 2)
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS]
+
+    def it_rejects_requests_waiting_too_long(limited_test_app: FastAPI) -> None:
+        responses = gather(limited_test_app, "/test-limited/timeout", 3)
+        assert sorted(response.status_code for response in responses) == [status.HTTP_200_OK] + [status.HTTP_503_SERVICE_UNAVAILABLE] * 2
+
+    def it_limits_websocket_connections(limited_test_app: FastAPI) -> None:
+        with TestClient(limited_test_app) as client:
+            with client.websocket_connect("/test-limited/ws") as websocket:
+                with pytest.raises(WebSocketDisconnect) as exc_info:
+                    with client.websocket_connect("/test-limited/ws"):
+                        ...  # pragma: no cover
+                assert exc_info.value.code == status.WS_1013_TRY_AGAIN_LATER
+                websocket.send_text("TEST")
+                assert websocket.receive_text() == "TEST"
+            with client.websocket_connect("/test-limited/ws") as websocket:
+                websocket.send_text("TEST")
+                assert websocket.receive_text() == "TEST"
+
+
+def describe_rate_limit() -> None:
+    def it_rejects_requests_before_constructing_the_controller(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        assert [client.get("/test-rate-limited").status_code for _ in range(3)] == [status.HTTP_200_OK] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS]
+        assert client.get("/test-rate-limited").headers["retry-after"] == "30"
+        assert RateLimitedTestController.constructed == 2
+
+    def it_rejects_requests_before_parsing_the_body(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        for _ in range(2):
+            client.post("/test-rate-limited/body", json={"value": 1})
+        assert client.post("/test-rate-limited/body", content=b"invalid").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def it_limits_each_route_on_its_own(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        for _ in range(2):
+            client.get("/test-rate-limited")
+        assert client.post("/test-rate-limited/body", json={"value": 1}).status_code == status.HTTP_200_OK
+
+    def it_keys_the_buckets_by_header(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        statuses = [client.get("/test-rate-limited/header", headers={"x-api-key": key}).status_code for key in ["A", "B", "A"]]
+        assert statuses == [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS]
+
+    def it_keys_the_buckets_by_a_custom_function(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        statuses = [client.get(f"/test-rate-limited/custom{query}").status_code for query in ["?user=A", "?user=A", "", ""]]
+        assert statuses == [status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS, status.HTTP_200_OK, status.HTTP_200_OK]
+
+    def it_disables_the_limit_of_the_controller(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        assert {client.get("/test-rate-limited/unlimited").status_code for _ in range(5)} == {status.HTTP_200_OK}
+
+    def it_limits_websocket_connections(rate_limited_test_app: FastAPI) -> None:
+        client = TestClient(rate_limited_test_app)
+        with client.websocket_connect("/test-rate-limited/ws"):
+            ...
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/test-rate-limited/ws"):
+                ...  # pragma: no cover
+        assert exc_info.value.code == status.WS_1013_TRY_AGAIN_LATER
+
+    def it_shares_the_buckets_through_the_shared_state() -> None:
+        class SharedController(RateLimitedTestController):
+            shared_state = MemoryStateBackend()
+
+        apps = [FastAPI(), FastAPI()]
+        for app in apps:
+            app.include_router(SharedController.create_router())
+        statuses = [TestClient(app).get("/test-rate-limited").status_code for app in apps + apps]
+        assert statuses == [status.HTTP_200_OK] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS] * 2
+
+    def it_uses_the_rate_limit_backend_of_the_controller() -> None:
+        backend = MemoryRateLimitBackend()
+
+        class BackendController(RateLimitedTestController):
+            rate_limit_backend = backend
+
+        app = FastAPI()
+        app.include_router(BackendController.create_router())
+        TestClient(app).get("/test-rate-limited")
+        assert len(backend) == 1
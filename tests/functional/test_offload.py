@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+
+def describe_offload() -> None:
+    def it_runs_sync_methods_in_the_dedicated_executor(offload_test_client: TestClient) -> None:
+        result = offload_test_client.get("/test-offload/executor").json()
+        assert result["handler"]["thread"].startswith("OffloadTestController")
+        assert result["handler"]["on_loop"] is False
+
+    def it_constructs_the_controller_in_the_dedicated_executor(offload_test_client: TestClient) -> None:
+        result = offload_test_client.get("/test-offload/executor").json()
+        assert result["constructor"]["thread"].startswith("OffloadTestController")
+
+    def it_runs_inline_methods_on_the_event_loop(offload_test_client: TestClient) -> None:
+        result = offload_test_client.get("/test-offload/inline").json()
+        assert result["handler"]["on_loop"] is True
+
+    def it_runs_default_methods_in_the_default_thread_pool(offload_test_client: TestClient) -> None:
+        result = offload_test_client.get("/test-offload/default").json()
+        assert not result["handler"]["thread"].startswith("OffloadTestController")
+        assert result["handler"]["on_loop"] is False
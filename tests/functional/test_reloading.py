@@ -0,0 +1,216 @@
+import asyncio
+import importlib
+import sys
+import textwrap
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator, Tuple
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_controllers import Controller, RouteDispatcher, reloading
+from tests.functional.conftest import Pool, sync_dependency
+
+SOURCE = """
+import asyncio
+from typing import Dict
+
+from fastapi import WebSocket
+
+from fastapi_controllers import Controller, ControllerLifetime, Resource, get, websocket
+from tests.functional.conftest import open_pool
+
+
+class ReloadedTestController(Controller):
+    prefix = "/test-reloaded"
+    lifetime = ControllerLifetime.{lifetime}
+    pool = Resource(open_pool)
+
+    @get("/version")
+    async def test_version(self) -> Dict[str, str]:
+        await asyncio.sleep(float(self.pool.message == "delay") * 0.1)
+        return {{"version": "{version}"}}
+
+    @get("/unchanged")
+    async def test_unchanged(self) -> Dict[str, str]:
+        return {{"pool": self.pool.message}}
+
+    @websocket("/ws")
+    async def test_websocket(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text("{version}")
+        await websocket.close()
+{extra}
+"""
+
+EXTRA_ROUTE = """
+    @get("/extra")
+    async def test_extra(self) -> Dict[str, str]:
+        return {"extra": "TEST"}
+"""
+
+MODEL_ROUTE = """
+    @get("/item")
+    async def test_item(self, label: str = Depends(get_label)) -> Item:
+        return Item(name="TEST", label=label)
+"""
+
+MODEL = """
+from fastapi import Depends
+from pydantic import BaseModel
+
+
+class Item(BaseModel):
+    {field}
+
+
+def get_label() -> str:
+    return "{label}"
+"""
+
+
+@pytest.fixture
+def reloadable(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest) -> Iterator[Tuple[ModuleType, Path]]:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    name = f"reloadable_{request.node.name}"
+    path = tmp_path / f"{name}.py"
+    write(path)
+    Pool.opened = Pool.closed = 0
+    yield importlib.import_module(name), path
+    sys.modules.pop(name, None)
+
+
+def write(path: Path, version: str = "1", extra: str = "", lifetime: str = "REQUEST") -> None:
+    path.write_text(textwrap.dedent(SOURCE).format(version=version, extra=extra, lifetime=lifetime))
+
+
+def reload(module: ModuleType, path: Path, **kwargs: str) -> ModuleType:
+    write(path, **kwargs)
+    return importlib.reload(module)
+
+
+def write_model(path: Path, field: str, label: str) -> None:
+    source = textwrap.dedent(SOURCE).format(version="1", extra=MODEL_ROUTE, lifetime="REQUEST")
+    path.write_text(textwrap.dedent(MODEL).format(field=field, label=label) + source)
+
+
+def describe_reload() -> None:
+    def it_rebuilds_only_the_changed_routes(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router(), prefix="/api")
+        with TestClient(app) as client:
+            assert client.get("/api/test-reloaded/version").json() == {"version": "1"}
+            unchanged = [route for route in app.routes if getattr(route, "path", "").endswith("unchanged")]
+            module = reload(module, path, version="2", extra=EXTRA_ROUTE)
+            assert module.ReloadedTestController.reload(app) == ["test_version", "test_websocket", "test_extra"]
+            assert client.get("/api/test-reloaded/version").json() == {"version": "2"}
+            assert client.get("/api/test-reloaded/extra").json() == {"extra": "TEST"}
+            assert client.get("/api/test-reloaded/unchanged").json() == {"pool": "SYNC TEST"}
+            with client.websocket_connect("/api/test-reloaded/ws") as websocket:
+                assert websocket.receive_text() == "2"
+            assert [route for route in app.routes if getattr(route, "path", "").endswith("unchanged")] == unchanged
+            assert "/api/test-reloaded/extra" in client.get("/openapi.json").json()["paths"]
+        assert Pool.opened == Pool.closed == 1
+
+    def it_rebuilds_the_routes_referencing_changed_models_and_dependencies(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        write_model(path, "name: str", "first")
+        module = importlib.reload(module)
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router())
+        with TestClient(app) as client:
+            assert client.get("/test-reloaded/item").json() == {"name": "TEST"}
+            write_model(path, "name: str\n    label: str", "first")
+            module = importlib.reload(module)
+            assert module.ReloadedTestController.reload(app) == ["test_item"]
+            assert client.get("/test-reloaded/item").json() == {"name": "TEST", "label": "first"}
+            write_model(path, "name: str\n    label: str", "second")
+            module = importlib.reload(module)
+            assert module.ReloadedTestController.reload(app) == ["test_item"]
+            assert client.get("/test-reloaded/item").json() == {"name": "TEST", "label": "second"}
+            module = importlib.reload(module)
+            assert module.ReloadedTestController.reload(app) == []
+
+    def it_rebuilds_every_route_when_the_module_cannot_be_analysed(reloadable: Tuple[ModuleType, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+        module, path = reloadable
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router())
+        module = reload(module, path)
+
+        def fail(*args: object) -> None:
+            raise RecursionError
+
+        monkeypatch.setattr(reloading, "_fingerprint_class", fail)
+        assert module.ReloadedTestController.reload(app) == ["test_version", "test_unchanged", "test_websocket"]
+
+    def it_removes_routes_that_no_longer_exist(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        write(path, extra=EXTRA_ROUTE)
+        module = importlib.reload(module)
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router())
+        module = reload(module, path)
+        assert module.ReloadedTestController.reload(app) == []
+        assert TestClient(app).get("/test-reloaded/extra").status_code == 404
+
+    def it_lets_requests_in_flight_finish_on_the_previous_version(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        app = FastAPI()
+        app.dependency_overrides[sync_dependency] = lambda: "delay"
+        app.include_router(module.ReloadedTestController.create_router())
+
+        async def run() -> httpx.Response:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                async with app.router.lifespan_context(app):
+                    request = asyncio.ensure_future(client.get("/test-reloaded/version"))
+                    await asyncio.sleep(0.05)
+                    reload(module, path, version="2").ReloadedTestController.reload(app)
+                    assert (await client.get("/test-reloaded/version")).json() == {"version": "2"}
+                    return await request
+
+        assert asyncio.run(run()).json() == {"version": "1"}
+
+    def it_tears_down_reloaded_instances_at_shutdown(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        module = reload(module, path, lifetime="APP")
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router())
+        with TestClient(app) as client:
+            previous = module.ReloadedTestController
+            module = reload(module, path, version="2", lifetime="APP")
+            module.ReloadedTestController.reload(app, previous)
+            assert client.get("/test-reloaded/version").json() == {"version": "2"}
+            scope = module.ReloadedTestController._get_instance_provider()._get_scope(app)
+            assert scope.instance is not None
+        assert scope.instance is None
+        assert module.ReloadedTestController._discover() == []
+
+    def it_updates_the_route_dispatchers(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        app = FastAPI()
+        Controller.include_all(app, [module.ReloadedTestController], dispatch=True)
+        with TestClient(app) as client:
+            module = reload(module, path, version="2")
+            module.ReloadedTestController.reload(app)
+            assert client.get("/test-reloaded/version").json() == {"version": "2"}
+        index = next(index for index, route in enumerate(app.router.routes) if isinstance(route, RouteDispatcher))
+        assert app.router.routes[index].routes == app.router.routes[index + 1 :]  # type: ignore
+
+    def it_requires_a_registered_previous_version(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, _ = reloadable
+        with pytest.raises(ValueError):
+            module.ReloadedTestController.reload(FastAPI())
+
+    def it_rejects_changed_resources(reloadable: Tuple[ModuleType, Path]) -> None:
+        module, path = reloadable
+        app = FastAPI()
+        app.include_router(module.ReloadedTestController.create_router())
+        path.write_text(path.read_text().replace("Resource(open_pool)", "Resource(lambda: None)"))
+        module = importlib.reload(module)
+        with pytest.raises(RuntimeError):
+            module.ReloadedTestController.reload(app)
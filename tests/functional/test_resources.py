@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_controllers import Controller, Resource
+from tests.functional.conftest import AppScopedResourceTestController, Pool, ResourceTestController
+
+
+def describe_resources() -> None:
+    def it_opens_resources_once_at_startup_and_closes_them_at_shutdown(resource_app: FastAPI) -> None:
+        with TestClient(resource_app) as client:
+            assert Pool.opened == 1
+            for _ in range(3):
+                assert client.get("/test-resources").json() == {"pool": "SYNC TEST", "name": "TEST"}
+            assert Pool.closed == 0
+        assert (Pool.opened, Pool.closed) == (1, 1)
+
+    def it_opens_resources_before_app_scoped_instances(resource_app: FastAPI) -> None:
+        with TestClient(resource_app) as client:
+            assert client.get("/test-app-scoped-resources/init").json() == {"message": "SYNC TEST"}
+
+    def it_provides_resources_as_dependencies(resource_app: FastAPI) -> None:
+        with TestClient(resource_app) as client:
+            response = client.get("/test-app-scoped-resources/depends").json()
+            assert response["pool"] == response["self"]
+
+    def it_shares_resources_between_apps(resource_app: FastAPI) -> None:
+        other_app = FastAPI()
+        Controller.include_all(other_app, [ResourceTestController])
+        with TestClient(resource_app), TestClient(other_app) as client:
+            assert client.get("/test-resources").status_code == 200
+            assert Pool.opened == 1
+        assert Pool.closed == 1
+
+    def it_fails_outside_of_the_lifespan(resource_app: FastAPI) -> None:
+        with pytest.raises(RuntimeError, match="Resource 'pool' is not open"):
+            TestClient(resource_app).get("/test-resources")
+
+    def it_returns_the_resource_on_class_access() -> None:
+        assert ResourceTestController.pool is AppScopedResourceTestController.pool
+
+    def it_inherits_resources() -> None:
+        class DerivedController(ResourceTestController):
+            settings = Resource(dict)
+            extra = Resource(dict)
+
+        assert DerivedController._get_resources() == [ResourceTestController.pool, DerivedController.settings, DerivedController.extra]
+
+    def it_does_not_allow_replacing_resources(resource_app: FastAPI) -> None:
+        with TestClient(resource_app):
+            with pytest.raises(AttributeError):
+                ResourceTestController().pool = None
@@ -0,0 +1,32 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def describe_fast_serialization() -> None:
+    def it_serializes_models_with_the_route_options(serialized_test_client: TestClient) -> None:
+        response = serialized_test_client.get("/test-serialized/models")
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [{"id": index, "title": f"item {index}"} for index in range(3)]
+
+    def it_filters_plain_values_through_the_response_model(serialized_test_client: TestClient) -> None:
+        response = serialized_test_client.get("/test-serialized/dicts")
+        assert response.json() == [{"id": 1, "title": "item 1", "note": None}]
+
+    def it_filters_other_models_through_the_response_model(serialized_test_client: TestClient) -> None:
+        response = serialized_test_client.get("/test-serialized/other-models")
+        assert response.json() == {"id": 1, "title": "item 1"}
+
+    def it_preserves_the_status_code_and_headers(serialized_test_client: TestClient) -> None:
+        response = serialized_test_client.post("/test-serialized/status")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["x-test"] == "TEST"
+        assert response.json() == {"value": 1}
+
+    def it_passes_responses_through(serialized_test_client: TestClient) -> None:
+        assert serialized_test_client.get("/test-serialized/response").content == b"TEST"
+
+    def it_keeps_the_response_model_in_the_openapi_schema(serialized_test_client: TestClient) -> None:
+        schema = serialized_test_client.get("/openapi.json").json()
+        content = schema["paths"]["/test-serialized/models"]["get"]["responses"]["200"]["content"]
+        assert content["application/json"]["schema"]["items"] == {"$ref": "#/components/schemas/SerializedItem"}
+        assert "_controller_response" not in str(schema)
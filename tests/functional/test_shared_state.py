@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tests.functional.conftest import SharedStateTestController
+
+
+def describe_shared_state() -> None:
+    def it_shares_cached_responses_between_apps(shared_state_test_client: TestClient) -> None:
+        assert shared_state_test_client.get("/test-shared-state").json() == {"calls": 1}
+        app = FastAPI()
+        app.include_router(SharedStateTestController.create_router())
+        assert TestClient(app).get("/test-shared-state").json() == {"calls": 1}
+
+    def it_invalidates_shared_responses(shared_state_test_client: TestClient) -> None:
+        shared_state_test_client.get("/test-shared-state")
+        shared_state_test_client.post("/test-shared-state")
+        assert shared_state_test_client.get("/test-shared-state").json() == {"calls": 2}
+
+    def it_shares_state_between_processes(shared_state_test_client: TestClient) -> None:
+        assert shared_state_test_client.post("/test-shared-state/visits").json() == {"visits": 1}
+        path = SharedStateTestController.shared_state.path  # type: ignore
+        code = f"from fastapi_controllers import MmapStateBackend; print(MmapStateBackend(path={path!r}, slots=64).incr('visits'))"
+        assert subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True).stdout.strip() == "2"
+        assert shared_state_test_client.post("/test-shared-state/visits").json() == {"visits": 3}
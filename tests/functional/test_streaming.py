@@ -0,0 +1,41 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from tests.functional.conftest import StreamedTestController
+
+
+def describe_streaming() -> None:
+    def it_streams_ndjson(streamed_test_client: TestClient) -> None:
+        response = streamed_test_client.get("/test-streamed/ndjson")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == [{"id": index, "name": f"item-{index}"} for index in range(3)]
+        assert StreamedTestController.closed == 1
+
+    @pytest.mark.parametrize("count,expected", [(0, []), (1, [0]), (3, [0, 1, 2])])
+    def it_streams_json_arrays(streamed_test_client: TestClient, count: int, expected: list) -> None:
+        response = streamed_test_client.get("/test-streamed/json", params={"count": count})
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == expected
+        assert StreamedTestController.closed == 1
+
+    def it_streams_csv(streamed_test_client: TestClient) -> None:
+        response = streamed_test_client.get("/test-streamed/csv")
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines() == ["id,name", "1,first", '2,"second, third"']
+
+    def it_streams_selected_csv_fields(streamed_test_client: TestClient) -> None:
+        assert streamed_test_client.get("/test-streamed/csv-fields").text.splitlines() == ["name", "first"]
+
+    def it_validates_the_items(streamed_test_client: TestClient) -> None:
+        with pytest.raises(ValidationError):
+            streamed_test_client.get("/test-streamed/invalid")
+
+    def it_skips_validation_when_disabled(streamed_test_client: TestClient) -> None:
+        assert streamed_test_client.get("/test-streamed/unvalidated").json() == {"id": "TEST"}
+
+    def it_documents_the_media_type(streamed_test_client: TestClient) -> None:
+        responses = streamed_test_client.app.openapi()["paths"]["/test-streamed/ndjson"]["get"]["responses"]  # type: ignore
+        assert list(responses["200"]["content"]) == ["application/x-ndjson"]
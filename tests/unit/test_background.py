@@ -0,0 +1,164 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from fastapi_controllers.background import BackgroundQueue, BackgroundWorkers
+from fastapi_controllers.definitions import OffloadMode, QueueConfig
+from fastapi_controllers.reloading import _fingerprint
+
+
+def describe_background_workers() -> None:
+    def it_processes_the_items_with_an_async_handler() -> None:
+        processed: List[int] = []
+
+        async def handler(item: int) -> None:
+            processed.append(item)
+
+        async def run() -> BackgroundWorkers:
+            workers = BackgroundWorkers(handler, QueueConfig(), "test")
+            workers.start()
+            for item in range(3):
+                await workers.put(item)
+            await workers.aclose()
+            return workers
+
+        workers = asyncio.run(run())
+        assert processed == [0, 1, 2]
+        assert (workers.processed, workers.failed, workers.dropped) == (3, 0, 0)
+
+    def it_batches_the_queued_items() -> None:
+        batches: List[List[int]] = []
+
+        async def handler(items: List[int]) -> None:
+            batches.append(items)
+
+        async def run() -> None:
+            workers = BackgroundWorkers(handler, QueueConfig(batch_size=4, flush_interval=0.01), "test")
+            for item in range(5):
+                workers.put_nowait(item)
+            workers.start()
+            await workers.aclose()
+
+        asyncio.run(run())
+        assert batches == [[0, 1, 2, 3], [4]]
+
+    def it_waits_for_more_items_within_the_flush_interval() -> None:
+        batches: List[List[int]] = []
+
+        async def handler(items: List[int]) -> None:
+            batches.append(items)
+
+        async def run() -> None:
+            workers = BackgroundWorkers(handler, QueueConfig(batch_size=4, flush_interval=0.05), "test")
+            workers.start()
+            await workers.put(0)
+            await asyncio.sleep(0)
+            await workers.put(1)
+            await workers.aclose()
+
+        asyncio.run(run())
+        assert batches == [[0, 1]]
+
+    def it_applies_backpressure_when_the_queue_is_full() -> None:
+        async def handler(item: int) -> None:
+            await asyncio.sleep(1)
+
+        async def run() -> None:
+            workers = BackgroundWorkers(handler, QueueConfig(max_size=1, put_timeout=0.01, drain_timeout=0), "test")
+            workers.put_nowait(0)
+            with pytest.raises(asyncio.QueueFull):
+                workers.put_nowait(1)
+            with pytest.raises(asyncio.QueueFull):
+                await workers.put(1)
+            await workers.aclose()
+
+        asyncio.run(run())
+
+    def it_rejects_items_once_closed() -> None:
+        async def run() -> None:
+            workers = BackgroundWorkers(print, QueueConfig(), "test")
+            await workers.aclose()
+            with pytest.raises(RuntimeError, match="Background queue 'test' is shutting down"):
+                workers.put_nowait(0)
+            with pytest.raises(RuntimeError, match="Background queue 'test' is shutting down"):
+                await workers.put(0)
+
+        asyncio.run(run())
+
+    def it_drops_the_items_left_after_the_drain_timeout() -> None:
+        async def handler(item: int) -> None:
+            await asyncio.sleep(1)
+
+        async def run() -> BackgroundWorkers:
+            workers = BackgroundWorkers(handler, QueueConfig(drain_timeout=0.01), "test")
+            workers.start()
+            for item in range(3):
+                await workers.put(item)
+            await workers.aclose()
+            return workers
+
+        workers = asyncio.run(run())
+        assert (workers.processed, workers.dropped) == (0, 3)
+
+    def it_reports_the_failures_to_the_event_loop() -> None:
+        contexts: List[Dict[str, Any]] = []
+
+        def handler(items: List[int]) -> None:
+            raise ValueError("failed")
+
+        async def run() -> BackgroundWorkers:
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: contexts.append(context))
+            workers = BackgroundWorkers(handler, QueueConfig(batch_size=2), "test")
+            workers.put_nowait(0)
+            workers.put_nowait(1)
+            workers.start()
+            await workers.aclose()
+            return workers
+
+        workers = asyncio.run(run())
+        assert (workers.processed, workers.failed) == (0, 2)
+        assert contexts[0]["message"] == "Background queue 'test' failed to process 2 item(s)"
+        assert isinstance(contexts[0]["exception"], ValueError)
+
+    @pytest.mark.parametrize(
+        "offload,expected",
+        [
+            (OffloadMode.INLINE, "MainThread"),
+            (OffloadMode.EXECUTOR, "test_0"),
+            (OffloadMode.DEFAULT, "AnyIO worker thread"),
+            ("inline", "MainThread"),
+            ("executor", "test_0"),
+        ],
+    )
+    def it_runs_sync_handlers_according_to_the_offload_mode(offload: OffloadMode, expected: str) -> None:
+        threads: List[str] = []
+
+        def handler(item: int) -> None:
+            threads.append(threading.current_thread().name)
+
+        async def run() -> None:
+            workers = BackgroundWorkers(handler, QueueConfig(offload=offload), "test")
+            workers.start()
+            await workers.put(0)
+            await workers.aclose()
+
+        asyncio.run(run())
+        assert threads == [expected]
+
+
+def describe_background_queue() -> None:
+    def it_names_the_queue_after_the_handler() -> None:
+        def write_entry(entry: str) -> None:
+            ...
+
+        assert BackgroundQueue(write_entry).name == "write_entry"
+        assert BackgroundQueue(write_entry).config == QueueConfig()
+
+    def it_fingerprints_the_handler_and_the_config_for_reloading() -> None:
+        def write_entry(entry: str) -> None:
+            ...
+
+        assert _fingerprint(BackgroundQueue(write_entry)) == _fingerprint(BackgroundQueue(write_entry))
+        assert _fingerprint(BackgroundQueue(write_entry)) != _fingerprint(BackgroundQueue(write_entry, QueueConfig(workers=2)))
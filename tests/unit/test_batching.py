@@ -0,0 +1,42 @@
+import inspect
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from fastapi_controllers.batching import _get_batch_signature, _get_item_type
+
+
+def describe_get_item_type() -> None:
+    @pytest.mark.parametrize(
+        "annotation,expected",
+        [(List[int], int), (Tuple[str, ...], str), (Tuple[int, str], None), (Dict[str, int], None), (int, None), (inspect.Parameter.empty, None)],
+    )
+    def it_unwraps_homogeneous_sequences(annotation: Any, expected: Any) -> None:
+        assert _get_item_type(annotation) == expected
+
+
+def describe_get_batch_signature() -> None:
+    def it_unwraps_the_parameters_and_the_return_annotation() -> None:
+        def endpoint(self: Any, values: List[int], names: Tuple[str, ...] = ()) -> List[Dict[str, int]]:
+            return []
+
+        sig = _get_batch_signature(endpoint)
+        assert [(param.name, param.annotation, param.default) for param in sig.parameters.values()] == [
+            ("self", Any, inspect.Parameter.empty),
+            ("values", int, inspect.Parameter.empty),
+            ("names", str, ()),
+        ]
+        assert sig.return_annotation == Dict[str, int]
+
+    def it_keeps_other_return_annotations() -> None:
+        def endpoint(values: List[int]) -> Any:
+            ...
+
+        assert _get_batch_signature(endpoint).return_annotation is Any
+
+    def it_rejects_parameters_not_annotated_as_lists() -> None:
+        def endpoint(self: Any, value: int) -> List[int]:
+            return []
+
+        with pytest.raises(TypeError, match="Parameter 'value'"):
+            _get_batch_signature(endpoint)
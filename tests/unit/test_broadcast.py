@@ -0,0 +1,144 @@
+import asyncio
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from fastapi_controllers.broadcast import BroadcastHub, Connection, _encode
+from fastapi_controllers.definitions import BroadcastConfig, OverflowPolicy
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False) -> None:
+        self.sent: List[str] = []
+        self.closed: Optional[int] = None
+        self.fail = fail
+        self.application_state = WebSocketState.CONNECTED
+
+    async def send_text(self, data: str) -> None:
+        if self.fail:
+            raise RuntimeError()
+        self.sent.append(data)
+
+    async def close(self, code: int) -> None:
+        self.closed = code
+        self.application_state = WebSocketState.DISCONNECTED
+
+
+def connection(websocket: FakeWebSocket, **kwargs: object) -> Connection:
+    return Connection(websocket, BroadcastConfig(**kwargs))  # type: ignore
+
+
+def describe_Connection() -> None:
+    @pytest.mark.parametrize(
+        "overflow,expected,queued",
+        [
+            (OverflowPolicy.DROP_OLDEST, True, ["2", "3"]),
+            (OverflowPolicy.DROP_NEWEST, False, ["1", "2"]),
+            (OverflowPolicy.DISCONNECT, False, ["1", "2"]),
+        ],
+    )
+    def it_bounds_the_queue(overflow: OverflowPolicy, expected: bool, queued: List[str]) -> None:
+        async def run() -> Connection:
+            conn = connection(FakeWebSocket(), queue_size=2, overflow=overflow)
+            conn.enqueue("1")
+            conn.enqueue("2")
+            assert conn.enqueue("3") is expected
+            return conn
+
+        conn = asyncio.run(run())
+        assert list(conn._queue.values()) == queued
+        assert conn.dropped == 1
+
+    def it_coalesces_messages_with_the_same_key() -> None:
+        async def run() -> Connection:
+            conn = connection(FakeWebSocket(), queue_size=2)
+            conn.enqueue("1", key="a")
+            conn.enqueue("2")
+            assert conn.enqueue("3", key="a") is True
+            return conn
+
+        conn = asyncio.run(run())
+        assert list(conn._queue.values()) == ["3", "2"]
+        assert (conn.pending, conn.dropped) == (2, 0)
+
+    @pytest.mark.parametrize("batch_size,expected", [(1, ["1", "2", "3"]), (2, ["[1,2]", "[3]"])])
+    def it_sends_the_queued_messages(batch_size: int, expected: List[str]) -> None:
+        websocket = FakeWebSocket()
+
+        async def run() -> None:
+            conn = connection(websocket, batch_size=batch_size)
+            for data in ["1", "2", "3"]:
+                conn.enqueue(data)
+            conn.start()
+            await asyncio.sleep(0.01)
+            await conn.stop()
+
+        asyncio.run(run())
+        assert websocket.sent == expected
+
+    def it_closes_overflowing_connections() -> None:
+        websocket = FakeWebSocket()
+
+        async def run() -> Connection:
+            conn = connection(websocket, queue_size=1, overflow=OverflowPolicy.DISCONNECT)
+            conn.enqueue("1")
+            conn.enqueue("2")
+            conn.start()
+            await asyncio.sleep(0.01)
+            return conn
+
+        conn = asyncio.run(run())
+        assert websocket.closed == 1013
+        assert conn.closed
+        assert conn.enqueue("3") is False
+
+    def it_stops_sending_after_errors() -> None:
+        async def run() -> Connection:
+            conn = connection(FakeWebSocket(fail=True))
+            conn.enqueue("1")
+            conn.start()
+            await asyncio.sleep(0.01)
+            return conn
+
+        conn = asyncio.run(run())
+        assert conn.closed
+        assert conn.pending == 0
+
+
+def describe_BroadcastHub() -> None:
+    def it_manages_groups() -> None:
+        async def run() -> None:
+            hub = BroadcastHub()
+            first = hub.connect(MagicMock(), ["a", "b"])
+            second = hub.connect(MagicMock(), ["a"])
+            assert hub.group("a") == {first, second}
+            hub.leave(first, "a")
+            hub.leave(first, "missing")
+            assert hub.group("a") == {second}
+            assert hub.broadcast({"value": 1}, group="b") == 1
+            assert hub.broadcast({"value": 1}) == 2
+            assert hub.send(second, "TEST") is True
+            await hub.disconnect(first)
+            assert hub.group("b") == set()
+            assert hub.connections == {second}
+
+        asyncio.run(run())
+
+    def it_closes_all_connections() -> None:
+        websocket = FakeWebSocket()
+
+        async def run() -> BroadcastHub:
+            async with BroadcastHub() as hub:
+                hub.connect(websocket, ["a"]).start()  # type: ignore
+            return hub
+
+        hub = asyncio.run(run())
+        assert websocket.closed == 1001
+        assert hub.connections == set()
+
+
+def describe_encode() -> None:
+    def it_encodes_compact_json() -> None:
+        assert _encode({"a": [1, "ł"]}) == '{"a":[1,"ł"]}'
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Request, Response, status
+from pytest_mock import MockerFixture
+
+from fastapi_controllers.caching import (
+    CacheInvalidationMiddleware,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    SharedResponseCache,
+    _CacheEntry,
+    _etag_matches,
+    _is_cacheable,
+)
+from fastapi_controllers.definitions import CacheConfig
+from fastapi_controllers.state import MemoryStateBackend
+
+
+class App:
+    ...
+
+
+APP = App()
+OTHER = App()
+
+
+def entry(body: bytes = b"TEST", expires: float = float("inf")) -> _CacheEntry:
+    return _CacheEntry(status_code=200, headers=[], body=body, etag='"TEST"', expires=expires)
+
+
+def request(headers: Optional[Dict[str, str]] = None, query: bytes = b"", app: Any = APP) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/test",
+            "query_string": query,
+            "headers": [(key.encode(), value.encode()) for key, value in (headers or {}).items()],
+            "app": app,
+        }
+    )
+
+
+def describe_ResponseCache() -> None:
+    def it_stores_and_retrieves_entries() -> None:
+        cache = ResponseCache(CacheConfig())
+        cache.set("key", entry())
+        assert cache.get("key") == entry()
+        assert cache.get("missing") is None
+
+    def it_drops_expired_entries(mocker: MockerFixture) -> None:
+        cache = ResponseCache(CacheConfig())
+        cache.set("key", entry(expires=10))
+        mocker.patch("fastapi_controllers.caching.time.monotonic", return_value=10)
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def it_evicts_the_least_recently_used_entries_by_count() -> None:
+        cache = ResponseCache(CacheConfig(max_entries=2))
+        cache.set("first", entry())
+        cache.set("second", entry())
+        cache.get("first")
+        cache.set("third", entry())
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+
+    def it_evicts_the_least_recently_used_entries_by_size() -> None:
+        cache = ResponseCache(CacheConfig(max_bytes=10))
+        cache.set("first", entry(b"12345"))
+        cache.set("second", entry(b"123456"))
+        assert len(cache) == 1
+        assert cache.size == 6
+
+    def it_skips_entries_exceeding_the_size_limit() -> None:
+        cache = ResponseCache(CacheConfig(max_bytes=2))
+        cache.set("key", entry())
+        assert len(cache) == 0
+
+    def it_replaces_entries() -> None:
+        cache = ResponseCache(CacheConfig())
+        cache.set("key", entry(b"1"))
+        cache.set("key", entry(b"22"))
+        assert cache.size == 2
+        cache.clear()
+        assert cache.size == 0
+
+
+def describe_etag_matches() -> None:
+    @pytest.mark.parametrize(
+        "header,expected",
+        [(None, False), ('"OTHER"', False), ('"TEST"', True), ('W/"TEST"', True), ('"OTHER", "TEST"', True), ("*", True)],
+    )
+    def it_matches_the_if_none_match_header(header: Optional[str], expected: bool) -> None:
+        assert _etag_matches(request({"if-none-match": header} if header else None), '"TEST"') is expected
+
+
+def describe_is_cacheable() -> None:
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (Response(b"TEST"), True),
+            (Response(b"TEST", status_code=201), False),
+            (Response(b"TEST", headers={"cache-control": "no-store"}), False),
+            (Response(b"TEST", headers={"cache-control": "private"}), False),
+            (Response(b"TEST", headers={"set-cookie": "a=b"}), False),
+        ],
+    )
+    def it_accepts_successful_public_responses(response: Response, expected: bool) -> None:
+        assert _is_cacheable(response) is expected
+
+
+def describe_ResponseCacheMiddleware() -> None:
+    def it_caches_responses_per_app() -> None:
+        middleware = ResponseCacheMiddleware(CacheConfig())
+        call_next = MagicMock(side_effect=lambda _: asyncio.sleep(0, Response(b"TEST")))
+        asyncio.run(middleware(request(), call_next))
+        asyncio.run(middleware(request(), call_next))
+        asyncio.run(middleware(request(app=OTHER), call_next))
+        assert call_next.call_count == 2
+
+    def it_keeps_existing_etags() -> None:
+        middleware = ResponseCacheMiddleware(CacheConfig())
+        response = asyncio.run(middleware(request(), lambda _: asyncio.sleep(0, Response(b"TEST", headers={"etag": '"CUSTOM"'}))))
+        assert response.headers["etag"] == '"CUSTOM"'
+
+    def it_responds_with_not_modified_on_a_miss_with_a_matching_etag() -> None:
+        middleware = ResponseCacheMiddleware(CacheConfig())
+        response = asyncio.run(middleware(request({"if-none-match": "*"}), lambda _: asyncio.sleep(0, Response(b"TEST"))))
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def it_clears_the_caches() -> None:
+        middleware = ResponseCacheMiddleware(CacheConfig())
+        middleware.get_cache(APP).set("key", entry())
+        middleware.get_cache(OTHER).set("key", entry())
+        middleware.clear(App())
+        middleware.clear(APP)
+        assert middleware.get_cache(APP).get("key") is None
+        assert middleware.get_cache(OTHER).get("key") is not None
+        middleware.clear()
+        assert middleware.get_cache(OTHER).get("key") is None
+
+    def it_shares_the_cache_through_a_state_backend() -> None:
+        state = MemoryStateBackend()
+        middleware = ResponseCacheMiddleware(CacheConfig(), state, "test:")
+        middleware.get_cache(APP).set("key", entry())
+        assert middleware.get_cache(OTHER).get("key") is not None
+        middleware.clear(OTHER)
+        assert middleware.get_cache(APP).get("key") is None
+
+
+def describe_SharedResponseCache() -> None:
+    def it_stores_entries_in_the_state_backend() -> None:
+        state = MemoryStateBackend()
+        cache = SharedResponseCache(CacheConfig(), state, "test:")
+        stored = _CacheEntry(status_code=201, headers=[(b"x-test", b"\xe9")], body=b"\0TEST", etag='"TEST"', expires=time.monotonic() + 10)
+        cache.set("key", stored)
+        loaded = cache.get("key")
+        assert loaded is not None
+        assert (loaded.status_code, loaded.headers, loaded.body, loaded.etag) == (201, [(b"x-test", b"\xe9")], b"\0TEST", '"TEST"')
+        assert state.get("test:'key'") is not None
+        cache.pop("key")
+        assert cache.get("key") is None
+
+    def it_skips_entries_exceeding_the_size_limit() -> None:
+        cache = SharedResponseCache(CacheConfig(max_bytes=2), MemoryStateBackend(), "test:")
+        cache.set("key", entry())
+        assert cache.get("key") is None
+
+
+def describe_CacheInvalidationMiddleware() -> None:
+    @pytest.mark.parametrize("status_code,cleared", [(200, True), (400, False)])
+    def it_invalidates_the_caches_after_successful_requests(status_code: int, cleared: bool) -> None:
+        caches: List[MagicMock] = [MagicMock()]
+        middleware = CacheInvalidationMiddleware(lambda: caches)
+        asyncio.run(middleware(request(), lambda _: asyncio.sleep(0, Response(status_code=status_code))))
+        assert caches[0].clear.called is cleared
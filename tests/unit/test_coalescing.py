@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, List, Optional, Tuple
+
+import pytest
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+
+from fastapi_controllers.coalescing import SingleFlightMiddleware, _copy_response, _get_default_key, _is_shareable
+from fastapi_controllers.definitions import SingleFlightConfig
+
+
+class App:
+    ...
+
+
+APP = App()
+
+
+def request(query: bytes = b"", method: str = "GET", headers: Optional[List[Tuple[bytes, bytes]]] = None) -> Request:
+    return Request({"type": "http", "method": method, "path": "/test", "query_string": query, "headers": headers or [], "app": APP})
+
+
+def describe_get_default_key() -> None:
+    def it_ignores_the_order_of_query_parameters() -> None:
+        assert _get_default_key(request(b"a=1&b=2")) == _get_default_key(request(b"b=2&a=1"))
+
+    def it_distinguishes_request_methods_and_query_parameters() -> None:
+        assert _get_default_key(request(b"a=1")) != _get_default_key(request(b"a=2"))
+        assert _get_default_key(request()) != _get_default_key(request(method="HEAD"))
+
+    def it_distinguishes_credentials() -> None:
+        assert _get_default_key(request(headers=[(b"authorization", b"alice")])) != _get_default_key(request(headers=[(b"authorization", b"bob")]))
+        assert _get_default_key(request(headers=[(b"cookie", b"session=1")])) != _get_default_key(request())
+
+
+def describe_is_shareable() -> None:
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (Response(b"TEST"), True),
+            (Response(b"TEST", background=BackgroundTasks()), False),
+            (StreamingResponse(iter([b"TEST"])), False),
+        ],
+    )
+    def it_accepts_serialized_responses_without_background_tasks(response: Response, expected: bool) -> None:
+        assert _is_shareable(response) is expected
+
+
+def describe_copy_response() -> None:
+    def it_copies_the_response() -> None:
+        response = Response(b"TEST", status_code=201, headers={"x-test": "TEST"})
+        copy = _copy_response(response)
+        assert copy is not response
+        assert (copy.body, copy.status_code, copy.raw_headers) == (response.body, response.status_code, response.raw_headers)
+
+
+def describe_SingleFlightMiddleware() -> None:
+    def it_lets_waiters_run_the_handler_if_the_leader_is_cancelled() -> None:
+        middleware = SingleFlightMiddleware(SingleFlightConfig())
+        calls: List[str] = []
+
+        async def call_next(_: Any) -> Response:
+            calls.append("call")
+            await asyncio.sleep(0.05)
+            return Response(b"TEST")
+
+        async def run() -> Response:
+            leader = asyncio.ensure_future(middleware(request(), call_next))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(middleware(request(), call_next))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await waiter
+
+        assert asyncio.run(run()).body == b"TEST"
+        assert calls == ["call", "call"]
+
+    def it_forgets_finished_requests() -> None:
+        middleware = SingleFlightMiddleware(SingleFlightConfig())
+
+        async def call_next(_: Any) -> Response:
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            asyncio.run(middleware(request(), call_next))
+        assert middleware._get_calls(APP) == {}
@@ -1,13 +1,16 @@
-from typing import Any
+import asyncio
+from typing import Any, List
 from unittest.mock import MagicMock
 
 import pytest
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
 
 from fastapi_controllers.controllers import Controller, _is_route
-from fastapi_controllers.definitions import Route
-from fastapi_controllers.routing import get, websocket
+from fastapi_controllers.definitions import CacheConfig, ControllerLifetime, OffloadMode, RateLimit, Route, ValidationMode
+from fastapi_controllers.instrumentation import MetricsRegistry
+from fastapi_controllers.routing import get, post, websocket
 
 
 @pytest.fixture(autouse=True)
@@ -15,6 +18,13 @@ def validator(mocker: MockerFixture) -> MagicMock:
     return mocker.patch("fastapi_controllers.controllers._validate_against_signature")
 
 
+def _is_event_loop_thread() -> bool:
+    try:
+        return asyncio.get_running_loop() is not None
+    except RuntimeError:
+        return False
+
+
 IS_ROUTE_SCENARIOS = [
     (Route(endpoint="TEST", route_meta="TEST", route_args="TEST", route_kwargs="TEST"), True),  # type: ignore
     (type("NotRoute", (), {}), False),
@@ -62,6 +72,15 @@ def describe_Controller() -> None:
             },
         )
 
+    @pytest.mark.parametrize("mode", ["deferred", "off"])
+    def it_skips_the_validation_on_definition_unless_eager(mocker: MockerFixture, validator: MagicMock, mode: str) -> None:
+        mocker.patch("fastapi_controllers.controllers.get_validation_mode", return_value=ValidationMode(mode))
+
+        class _(Controller):
+            ...
+
+        validator.assert_not_called()
+
     def describe_create_router() -> None:
         def it_creates_an_apirouter() -> None:
             class FakeController(Controller):
@@ -74,8 +93,8 @@ def describe_Controller() -> None:
             result = FakeController.create_router()
             assert isinstance(result, APIRouter)
 
-        def it_replaces_method_signatures(mocker: MockerFixture) -> None:
-            replace = mocker.patch("fastapi_controllers.controllers._replace_signature")
+        def it_binds_the_methods_to_the_controller(mocker: MockerFixture) -> None:
+            bind = mocker.patch("fastapi_controllers.controllers._bind_endpoint")
 
             class FakeController(Controller):
                 prefix = "/test"
@@ -85,7 +104,7 @@ def describe_Controller() -> None:
                     ...
 
             FakeController.create_router()
-            replace.assert_called_once_with(FakeController, FakeController.fake_method.endpoint)
+            bind.assert_called_once_with(FakeController, FakeController.fake_method.endpoint, None)
 
         def it_configures_the_router_and_routes(mocker: MockerFixture) -> None:
             apirouter = mocker.patch("fastapi_controllers.controllers.APIRouter")
@@ -105,11 +124,266 @@ def describe_Controller() -> None:
             apirouter.assert_called_once_with(prefix="/test", dependencies=None, tags=None)
             apirouter.return_value.add_api_route.assert_called_once_with(
                 "/get",
-                FakeController.fake_method.endpoint,
+                FakeController.__bound_endpoints__[FakeController.fake_method.endpoint][1],
                 deprecated=True,
                 methods=["GET"],
             )
             apirouter.return_value.add_api_websocket_route.assert_called_once_with(
                 "/ws",
-                FakeController.fake_ws.endpoint,
+                FakeController.__bound_endpoints__[FakeController.fake_ws.endpoint][1],
             )
+
+        def it_reuses_the_routes_on_subsequent_calls(mocker: MockerFixture) -> None:
+            class FakeController(Controller):
+                prefix = "/test"
+
+                @get("/get")
+                def fake_method(self) -> None:
+                    ...
+
+            first = FakeController.create_router()
+            bind = mocker.patch("fastapi_controllers.controllers._bind_endpoint")
+            second = FakeController.create_router()
+            bind.assert_not_called()
+            assert first is not second
+            assert first.routes == second.routes
+
+        def it_rebinds_the_routes_when_the_instance_dependency_changes() -> None:
+            class FakeController(Controller):
+                instances = 0
+
+                def __init__(self) -> None:
+                    type(self).instances += 1
+
+                @get("/get")
+                def fake_method(self) -> int:
+                    return id(self)
+
+            FakeController.create_router()
+            FakeController.lifetime = ControllerLifetime.APP
+            app = FastAPI()
+            app.include_router(FakeController.create_router())
+            with TestClient(app) as client:
+                assert client.get("/get").json() == client.get("/get").json()
+            assert FakeController.instances == 1
+
+        def it_rebuilds_the_routes_when_the_settings_change() -> None:
+            class FakeController(Controller):
+                @get("/get")
+                def fake_method(self) -> int:
+                    return 1
+
+            def request() -> Response:
+                app = FastAPI()
+                app.include_router(FakeController.create_router())
+                return TestClient(app).get("/get")
+
+            assert "etag" not in request().headers
+            FakeController.response_cache = CacheConfig()
+            assert "etag" in request().headers
+            FakeController.rate_limit = RateLimit(requests=1, period=60)
+            assert request().status_code == 200
+            assert request().status_code == 429
+
+        def it_rebinds_the_routes_when_the_offload_mode_or_metrics_change() -> None:
+            class FakeController(Controller):
+                def __init__(self) -> None:
+                    self.inline = _is_event_loop_thread()
+
+                @get("/get")
+                def fake_method(self) -> bool:
+                    return self.inline
+
+            def request() -> Any:
+                app = FastAPI()
+                app.include_router(FakeController.create_router())
+                return TestClient(app).get("/get").json()
+
+            assert request() is False
+            FakeController.offload = OffloadMode.INLINE
+            FakeController.metrics = MetricsRegistry()
+            assert request() is True
+            assert FakeController.metrics.get(FakeController, "fake_method").to_dict()["construction"]["count"] == 1
+
+        def it_rejects_batching_with_request_scoped_constructor_dependencies() -> None:
+            def get_user() -> str:
+                return "TEST"
+
+            class FakeController(Controller):
+                def __init__(self, user: str = Depends(get_user)) -> None:  # noqa: B008
+                    self.user = user
+
+                @post("/batch", batch=True)
+                async def fake_method(self, values: List[int]) -> List[int]:
+                    return values
+
+            with pytest.raises(TypeError):
+                FakeController.create_router()
+            FakeController.lifetime = ControllerLifetime.APP
+            assert len(FakeController.create_router().routes) == 1
+
+        def it_maintains_separate_route_tables_for_subclasses() -> None:
+            class FakeController(Controller):
+                @get("/get")
+                def fake_method(self) -> None:
+                    ...
+
+            class FakeSubController(FakeController):
+                @get("/other")
+                def fake_method(self) -> None:
+                    ...
+
+            FakeController.create_router()
+            assert [route.route_args for route in FakeController._get_route_table().values()] == [("/get",)]
+            assert [route.route_args for route in FakeSubController._get_route_table().values()] == [("/other",)]
+
+        def it_binds_inherited_methods_to_each_subclass() -> None:
+            class FakeBase(Controller):
+                @get("/get")
+                def fake_method(self) -> None:
+                    ...
+
+            class FakeFirst(FakeBase):
+                ...
+
+            class FakeSecond(FakeBase):
+                ...
+
+            first, second = FakeFirst.create_router(), FakeSecond.create_router()
+            assert first.routes[0].dependant.dependencies[0].call is FakeFirst  # type: ignore
+            assert second.routes[0].dependant.dependencies[0].call is FakeSecond  # type: ignore
+            assert "__signature__" not in vars(FakeBase.fake_method.endpoint)
+
+        def it_keeps_the_declaration_order_of_the_routes() -> None:
+            class FakeMixin:
+                @get("/mixin")
+                def mixin_method(self) -> None:
+                    ...
+
+            class FakeController(Controller):
+                @get("/b")
+                def b_method(self) -> None:
+                    ...
+
+                @get("/a")
+                def a_method(self) -> None:
+                    ...
+
+                @property
+                def failing(self) -> None:
+                    raise AssertionError
+
+            class FakeSubController(FakeMixin, FakeController):
+                a_method = None  # type: ignore
+
+                @get("/b-override")
+                def b_method(self) -> None:
+                    ...
+
+                @get("/c")
+                def c_method(self) -> None:
+                    ...
+
+            assert list(FakeController._get_route_table()) == ["b_method", "a_method"]
+            assert [route.route_args for route in FakeSubController._get_route_table().values()] == [("/b-override",), ("/mixin",), ("/c",)]
+
+        def it_resolves_the_routes_in_method_resolution_order() -> None:
+            class FakeBase(Controller):
+                @get("/base")
+                def fake_method(self) -> None:
+                    ...
+
+            class FakeLeft(FakeBase):
+                ...
+
+            class FakeRight(FakeBase):
+                @get("/right")
+                def fake_method(self) -> None:
+                    ...
+
+            class FakeShadow(FakeBase):
+                fake_method = None  # type: ignore
+
+            class FakeDiamond(FakeLeft, FakeRight):
+                ...
+
+            class FakeShadowedDiamond(FakeShadow, FakeRight):  # type: ignore[misc]
+                ...
+
+            assert FakeDiamond._get_route_table() == {"fake_method": FakeRight.fake_method}
+            assert FakeShadowedDiamond._get_route_table() == {}
+
+        def it_validates_the_parameters_in_the_deferred_mode(mocker: MockerFixture, validator: MagicMock) -> None:
+            mocker.patch("fastapi_controllers.controllers.get_validation_mode", return_value=ValidationMode.DEFERRED)
+
+            class FakeController(Controller):
+                prefix = "/test"
+
+                @get("/get", deprecated=True)
+                def fake_method(self) -> None:
+                    ...
+
+            FakeController.create_router()
+            validator.assert_any_call(APIRouter.__init__, kwargs=FakeController.__router_params__)
+            validator.assert_any_call(APIRouter.get, args=("/get",), kwargs={"deprecated": True})
+
+    def describe_include_all() -> None:
+        def it_discovers_controllers_with_routes() -> None:
+            class FakeBase(Controller):
+                ...
+
+            class FakeAbstract(FakeBase):
+                __abstract__ = True
+
+                @get("/abstract")
+                def fake_method(self) -> None:
+                    ...
+
+            class FakeController(FakeAbstract):
+                ...
+
+            class FakeOtherController(FakeBase):
+                @get("/other")
+                def fake_method(self) -> None:
+                    ...
+
+            assert FakeBase._discover() == [FakeController, FakeOtherController]
+
+        def it_registers_the_routes_directly_on_the_target(mocker: MockerFixture) -> None:
+            class FakeController(Controller):
+                prefix = "/test"
+                tags = ["TEST"]
+
+                @get("/get", deprecated=True)
+                def fake_method(self) -> None:
+                    ...
+
+                @websocket("/ws")
+                def fake_ws(self) -> None:
+                    ...
+
+            router = mocker.MagicMock(spec=APIRouter)
+            Controller.include_all(router, [FakeController])
+            router.add_api_route.assert_called_once_with(
+                "/test/get",
+                FakeController.__bound_endpoints__[FakeController.fake_method.endpoint][1],
+                deprecated=True,
+                tags=["TEST"],
+                methods=["GET"],
+            )
+            router.add_api_websocket_route.assert_called_once_with("/test/ws", FakeController.__bound_endpoints__[FakeController.fake_ws.endpoint][1])
+            router.include_router.assert_not_called()
+
+        def it_includes_controllers_with_unsupported_router_params(mocker: MockerFixture) -> None:
+            class FakeController(Controller):
+                __router_params__ = {"redirect_slashes": False}
+
+                @get("/get")
+                def fake_method(self) -> None:
+                    ...
+
+            create_router = mocker.patch.object(FakeController, "create_router")
+            app = FastAPI()
+            include_router = mocker.patch.object(app.router, "include_router")
+            Controller.include_all(app, [FakeController])
+            include_router.assert_called_once_with(create_router.return_value)
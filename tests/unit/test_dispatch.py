@@ -0,0 +1,79 @@
+from typing import Any
+
+import pytest
+from starlette.routing import Match, NoMatchFound, Route, WebSocketRoute
+
+from fastapi_controllers.dispatch import RouteDispatcher, _get_static_segments
+
+
+def endpoint(*args: Any) -> None:
+    ...
+
+
+def scope(path: str, method: str = "GET", type: str = "http") -> Any:
+    return {"type": type, "path": path, "root_path": "", "method": method}
+
+
+ROUTES = [
+    Route("/users/me", endpoint, methods=["GET"], name="me"),
+    Route("/users/{user_id}", endpoint, methods=["GET"], name="user"),
+    Route("/users", endpoint, methods=["POST"], name="users"),
+    Route("/files/{path:path}", endpoint, name="files"),
+    Route("/{page}", endpoint, name="page"),
+    WebSocketRoute("/users/ws", endpoint, name="ws"),
+]
+
+
+def describe_get_static_segments() -> None:
+    @pytest.mark.parametrize(
+        "path,expected",
+        [("/users/me", ["", "users", "me"]), ("/users/{user_id}/items", ["", "users"]), ("/item-{id}", [""]), ("/", ["", ""])],
+    )
+    def it_stops_at_the_first_path_parameter(path: str, expected: Any) -> None:
+        assert _get_static_segments(path) == expected
+
+
+def describe_RouteDispatcher() -> None:
+    def it_only_tests_the_routes_matching_the_static_prefix() -> None:
+        dispatcher = RouteDispatcher(ROUTES)
+        assert dispatcher._get_candidates("/users/me") == [0, 1, 2, 4]
+        assert dispatcher._get_candidates("/users/ws") == [1, 2, 4, 5]
+        assert dispatcher._get_candidates("/files/a/b") == [3, 4]
+        assert dispatcher._get_candidates("/other") == [4]
+
+    def it_matches_the_first_route_in_registration_order() -> None:
+        dispatcher = RouteDispatcher(ROUTES)
+        match, child_scope = dispatcher.matches(scope("/users/me"))
+        assert match is Match.FULL
+        assert child_scope["fastapi_controllers.route"] is ROUTES[0]
+        match, child_scope = dispatcher.matches(scope("/users/1"))
+        assert child_scope["path_params"] == {"user_id": "1"}
+        assert dispatcher.matches(scope("/users/ws", type="websocket"))[1]["fastapi_controllers.route"] is ROUTES[5]
+
+    def it_keeps_the_routes_from_matching_on_their_own() -> None:
+        route = Route("/users/me", endpoint, methods=["GET"])
+        dispatcher = RouteDispatcher([route])
+        assert route.matches(scope("/users/me")) == (Match.NONE, {})
+        assert dispatcher.matches(scope("/users/me"))[0] is Match.FULL
+
+    def it_reports_partial_matches() -> None:
+        match, child_scope = RouteDispatcher(ROUTES[:3]).matches(scope("/users", method="GET"))
+        assert match is Match.PARTIAL
+        assert child_scope["fastapi_controllers.route"] is ROUTES[2]
+        assert RouteDispatcher(ROUTES).matches(scope("/users", method="GET"))[1]["fastapi_controllers.route"] is ROUTES[4]
+
+    def it_ignores_unmatched_and_lifespan_scopes() -> None:
+        dispatcher = RouteDispatcher(ROUTES[:3])
+        assert dispatcher.matches(scope("/other")) == (Match.NONE, {})
+        assert dispatcher.matches({"type": "lifespan"}) == (Match.NONE, {})
+
+    def it_rebuilds_the_trie_when_the_routes_are_replaced() -> None:
+        dispatcher = RouteDispatcher(ROUTES[:1])
+        dispatcher.routes = ROUTES[1:2]
+        assert dispatcher.matches(scope("/users/me"))[1]["fastapi_controllers.route"] is ROUTES[1]
+
+    def it_reverses_the_routes() -> None:
+        dispatcher = RouteDispatcher(ROUTES)
+        assert dispatcher.url_path_for("user", user_id="1") == "/users/1"
+        with pytest.raises(NoMatchFound):
+            dispatcher.url_path_for("unknown")
@@ -1,10 +1,18 @@
+import asyncio
 import inspect
 from typing import Any
 
 import pytest
 from fastapi import params
 
-from fastapi_controllers.helpers import _replace_signature, _validate_against_signature
+from fastapi_controllers.helpers import (
+    _bind_endpoint,
+    _clone_endpoint,
+    _get_binding_signature,
+    _merge_router_params,
+    _replace_signature,
+    _validate_against_signature,
+)
 
 
 class Fake:
@@ -12,6 +20,14 @@ class Fake:
         ...
 
 
+def describe_get_binding_signature() -> None:
+    def it_drops_the_first_parameter() -> None:
+        assert list(_get_binding_signature(Fake.fake_method).parameters) == ["positional", "keyword"]
+
+    def it_computes_the_signature_once() -> None:
+        assert _get_binding_signature(Fake.fake_method) is _get_binding_signature(Fake.fake_method)
+
+
 def describe_validate_against_signature() -> None:
     def it_validates_method_parameters_against_the_desired_signature() -> None:
         _validate_against_signature(
@@ -69,3 +85,82 @@ def describe_replace_signature() -> None:
         assert replaced_params[1].kind == inspect.Parameter.KEYWORD_ONLY
         assert replaced_params[2].name == "keyword"
         assert replaced_params[2].kind == inspect.Parameter.KEYWORD_ONLY
+
+
+def describe_bind_endpoint() -> None:
+    def it_binds_a_copy_of_the_method() -> None:
+        class Test:
+            async def test(self, value: int = 1) -> int:
+                return value
+
+        endpoint = _bind_endpoint(Test, Test.test, "TEST")  # type: ignore
+        assert endpoint is not Test.test
+        assert inspect.iscoroutinefunction(endpoint)
+        assert inspect.signature(endpoint).parameters["self"].default.dependency == "TEST"
+        assert "__signature__" not in vars(Test.test)
+        assert asyncio.run(endpoint(None, value=2)) == 2
+
+    def it_binds_a_clone_of_other_callables() -> None:
+        class Test:
+            def __call__(self, value: int) -> int:
+                return value
+
+        callable_ = Test()
+        endpoint = _bind_endpoint(Test, callable_)
+        assert endpoint is not callable_
+        assert not hasattr(callable_, "__signature__")
+
+
+def describe_merge_router_params() -> None:
+    def it_folds_the_router_params_into_the_route_params() -> None:
+        merged = _merge_router_params(
+            {"tags": ["route"], "dependencies": ["route"], "responses": {404: {}}},
+            {
+                "tags": ["router"],
+                "dependencies": ["router"],
+                "responses": {500: {}},
+                "callbacks": ["router"],
+                "deprecated": True,
+                "include_in_schema": False,
+                "default_response_class": "TEST",
+                "generate_unique_id_function": "TEST",
+            },
+        )
+        assert merged == {
+            "tags": ["router", "route"],
+            "dependencies": ["router", "route"],
+            "responses": {500: {}, 404: {}},
+            "callbacks": ["router"],
+            "deprecated": True,
+            "include_in_schema": False,
+            "response_class": "TEST",
+            "generate_unique_id_function": "TEST",
+        }
+
+    def it_keeps_the_route_params_taking_precedence() -> None:
+        merged = _merge_router_params({"response_class": "ROUTE"}, {"default_response_class": "ROUTER", "tags": None})
+        assert merged == {"response_class": "ROUTE"}
+
+    def it_only_folds_dependencies_into_websocket_routes() -> None:
+        merged = _merge_router_params({}, {"tags": ["router"], "dependencies": ["router"]}, websocket=True)
+        assert merged == {"dependencies": ["router"]}
+
+
+def describe_clone_endpoint() -> None:
+    def it_clones_sync_endpoints() -> None:
+        def endpoint(value: int) -> int:
+            return value
+
+        clone = _clone_endpoint(endpoint)
+        assert clone is not endpoint
+        assert not inspect.iscoroutinefunction(clone)
+        assert clone(value=1) == 1
+        assert clone.__name__ == "endpoint"
+
+    def it_clones_async_endpoints() -> None:
+        async def endpoint(value: int) -> int:
+            return value
+
+        clone = _clone_endpoint(endpoint)
+        assert inspect.iscoroutinefunction(clone)
+        assert asyncio.run(clone(value=1)) == 1
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from fastapi_controllers.definitions import IdempotencyConfig
+from fastapi_controllers.idempotency import IdempotencyMiddleware, _dump_response, _get_fingerprint, _is_storable, _load_response
+from fastapi_controllers.state import MemoryStateBackend
+
+
+class App:
+    ...
+
+
+APP = App()
+
+
+def request(body: bytes = b"", key: str = "KEY", app: Any = APP, query: bytes = b"", authorization: str = "") -> Request:
+    async def receive() -> Any:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    headers = [(b"idempotency-key", key.encode())] + ([(b"authorization", authorization.encode())] if authorization else [])
+    scope = {"type": "http", "method": "POST", "path": "/test", "query_string": query, "headers": headers, "app": app}
+    return Request(scope, receive)
+
+
+def describe_get_fingerprint() -> None:
+    def it_distinguishes_the_bodies_and_query_parameters_of_requests() -> None:
+        fingerprints = [asyncio.run(_get_fingerprint(req)) for req in [request(b"A"), request(b"A"), request(b"B"), request(b"A", query=b"a=1")]]
+        assert fingerprints[0] == fingerprints[1]
+        assert len(set(fingerprints)) == 3
+
+
+def describe_dump_response() -> None:
+    def it_restores_the_response_marked_as_replayed() -> None:
+        response = Response(b"TEST", status_code=201, headers={"x-test": "TEST"})
+        fingerprint, restored = _load_response(_dump_response("FINGERPRINT", response))
+        assert fingerprint == "FINGERPRINT"
+        assert (restored.body, restored.status_code, restored.headers["x-test"]) == (b"TEST", 201, "TEST")
+        assert restored.headers["idempotent-replayed"] == "true"
+
+
+def describe_is_storable() -> None:
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (Response(b"TEST"), True),
+            (Response(b"TEST", status_code=422), True),
+            (Response(b"TEST", status_code=500), False),
+            (Response(b"TOO LONG"), False),
+            (StreamingResponse(iter([b"TEST"])), False),
+        ],
+    )
+    def it_accepts_serialized_responses_other_than_server_errors(response: Response, expected: bool) -> None:
+        assert _is_storable(response, max_bytes=4) is expected
+
+
+def describe_IdempotencyMiddleware() -> None:
+    def it_shares_the_responses_through_a_state_backend() -> None:
+        state = MemoryStateBackend()
+        middleware = IdempotencyMiddleware(IdempotencyConfig(), state, namespace="test:")
+        calls: List[str] = []
+
+        async def call_next(_: Any) -> Response:
+            calls.append("call")
+            return Response(b"TEST")
+
+        responses = [asyncio.run(middleware(request(app=App()), call_next)) for _ in range(2)]
+        assert [response.body for response in responses] == [b"TEST"] * 2
+        assert calls == ["call"]
+        assert middleware.get_store(App()) is state
+        assert state.get(middleware._get_key(request(), "KEY")) is not None
+
+    def it_scopes_the_keys_by_credentials() -> None:
+        middleware = IdempotencyMiddleware(IdempotencyConfig(), namespace="test:")
+        calls: List[str] = []
+
+        async def call_next(req: Request) -> Response:
+            calls.append(req.headers.get("authorization", ""))
+            return Response(b"TEST")
+
+        for authorization in ["Bearer alice", "Bearer bob", "", "Bearer alice"]:
+            asyncio.run(middleware(request(authorization=authorization), call_next))
+        assert calls == ["Bearer alice", "Bearer bob", ""]
+        keys = {middleware._get_key(request(authorization=authorization), "KEY") for authorization in ["Bearer alice", "Bearer bob", ""]}
+        assert len(keys) == 3
+        assert all(key.startswith("test:") and key.endswith(":KEY") and "alice" not in key for key in keys)
+
+    def it_keeps_the_responses_of_applications_apart() -> None:
+        middleware = IdempotencyMiddleware(IdempotencyConfig())
+        calls: List[str] = []
+
+        async def call_next(_: Any) -> Response:
+            calls.append("call")
+            return Response(b"TEST")
+
+        for app in [App(), App()]:
+            asyncio.run(middleware(request(app=app), call_next))
+        assert calls == ["call", "call"]
+
+    def it_rejects_requests_while_another_process_holds_the_key() -> None:
+        state = MemoryStateBackend()
+        middleware = IdempotencyMiddleware(IdempotencyConfig(timeout=0.01), state)
+
+        async def call_next(_: Any) -> Response:
+            raise AssertionError
+
+        async def run() -> None:
+            async with state.lock(middleware._get_key(request(), "KEY")):
+                await middleware(request(), call_next)
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(run())
+        assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+
+    def it_propagates_timeouts_of_the_handler() -> None:
+        middleware = IdempotencyMiddleware(IdempotencyConfig())
+
+        async def call_next(_: Any) -> Response:
+            raise TimeoutError()
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(middleware(request(), call_next))
+
+    def it_lets_waiters_run_the_request_if_the_first_one_failed() -> None:
+        middleware = IdempotencyMiddleware(IdempotencyConfig())
+        calls: List[str] = []
+
+        async def call_next(_: Any) -> Response:
+            calls.append("call")
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise ValueError()
+            return Response(b"TEST")
+
+        async def run() -> List[Any]:
+            return await asyncio.gather(*[middleware(request(), call_next) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert isinstance(results[0], ValueError)
+        assert [result.body for result in results[1:]] == [b"TEST"] * 2
+        assert calls == ["call", "call"]
@@ -0,0 +1,94 @@
+import asyncio
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from fastapi_controllers.instrumentation import (
+    Histogram,
+    JSONExporter,
+    MetricsRegistry,
+    RouteMetrics,
+    TextExporter,
+    _instrument_constructor,
+    _timed,
+)
+
+
+class ExampleController:
+    def __init__(self, value: int = 0) -> None:
+        self.value = value
+
+
+def describe_Histogram() -> None:
+    def it_summarizes_the_observed_values() -> None:
+        histogram = Histogram(bounds=[1, 2, 4, 8])
+        for value in [0.5, 1.5, 3, 3, 6, 10]:
+            histogram.observe(value)
+        summary = histogram.to_dict()
+        assert summary["count"] == 6
+        assert summary["mean"] == pytest.approx(4)
+        assert (summary["min"], summary["max"]) == (0.5, 10)
+        assert summary["p50"] == 4
+        assert summary["p99"] == 10
+
+    def it_caps_percentiles_at_the_maximum() -> None:
+        histogram = Histogram(bounds=[1, 2])
+        histogram.observe(0.5)
+        assert histogram.percentile(50) == 0.5
+
+    def it_handles_empty_histograms() -> None:
+        assert Histogram().to_dict() == {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0}
+
+
+def describe_MetricsRegistry() -> None:
+    def it_keys_metrics_by_controller_and_route() -> None:
+        registry = MetricsRegistry()
+        assert registry.get(ExampleController, "test") is registry.get(ExampleController, "test")
+        assert registry.get(ExampleController, "test") is not registry.get(ExampleController, "other")
+        assert list(registry.snapshot()) == ["ExampleController.test", "ExampleController.other"]
+
+    def it_resets_metrics_in_place() -> None:
+        registry = MetricsRegistry()
+        metrics = registry.get(ExampleController, "test")
+        metrics.histograms["total"].observe(1)
+        registry.reset()
+        assert registry.get(ExampleController, "test") is metrics
+        assert registry.snapshot()["ExampleController.test"]["requests"] == 0
+
+    def it_exports_snapshots() -> None:
+        stream = io.StringIO()
+        registry = MetricsRegistry(JSONExporter(stream=stream))
+        registry.get(ExampleController, "test").histograms["total"].observe(1)
+        registry.export()
+        assert json.loads(stream.getvalue())["ExampleController.test"]["total"]["count"] == 1
+
+
+def describe_exporters() -> None:
+    def it_writes_text_tables() -> None:
+        stream = io.StringIO()
+        TextExporter(stream).export({"ExampleController.test": RouteMetrics().to_dict()})
+        header, row = stream.getvalue().splitlines()
+        assert header.startswith("route")
+        assert row.startswith("ExampleController.test")
+
+    def it_writes_json_files(tmp_path: Path) -> None:
+        path = tmp_path / "metrics.json"
+        JSONExporter(str(path)).export({"ExampleController.test": RouteMetrics().to_dict()})
+        assert json.loads(path.read_text())["ExampleController.test"]["requests"] == 0
+
+
+def describe_timed() -> None:
+    def it_calls_through_outside_of_requests() -> None:
+        async def async_func(value: int) -> int:
+            return value
+
+        assert _timed(lambda value: value, "handler")(value=1) == 1
+        assert asyncio.run(_timed(async_func, "handler")(value=1)) == 1
+
+    def it_creates_constructor_dependencies_with_the_signature_of_the_class() -> None:
+        constructor = _instrument_constructor(ExampleController)
+        assert constructor(value=1).value == 1
+        assert list(constructor.__signature__.parameters) == ["value"]  # type: ignore
+        assert constructor.__signature__.return_annotation is ExampleController  # type: ignore
@@ -0,0 +1,133 @@
+import asyncio
+import os
+from contextlib import AsyncExitStack
+from typing import Any, Iterator, List
+
+import pytest
+from fastapi import Depends
+from pytest_mock import MockerFixture
+from typing_extensions import Annotated
+
+from fastapi_controllers.definitions import ControllerLifetime
+from fastapi_controllers.lifetime import _chain_lifespans, _InstanceProvider, _InstanceScope, _solve
+
+
+def sync_dependency() -> str:
+    return "SYNC"
+
+
+async def async_dependency() -> str:
+    return "ASYNC"
+
+
+teardowns: List[str] = []
+
+
+def generator_dependency() -> Iterator[str]:
+    yield "GENERATOR"
+    teardowns.append("GENERATOR")
+
+
+class Fake:
+    def __init__(
+        self,
+        sync: str = Depends(sync_dependency),  # noqa: B008
+        asynchronous: Annotated[str, Depends(async_dependency)] = "",
+        generator: str = Depends(generator_dependency),  # noqa: B008
+        plain: str = "PLAIN",
+    ) -> None:
+        self.values = (sync, asynchronous, generator, plain)
+
+
+class Settings:
+    def __init__(self, sync: "Annotated[str, Depends(sync_dependency)]") -> None:
+        self.sync = sync
+
+
+class Postponed:
+    # the annotations as stored with `from __future__ import annotations`
+    def __init__(self, asynchronous: "Annotated[str, Depends(async_dependency)]", settings: "Settings" = Depends()) -> None:  # noqa: B008
+        self.values = (asynchronous, settings.sync)
+
+
+class RequestBound:
+    def __init__(self, query: str) -> None:
+        ...
+
+
+def solve(call: Any, **overrides: Any) -> Any:
+    async def _run() -> Any:
+        async with AsyncExitStack() as stack:
+            return await _solve(call, stack=stack, overrides=overrides.get("overrides", {}), cache={})
+
+    return asyncio.run(_run())
+
+
+def describe_solve() -> None:
+    def it_resolves_sync_async_and_generator_dependencies() -> None:
+        teardowns.clear()
+        assert solve(Fake).values == ("SYNC", "ASYNC", "GENERATOR", "PLAIN")
+        assert teardowns == ["GENERATOR"]
+
+    def it_honors_dependency_overrides() -> None:
+        assert solve(Fake, overrides={sync_dependency: lambda: "OVERRIDE"}).values[0] == "OVERRIDE"
+
+    def it_resolves_postponed_annotations() -> None:
+        assert solve(Postponed).values == ("ASYNC", "SYNC")
+
+    def it_rejects_request_bound_parameters() -> None:
+        with pytest.raises(TypeError):
+            solve(RequestBound)
+
+
+def describe_InstanceScope() -> None:
+    def it_builds_the_instance_once() -> None:
+        async def _run() -> None:
+            scope = _InstanceScope()
+            instances = await asyncio.gather(*(scope.get(Fake, {}) for _ in range(5)))
+            assert len({id(instance) for instance in instances}) == 1
+            await scope.aclose()
+            assert scope.instance is None
+
+        asyncio.run(_run())
+
+
+def describe_InstanceProvider() -> None:
+    def it_scopes_instances_per_app() -> None:
+        provider = _InstanceProvider(Fake, ControllerLifetime.APP)
+        first, second = type("App", (), {})(), type("App", (), {})()
+        assert provider._get_scope(first) is provider._get_scope(first)
+        assert provider._get_scope(first) is not provider._get_scope(second)
+
+    def it_scopes_instances_per_worker(mocker: MockerFixture) -> None:
+        provider = _InstanceProvider(Fake, ControllerLifetime.WORKER)
+        scope = provider._get_scope(object())
+        assert provider._get_scope(object()) is scope
+        mocker.patch("fastapi_controllers.lifetime.os.getpid", return_value=os.getpid() + 1)
+        assert provider._get_scope(object()) is not scope
+
+
+def describe_chain_lifespans() -> None:
+    def it_runs_the_inner_lifespan_within_the_outer_one() -> None:
+        calls = []
+
+        def make(name: str) -> Any:
+            class _Lifespan:
+                def __init__(self, app: Any) -> None:
+                    ...
+
+                async def __aenter__(self) -> str:
+                    calls.append(f"enter {name}")
+                    return name
+
+                async def __aexit__(self, *args: Any) -> None:
+                    calls.append(f"exit {name}")
+
+            return _Lifespan
+
+        async def _run() -> None:
+            async with _chain_lifespans(make("outer"), make("inner"))(None) as state:
+                assert state == "outer"
+
+        asyncio.run(_run())
+        assert calls == ["enter outer", "enter inner", "exit inner", "exit outer"]
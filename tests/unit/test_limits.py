@@ -0,0 +1,192 @@
+import asyncio
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException, Response
+
+from fastapi_controllers.definitions import ConcurrencyLimit, RateLimit
+from fastapi_controllers.limits import (
+    ConcurrencyLimiter,
+    ConcurrencyLimitMiddleware,
+    MemoryRateLimitBackend,
+    RateLimiter,
+    StateRateLimitBackend,
+    _get_client_key,
+    _take,
+)
+from fastapi_controllers.state import MemoryStateBackend
+
+
+def describe_ConcurrencyLimiter() -> None:
+    def it_admits_queued_requests_in_order() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=2))
+        admitted: List[int] = []
+
+        async def request(index: int) -> None:
+            assert await limiter.acquire()
+            admitted.append(index)
+            await asyncio.sleep(0.01)
+            limiter.release()
+
+        async def run() -> None:
+            await asyncio.gather(*[request(index) for index in range(3)])
+
+        asyncio.run(run())
+        assert admitted == [0, 1, 2]
+        assert (limiter.in_flight, limiter.waiting, limiter.rejected) == (0, 0, 0)
+
+    def it_rejects_requests_exceeding_the_queue() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1))
+
+        async def run() -> bool:
+            await limiter.acquire()
+            return await limiter.acquire()
+
+        assert asyncio.run(run()) is False
+        assert limiter.rejected == 1
+
+    def it_removes_cancelled_requests_from_the_queue() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=1))
+
+        async def run() -> None:
+            await limiter.acquire()
+            task = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            assert limiter.waiting == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert limiter.waiting == 0
+            limiter.release()
+
+        asyncio.run(run())
+        assert limiter.in_flight == 0
+
+    def it_passes_on_slots_handed_to_cancelled_requests() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=1))
+
+        async def run() -> None:
+            await limiter.acquire()
+            task = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            limiter.release()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert (limiter.in_flight, limiter.waiting) == (0, 0)
+
+
+def describe_ConcurrencyLimitMiddleware() -> None:
+    def it_releases_the_slot_after_the_request() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=1))
+        middleware = ConcurrencyLimitMiddleware(limiter)
+        response = Response()
+        call_next = AsyncMock(return_value=response)
+        assert asyncio.run(middleware(MagicMock(), call_next)) is response
+        assert limiter.in_flight == 0
+
+    def it_raises_for_rejected_requests() -> None:
+        limiter = ConcurrencyLimiter(ConcurrencyLimit(max_concurrency=0, status_code=429))
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(ConcurrencyLimitMiddleware(limiter)(MagicMock(), AsyncMock()))
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers is None
+
+
+def describe_take() -> None:
+    def it_allows_a_burst_and_refills_at_the_rate() -> None:
+        limit = RateLimit(requests=2, period=1)
+        tat, wait = _take(0, 10, limit)
+        assert (tat, wait) == (10.5, 0)
+        tat, wait = _take(tat, 10, limit)
+        assert (tat, wait) == (11, 0)
+        assert _take(tat, 10, limit) == (11, 0.5)
+        assert _take(tat, 10.5, limit) == (11.5, 0)
+
+    def it_takes_the_cost_of_the_request_from_the_burst() -> None:
+        limit = RateLimit(requests=1, period=1, burst=3, cost=2)
+        tat, wait = _take(0, 0, limit)
+        assert (tat, wait) == (2, 0)
+        assert _take(tat, 0, limit) == (2, 1)
+
+
+def describe_MemoryRateLimitBackend() -> None:
+    def it_drops_full_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+        backend = MemoryRateLimitBackend()
+        limit = RateLimit(requests=1, period=1)
+        monkeypatch.setattr("fastapi_controllers.limits.time.monotonic", lambda: 0.0)
+        assert backend.acquire("a", limit) == 0
+        assert backend.acquire("a", limit) == 1
+        assert len(backend) == 1
+        monkeypatch.setattr("fastapi_controllers.limits.time.monotonic", lambda: 1.0)
+        assert backend.acquire("b", RateLimit(requests=1, period=10)) == 0
+        assert len(backend) == 1
+
+    def it_evicts_the_least_recently_used_buckets() -> None:
+        backend = MemoryRateLimitBackend(max_entries=2)
+        limit = RateLimit(requests=1, period=60)
+        for key in ["a", "b", "a", "c"]:
+            backend.acquire(key, limit)
+        assert len(backend) == 2
+        assert backend.acquire("b", limit) == 0
+        assert backend.acquire("c", limit) > 0
+
+
+def describe_StateRateLimitBackend() -> None:
+    def it_shares_the_buckets_through_the_state() -> None:
+        state = MemoryStateBackend()
+        limit = RateLimit(requests=1, period=60)
+        assert StateRateLimitBackend(state).acquire("a", limit) == 0
+        assert StateRateLimitBackend(state).acquire("a", limit) > 0
+        assert state.get("a") is not None
+
+    def it_retries_concurrent_updates() -> None:
+        state = MemoryStateBackend()
+        limit = RateLimit(requests=2, period=60)
+        backend = StateRateLimitBackend(state)
+        backend.acquire("a", limit)
+        delete = state.delete
+        calls: List[str] = []
+
+        def racing_delete(key: str, value: Optional[bytes] = None) -> bool:
+            if not calls:
+                calls.append(key)
+                return False
+            return delete(key, value)
+
+        state.delete = racing_delete  # type: ignore
+        assert backend.acquire("a", limit) == 0
+        assert calls == ["a"]
+
+    def it_rejects_requests_after_too_many_conflicts() -> None:
+        state = MagicMock(get=MagicMock(return_value=b"0"), delete=MagicMock(return_value=False))
+        assert StateRateLimitBackend(state).acquire("a", RateLimit(requests=4, period=1)) == 0.25
+
+
+def describe_get_client_key() -> None:
+    def it_falls_back_to_the_client_address() -> None:
+        limit = RateLimit(requests=1, header="x-api-key")
+        assert _get_client_key(MagicMock(headers={"x-api-key": "A"}), limit) == "header:A"
+        assert _get_client_key(MagicMock(headers={}, client=MagicMock(host="127.0.0.1")), limit) == "ip:127.0.0.1"
+        assert _get_client_key(MagicMock(headers={}, client=None), limit) == "ip:"
+
+
+def describe_RateLimiter() -> None:
+    def it_raises_for_rejected_requests() -> None:
+        limiter = RateLimiter(RateLimit(requests=1, period=2.5, key=lambda request: "client"), MemoryRateLimitBackend(), "test:")
+        response = Response()
+        assert asyncio.run(limiter(MagicMock(), AsyncMock(return_value=response))) is response
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(limiter(MagicMock(), AsyncMock()))
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"retry-after": "3"}
+        assert limiter.rejected == 1
+
+    def it_namespaces_the_buckets() -> None:
+        backend = MagicMock(acquire=MagicMock(return_value=0))
+        limit = RateLimit(requests=1, key=lambda request: "client")
+        assert RateLimiter(limit, backend, "test:").check(MagicMock()) is None
+        backend.acquire.assert_called_once_with("test:client", limit)
@@ -0,0 +1,62 @@
+from typing import Any, List
+
+from fastapi import FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from fastapi_controllers.middleware import ControllerRoute, RequestHandler, _get_route_class, _get_route_middleware, _set_route_middleware
+
+
+class CustomRoute(APIRoute):
+    ...
+
+
+class CustomControllerRoute(ControllerRoute):
+    ...
+
+
+def describe_route_middleware() -> None:
+    def it_attaches_middleware_to_endpoints() -> None:
+        def endpoint() -> None:
+            ...
+
+        assert _get_route_middleware(endpoint) == ()
+        _set_route_middleware(endpoint, ["TEST"])  # type: ignore
+        assert _get_route_middleware(endpoint) == ("TEST",)
+
+
+def describe_ControllerRoute() -> None:
+    def it_runs_the_middleware_in_order() -> None:
+        calls: List[str] = []
+
+        def make(name: str) -> Any:
+            async def middleware(request: Request, call_next: RequestHandler) -> Response:
+                calls.append(f"before {name}")
+                response = await call_next(request)
+                calls.append(f"after {name}")
+                return response
+
+            return middleware
+
+        async def endpoint() -> Response:
+            calls.append("endpoint")
+            return Response()
+
+        _set_route_middleware(endpoint, [make("outer"), make("inner")])
+        app = FastAPI()
+        app.router.add_api_route("/test", endpoint, route_class_override=ControllerRoute)
+        TestClient(app).get("/test")
+        assert calls == ["before outer", "before inner", "endpoint", "after inner", "after outer"]
+
+
+def describe_get_route_class() -> None:
+    def it_uses_the_controller_route_by_default() -> None:
+        assert _get_route_class() is ControllerRoute
+        assert _get_route_class(APIRoute) is ControllerRoute
+        assert _get_route_class(CustomControllerRoute) is CustomControllerRoute
+
+    def it_combines_the_controller_route_with_custom_route_classes() -> None:
+        route_class = _get_route_class(CustomRoute)
+        assert issubclass(route_class, ControllerRoute)
+        assert issubclass(route_class, CustomRoute)
+        assert _get_route_class(CustomRoute) is route_class
@@ -0,0 +1,71 @@
+import asyncio
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from pytest_mock import MockerFixture
+
+from fastapi_controllers.definitions import OffloadMode
+from fastapi_controllers.offload import _get_executor, _offload_constructor, _offload_endpoint
+
+
+class Fake:
+    def __init__(self, value: "int" = 1) -> None:
+        self.thread = threading.current_thread().name
+
+
+def fake_endpoint(value: "int") -> str:
+    return threading.current_thread().name
+
+
+async def fake_async_endpoint(value: int) -> None:
+    ...
+
+
+def executor() -> ThreadPoolExecutor:
+    return _get_executor(Fake, 1)
+
+
+def describe_get_executor() -> None:
+    def it_creates_one_executor_per_class() -> None:
+        assert _get_executor(Fake) is _get_executor(Fake)
+        assert _get_executor(Fake) is not _get_executor(type("Other", (), {}))
+
+    def it_creates_a_new_executor_after_fork(mocker: MockerFixture) -> None:
+        current = _get_executor(Fake)
+        mocker.patch("fastapi_controllers.offload.os.getpid", return_value=os.getpid() + 1)
+        assert _get_executor(Fake) is not current
+
+
+def describe_offload_endpoint() -> None:
+    def it_leaves_default_and_async_endpoints_unchanged() -> None:
+        assert _offload_endpoint(fake_endpoint, OffloadMode.DEFAULT, executor) is fake_endpoint
+        assert _offload_endpoint(fake_async_endpoint, OffloadMode.INLINE, executor) is fake_async_endpoint
+
+    def it_runs_inline_endpoints_on_the_calling_thread() -> None:
+        endpoint = _offload_endpoint(fake_endpoint, OffloadMode.INLINE, executor)
+        assert inspect.iscoroutinefunction(endpoint)
+        assert asyncio.run(endpoint(value=1)) == threading.current_thread().name
+
+    def it_runs_executor_endpoints_in_the_dedicated_executor() -> None:
+        endpoint = _offload_endpoint(fake_endpoint, OffloadMode.EXECUTOR, executor)
+        assert asyncio.run(endpoint(value=1)).startswith("Fake")
+
+    def it_preserves_the_endpoint_metadata() -> None:
+        endpoint = _offload_endpoint(fake_endpoint, OffloadMode.INLINE, executor)
+        assert endpoint.__name__ == "fake_endpoint"
+        assert inspect.signature(endpoint).parameters["value"].annotation is int
+
+
+def describe_offload_constructor() -> None:
+    def it_injects_the_class_directly_by_default() -> None:
+        assert _offload_constructor(Fake, OffloadMode.DEFAULT, executor) is None
+
+    def it_constructs_the_class_with_its_signature() -> None:
+        constructor: Any = _offload_constructor(Fake, OffloadMode.EXECUTOR, executor)
+        sig = inspect.signature(constructor)
+        assert sig.parameters["value"].annotation is int
+        assert sig.return_annotation is Fake
+        assert asyncio.run(constructor(value=1)).thread.startswith("Fake")
@@ -1,11 +1,14 @@
+import dataclasses
+from collections import OrderedDict
 from typing import Type
 from unittest.mock import MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
 
-from fastapi_controllers.definitions import HTTPRequestMethod, Route, RouteMeta
-from fastapi_controllers.routing import _RouteDecorator, delete, get, head, options, patch, post, put, trace
+from fastapi_controllers import routing
+from fastapi_controllers.definitions import HTTPRequestMethod, OffloadMode, Route, RouteMeta, RouteMetadata, RouteOptions, ValidationMode
+from fastapi_controllers.routing import _RouteDecorator, delete, get, head, options, patch, post, put, trace, websocket
 
 HTTP_DECO_DEFINITIONS = {
     delete: HTTPRequestMethod.DELETE,
@@ -62,6 +65,49 @@ def describe_RouteDecorator() -> None:
         assert route.route_args == ("/test",)
         assert route.route_kwargs == {"keyword": "TEST"}
 
+    @pytest.mark.parametrize("mode", ["deferred", "off"])
+    def it_skips_the_validation_unless_eager(validator: MagicMock, mocker: MockerFixture, mode: str) -> None:
+        mocker.patch("fastapi_controllers.routing.get_validation_mode", return_value=ValidationMode(mode))
+        fake("/test", keyword="TEST")(fake_method)
+        validator.assert_not_called()
+
+
+def describe_route_specs() -> None:
+    def it_makes_the_route_specs_immutable(validator: MagicMock) -> None:
+        route = fake("/test", keyword="TEST")(fake_method)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            route.route_args = ()  # type: ignore
+        with pytest.raises(TypeError):
+            route.route_kwargs["keyword"] = "OTHER"  # type: ignore
+
+    def it_shares_identical_route_specs(validator: MagicMock) -> None:
+        first = fake("/first", tags=["TEST"], offload=OffloadMode.INLINE)(fake_method)
+        second = fake("/second", tags=["TEST"], offload=OffloadMode.INLINE)(fake_method)
+        assert first.route_kwargs is second.route_kwargs
+        assert first.route_options is second.route_options
+        assert fake("/third", tags=("TEST",))(fake_method).route_kwargs is not first.route_kwargs
+
+    def it_does_not_share_unhashable_route_specs(validator: MagicMock) -> None:
+        first = fake("/first", openapi_extra={"x": bytearray()})(fake_method)
+        second = fake("/second", openapi_extra={"x": bytearray()})(fake_method)
+        assert first.route_kwargs == second.route_kwargs
+        assert first.route_kwargs is not second.route_kwargs
+
+    def it_keeps_a_bounded_number_of_route_specs(validator: MagicMock, mocker: MockerFixture) -> None:
+        mocker.patch("fastapi_controllers.routing._MAX_INTERNED", 3)
+        mocker.patch("fastapi_controllers.routing._INTERNED", OrderedDict())
+        first = fake("/first", tags=["FIRST"])(fake_method)
+        fake("/second", tags=["SECOND"])(fake_method)
+        assert fake("/first", tags=["FIRST"])(fake_method).route_kwargs is first.route_kwargs
+        fake("/third", tags=["THIRD"])(fake_method)
+        fake("/fourth", tags=["FOURTH"])(fake_method)
+        assert len(routing._INTERNED) == 3
+        assert fake("/first", tags=["FIRST"])(fake_method).route_kwargs is not first.route_kwargs
+
+    def it_does_not_store_route_specs_in_instance_dicts() -> None:
+        assert not hasattr(get("/test"), "__dict__")
+        assert not hasattr(RouteMetadata.get, "__dict__")
+
 
 def describe_decorators() -> None:
     @pytest.mark.parametrize("decorator", HTTP_DECO_DEFINITIONS.keys())
@@ -74,3 +120,46 @@ def describe_decorators() -> None:
         method: HTTPRequestMethod,
     ) -> None:
         assert decorator.route_meta.request_method == method  # type: ignore
+
+
+def describe_route_options() -> None:
+    def it_separates_the_route_options_from_the_apirouter_parameters(validator: MagicMock) -> None:
+        route = fake("/test", keyword="TEST", offload=OffloadMode.INLINE)(fake_method)
+        validator.assert_called_once_with(fake.route_meta.binds, args=("/test",), kwargs={"keyword": "TEST"})
+        assert route.route_kwargs == {"keyword": "TEST"}
+        assert route.route_options == RouteOptions(offload=OffloadMode.INLINE)
+
+    @pytest.mark.parametrize("decorator", [delete, options, patch, post, put, trace])
+    def it_rejects_response_caching_of_non_idempotent_routes(decorator: Type[_RouteDecorator]) -> None:
+        with pytest.raises(TypeError):
+            decorator("/test", response_cache=True)
+
+    @pytest.mark.parametrize("decorator", [delete, options, patch, post, put, trace])
+    def it_rejects_coalescing_of_non_idempotent_routes(decorator: Type[_RouteDecorator]) -> None:
+        with pytest.raises(TypeError):
+            decorator("/test", single_flight=True)
+
+    def it_rejects_batching_of_websocket_routes() -> None:
+        with pytest.raises(TypeError):
+            websocket("/test", batch=True)
+
+    def it_rejects_streaming_of_websocket_routes() -> None:
+        with pytest.raises(TypeError):
+            websocket("/test", stream=True)
+
+    def it_rejects_streaming_of_batched_routes() -> None:
+        with pytest.raises(TypeError):
+            post("/test", batch=True, stream=True)
+
+    @pytest.mark.parametrize("decorator", [delete, get, head, options, trace, websocket])
+    def it_rejects_idempotency_keys_for_non_mutating_routes(decorator: Type[_RouteDecorator]) -> None:
+        with pytest.raises(TypeError):
+            decorator("/test", idempotency=True)
+
+    def it_rejects_fast_serialization_of_websocket_routes() -> None:
+        with pytest.raises(TypeError):
+            websocket("/test", fast_serialization=True)
+
+    def it_rejects_fast_serialization_of_streamed_routes() -> None:
+        with pytest.raises(TypeError):
+            get("/test", fast_serialization=True, stream=True)
@@ -0,0 +1,99 @@
+import asyncio
+import inspect
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastapi import Response
+from fastapi.exceptions import ResponseValidationError
+from pydantic import BaseModel
+
+from fastapi_controllers.serialization import _RESPONSE_PARAM, _dumps, _get_response_type, _serialize_endpoint, _Serializer
+
+
+class Item(BaseModel):
+    id: int
+    note: Optional[str] = None
+
+
+class ItemWithSecret(Item):
+    secret: str
+
+
+class OtherItem(BaseModel):
+    id: int
+    secret: str
+
+
+def describe_dumps() -> None:
+    def it_encodes_compact_json() -> None:
+        assert _dumps({1: "ł", "item": Item(id=1)}) == '{"1":"ł","item":{"id":1,"note":null}}'.encode()
+
+
+def describe_get_response_type() -> None:
+    def it_prefers_the_response_model() -> None:
+        def endpoint() -> List[Item]:
+            return []
+
+        assert _get_response_type(endpoint, {"response_model": Item}) is Item
+        assert _get_response_type(endpoint, {"response_model": None}) is None
+        assert _get_response_type(endpoint, {}) == List[Item]
+
+    def it_ignores_untyped_and_response_endpoints() -> None:
+        def untyped():  # type: ignore
+            ...
+
+        def response() -> Response:
+            return Response()
+
+        assert _get_response_type(untyped, {}) is None
+        assert _get_response_type(response, {}) is None
+
+
+def describe_Serializer() -> None:
+    @pytest.mark.parametrize("response_type,value", [(Item, Item(id=1)), (List[Item], [Item(id=1)])])
+    def it_dumps_model_instances_with_the_options(response_type: Any, value: Any) -> None:
+        serializer = _Serializer(response_type, {"response_model_exclude_none": True})
+        assert serializer.adapter is not None
+        assert serializer(value) in (b'{"id":1}', b'[{"id":1}]')
+
+    @pytest.mark.parametrize(
+        "response_type,value",
+        [
+            (Item, {"id": 1, "secret": "TEST"}),
+            (List[Item], [{"id": 1, "secret": "TEST"}]),
+            (Item, ItemWithSecret(id=1, secret="TEST")),
+            (List[Item], [ItemWithSecret(id=1, secret="TEST")]),
+            (Item, OtherItem(id=1, secret="TEST")),
+            (Dict[str, int], {"id": 1}),
+        ],
+    )
+    def it_validates_other_values_against_the_response_type(response_type: Any, value: Any) -> None:
+        assert _Serializer(response_type, {"response_model_exclude_none": True})(value) in (b'{"id":1}', b'[{"id":1}]')
+
+    def it_rejects_invalid_values() -> None:
+        with pytest.raises(ResponseValidationError):
+            _Serializer(Item, {})({"note": "TEST"})
+
+    def it_encodes_the_values_of_untyped_routes_as_they_are() -> None:
+        assert _Serializer(None, {})({"id": 1, "secret": "TEST"}) == b'{"id":1,"secret":"TEST"}'
+
+
+def describe_serialize_endpoint() -> None:
+    def it_adds_the_response_parameter() -> None:
+        async def endpoint(value: int) -> Item:
+            return Item(id=value)
+
+        serialized = _serialize_endpoint(endpoint, {"status_code": 201})
+        assert list(inspect.signature(serialized).parameters) == ["value", _RESPONSE_PARAM]
+        sub_response = Response()
+        sub_response.status_code = None  # type: ignore
+        response = asyncio.run(serialized(value=1, **{_RESPONSE_PARAM: sub_response}))
+        assert (response.status_code, response.body) == (201, b'{"id":1,"note":null}')
+
+    def it_supports_sync_endpoints() -> None:
+        def endpoint() -> Dict[str, int]:
+            return {"id": 1}
+
+        sub_response = Response(status_code=202)
+        response = _serialize_endpoint(endpoint, {})(**{_RESPONSE_PARAM: sub_response})
+        assert (response.status_code, response.body) == (202, b'{"id":1}')
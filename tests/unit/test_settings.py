@@ -0,0 +1,27 @@
+from typing import Iterator
+
+import pytest
+
+from fastapi_controllers.definitions import ValidationMode
+from fastapi_controllers.settings import get_validation_mode, set_validation_mode
+
+
+@pytest.fixture(autouse=True)
+def restore_validation_mode() -> Iterator[None]:
+    mode = get_validation_mode()
+    yield
+    set_validation_mode(mode)
+
+
+def describe_validation_mode() -> None:
+    def it_defaults_to_eager() -> None:
+        assert get_validation_mode() is ValidationMode.EAGER
+
+    @pytest.mark.parametrize("mode", ["eager", "deferred", "off"])
+    def it_can_be_set(mode: str) -> None:
+        set_validation_mode(mode)
+        assert get_validation_mode() is ValidationMode(mode)
+
+    def it_rejects_unknown_modes() -> None:
+        with pytest.raises(ValueError):
+            set_validation_mode("unknown")
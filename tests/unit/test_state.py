@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fastapi_controllers.state import MemoryStateBackend, MmapStateBackend, StateBackend
+
+
+@pytest.fixture(params=["memory", "mmap"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[StateBackend]:
+    state: StateBackend = MemoryStateBackend() if request.param == "memory" else MmapStateBackend(path=str(tmp_path / "test.state"), slots=16)
+    yield state
+    state.close()
+
+
+def describe_StateBackend() -> None:
+    def it_stores_values(backend: StateBackend) -> None:
+        assert backend.get("a") is None
+        assert backend.set("a", b"1") is True
+        assert backend.get("a") == b"1"
+        backend.set("a", b"2")
+        assert backend.get("a") == b"2"
+
+    def it_expires_values(backend: StateBackend, mocker: MockerFixture) -> None:
+        backend.set("a", b"1", ttl=10)
+        assert backend.get("a") == b"1"
+        mocker.patch("time.monotonic", return_value=time.monotonic() + 20)
+        mocker.patch("time.time", return_value=time.time() + 20)
+        assert backend.get("a") is None
+
+    def it_adds_missing_values_only(backend: StateBackend) -> None:
+        assert backend.add("a", b"1") is True
+        assert backend.add("a", b"2") is False
+        assert backend.get("a") == b"1"
+
+    def it_deletes_values(backend: StateBackend) -> None:
+        backend.set("a", b"1")
+        assert backend.delete("a", b"2") is False
+        assert backend.delete("a", b"1") is True
+        assert backend.delete("a") is False
+        assert backend.get("a") is None
+
+    def it_increments_counters(backend: StateBackend, mocker: MockerFixture) -> None:
+        assert backend.incr("a", ttl=10) == 1
+        assert backend.incr("a", 5, ttl=100) == 6
+        mocker.patch("time.monotonic", return_value=time.monotonic() + 20)
+        mocker.patch("time.time", return_value=time.time() + 20)
+        assert backend.incr("a") == 1
+
+    def it_clears_values_by_prefix(backend: StateBackend) -> None:
+        for key in ["a:1", "a:2", "b:1"]:
+            backend.set(key, b"1")
+        backend.clear("a:")
+        assert [backend.get(key) for key in ["a:1", "a:2", "b:1"]] == [None, None, b"1"]
+        backend.clear()
+        assert backend.get("b:1") is None
+
+    def it_holds_exclusive_locks(backend: StateBackend) -> None:
+        events = []
+
+        async def hold(name: str) -> None:
+            async with backend.lock("test"):
+                events.append(f"{name} in")
+                await asyncio.sleep(0.01)
+                events.append(f"{name} out")
+
+        async def run() -> None:
+            await asyncio.gather(hold("first"), hold("second"))
+
+        asyncio.run(run())
+        assert events == ["first in", "first out", "second in", "second out"]
+        assert backend.get("lock:test") is None
+
+    def it_times_out_waiting_for_locks(backend: StateBackend) -> None:
+        async def run() -> None:
+            async with backend.lock("test"):
+                async with backend.lock("test", timeout=0.01):
+                    ...  # pragma: no cover
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(run())
+
+
+def describe_MemoryStateBackend() -> None:
+    def it_evicts_the_least_recently_used_entries() -> None:
+        backend = MemoryStateBackend(max_entries=2)
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.get("a")
+        backend.set("c", b"3")
+        assert len(backend) == 2
+        assert backend.get("b") is None
+
+
+def describe_MmapStateBackend() -> None:
+    def it_requires_room_for_the_slot_header() -> None:
+        with pytest.raises(ValueError):
+            MmapStateBackend(name="test", slot_size=8)
+
+    def it_requires_a_name_or_a_path() -> None:
+        with pytest.raises(TypeError, match="name or a path"):
+            MmapStateBackend()
+
+    def it_skips_values_larger_than_the_slots(tmp_path: Path) -> None:
+        backend = MmapStateBackend(path=str(tmp_path / "test.state"), slots=4, slot_size=64)
+        backend.set("a", b"1")
+        assert backend.set("a", b"1" * 64) is False
+        assert backend.add("b", b"1" * 64) is False
+        assert backend.get("a") is None
+
+    def it_evicts_the_entries_expiring_first(tmp_path: Path) -> None:
+        backend = MmapStateBackend(path=str(tmp_path / "test.state"), slots=2, slot_size=64)
+        backend.set("a", b"1", ttl=100)
+        backend.set("b", b"2", ttl=10)
+        backend.set("c", b"3")
+        assert [backend.get(key) for key in ["a", "b", "c"]] == [b"1", None, b"3"]
+
+    def it_shares_the_file_between_instances(tmp_path: Path) -> None:
+        path = str(tmp_path / "test.state")
+        first, second = MmapStateBackend(path=path), MmapStateBackend(path=path)
+        first.set("a", b"1")
+        assert second.get("a") == b"1"
+        assert second.incr("b") == 1
+        assert first.incr("b") == 2
+        first.close()
+        first.close()
+        assert os.path.getsize(path) == 64 + 4096 * 4096
+        assert first.get("a") == b"1"
+
+    def it_rejects_files_with_another_layout(tmp_path: Path) -> None:
+        path = str(tmp_path / "test.state")
+        MmapStateBackend(path=path, slots=4, slot_size=64).set("a", b"1")
+        with pytest.raises(ValueError, match="has another layout"):
+            MmapStateBackend(path=path, slots=8, slot_size=64).get("a")
+        assert os.path.getsize(path) == 64 + 4 * 64
+        assert MmapStateBackend(path=path, slots=4, slot_size=64).get("a") == b"1"
+
+    def it_stores_wall_clock_expiration_times(tmp_path: Path, mocker: MockerFixture) -> None:
+        path = str(tmp_path / "test.state")
+        MmapStateBackend(path=path, slots=4, slot_size=64).set("a", b"1", ttl=10)
+        # a reboot restarts the monotonic clock
+        mocker.patch("time.monotonic", return_value=0.0)
+        mocker.patch("time.time", return_value=time.time() + 20)
+        assert MmapStateBackend(path=path, slots=4, slot_size=64).get("a") is None
+
+    def it_creates_the_file_with_the_given_mode(tmp_path: Path) -> None:
+        path = str(tmp_path / "test.state")
+        MmapStateBackend(path=path, slots=4, slot_size=64, mode=0o660).get("a")
+        assert os.stat(path).st_mode & 0o777 == 0o660
+
+    def it_explains_files_of_other_users(tmp_path: Path, mocker: MockerFixture) -> None:
+        mocker.patch("os.open", side_effect=PermissionError)
+        with pytest.raises(PermissionError, match="belongs to another user"):
+            MmapStateBackend(path=str(tmp_path / "test.state")).get("a")
@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, MutableMapping
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from fastapi_controllers.definitions import StreamConfig, StreamFormat
+from fastapi_controllers.streaming import (
+    NDJSONStreamingResponse,
+    _achunk,
+    _chunk,
+    _Encoder,
+    _get_stream_item_type,
+    _iterate_in_threadpool,
+    _stream_endpoint,
+)
+
+
+def disconnect(response: NDJSONStreamingResponse) -> None:
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request"}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        if message.get("body"):
+            raise OSError()
+
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send))
+
+
+def describe_get_stream_item_type() -> None:
+    @pytest.mark.parametrize(
+        "annotation,expected",
+        [(Iterator[int], int), (AsyncIterator[str], str), (Iterable[int], int), (Iterator[Any], None), (Iterator, None), (List[int], None)],
+    )
+    def it_unwraps_iterators(annotation: Any, expected: Any) -> None:
+        assert _get_stream_item_type(annotation) == expected
+
+
+def describe_Encoder() -> None:
+    @pytest.mark.parametrize(
+        "config,expected",
+        [
+            (StreamConfig(), b'{"a":1}\n{"a":2}\n'),
+            (StreamConfig(format=StreamFormat.JSON), b'[{"a":1},{"a":2}]'),
+            (StreamConfig(format=StreamFormat.CSV), b"a\r\n1\r\n2\r\n"),
+        ],
+    )
+    def it_encodes_the_items(config: StreamConfig, expected: bytes) -> None:
+        encoder = _Encoder(config, None)
+        assert encoder.start() + encoder.encode({"a": 1}) + encoder.encode({"a": 2}) + encoder.end() == expected
+
+    def it_encodes_csv_rows_without_headers() -> None:
+        encoder = _Encoder(StreamConfig(format=StreamFormat.CSV), None)
+        assert encoder.encode([1, "a"]) + encoder.encode(2) == b"1,a\r\n2\r\n"
+
+    def it_validates_the_items() -> None:
+        encoder = _Encoder(StreamConfig(), int)
+        assert encoder.encode("1") == b"1\n"
+
+
+def describe_chunk() -> None:
+    def it_groups_the_items_into_chunks() -> None:
+        chunks = list(_chunk(iter(range(5)), _Encoder(StreamConfig(format=StreamFormat.JSON), None), 4))
+        assert chunks == [b"[0,1", b",2,3", b",4]"]
+
+    def it_groups_the_items_of_async_iterators_into_chunks() -> None:
+        async def items() -> AsyncIterator[int]:
+            for item in range(5):
+                yield item
+
+        async def collect() -> List[bytes]:
+            return [chunk async for chunk in _achunk(items(), _Encoder(StreamConfig(), None), 4)]
+
+        assert asyncio.run(collect()) == [b"0\n1\n", b"2\n3\n", b"4\n"]
+
+
+def describe_disconnect() -> None:
+    def it_closes_async_generators_when_the_client_disconnects() -> None:
+        closed: List[bool] = []
+
+        async def items() -> AsyncIterator[int]:
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.append(True)
+
+        disconnect(NDJSONStreamingResponse(_achunk(items(), _Encoder(StreamConfig(), None), 1)))
+        assert closed == [True]
+
+    def it_closes_sync_generators_when_the_client_disconnects() -> None:
+        closed: List[bool] = []
+
+        def items() -> Iterator[int]:
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.append(True)
+
+        disconnect(NDJSONStreamingResponse(_iterate_in_threadpool(_chunk(items(), _Encoder(StreamConfig(), None), 1))))
+        assert closed == [True]
+
+
+def describe_stream_endpoint() -> None:
+    def it_rejects_functions_other_than_generator_functions() -> None:
+        def endpoint() -> List[int]:
+            return []
+
+        with pytest.raises(TypeError, match="must be a generator function"):
+            _stream_endpoint(endpoint, True)
+
+    def it_accepts_stream_formats() -> None:
+        def endpoint() -> Iterator[int]:
+            yield 1
+
+        assert _stream_endpoint(endpoint, StreamFormat.CSV)[1].media_type == "text/csv"